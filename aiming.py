@@ -0,0 +1,265 @@
+import math
+import numpy as np
+from drag import integrate as integrate_drag, STOP_DISTANCE
+
+# Launch angles searched by default: level to straight up
+DEFAULT_ANGLE_RANGE = (0.0, math.pi / 2)
+
+# Angle grid used to bracket boundaries under drag, and bisection depth
+DRAG_GRID_POINTS = 90
+DRAG_BISECTIONS = 24
+
+
+class AngleSolution:
+    """Launch angles (radians) that hit a target.
+
+    ``intervals`` has shape (..., K, 2): up to K disjoint [low, high] angle
+    ranges per problem, sorted and padded with NaN. ``low`` and ``high``
+    are the middles of the lowest and highest ranges, the most forgiving
+    flat and lobbed throws; NaN where nothing hits.
+    """
+
+    def __init__(self, intervals):
+        self.intervals = intervals
+        present = ~np.isnan(intervals[..., 0])
+        middles = intervals.mean(axis=-1)
+        self.hit = present.any(axis=-1)
+        count = present.sum(axis=-1)
+        first = middles[..., 0]
+        last_index = np.maximum(count - 1, 0)[..., None]
+        last = np.take_along_axis(middles, last_index, axis=-1)[..., 0]
+        self.low = np.where(self.hit, first, np.nan)
+        self.high = np.where(self.hit, last, np.nan)
+
+    def interval_list(self, index=()):
+        """The hitting ranges of one problem as a list of (low, high) pairs."""
+        rows = self.intervals[index]
+        return [(float(lo), float(hi)) for lo, hi in rows if not np.isnan(lo)]
+
+
+def _slope_bounds(x, v0, h0, g, level):
+    # Range of u = tan(angle) for which the drag-free path is at or above
+    # level at distance x: y = h0 + x*u - k*x^2*(1 + u^2), k = g/(2*v0^2)
+    k = g / (2 * v0**2)
+    a = -k * x**2
+    b = x
+    c = h0 - k * x**2 - level
+    with np.errstate(invalid="ignore"):
+        root = np.sqrt(b*b - 4*a*c)
+    # a < 0, so the larger root comes from the minus sign
+    return (-b + root) / (2*a), (-b - root) / (2*a)
+
+
+def hitting_angles(v0, h0, g, target_distance, target_height, target_width,
+                   drag=None, angle_range=DEFAULT_ANGLE_RANGE, target_bottom=0.0, **options):
+    """Every launch angle that hits the target box, plus low/high solutions.
+
+    All arguments broadcast. A path hits the box [d, d + w] x [b, H] exactly
+    when its highest point over [d, d + w] is at or above b (for b = 0: it
+    reaches x = d above the ground) and it is at or below H at either
+    x = d or x = d + w, because the path is concave in x with or without
+    drag. target_height is the top H and target_bottom the bottom b, both
+    measured from the ground. In vacuum the boundaries are closed-form;
+    with a drag model they are bracketed on an angle grid and bisected for
+    all problems at once.
+    """
+    if drag is not None:
+        return _hitting_angles_drag(v0, h0, g, target_distance, target_height, target_width,
+                                    drag, angle_range, target_bottom=target_bottom, **options)
+
+    v0, h0, g, near, height, width, bottom = np.broadcast_arrays(*(
+        np.asarray(a, dtype=float) for a in (
+            v0, h0, g, target_distance, target_height, target_width, target_bottom)))
+    far = near + width
+    # Nothing below the ground can be hit
+    bottom = np.maximum(bottom, 0.0)
+    u_min, u_max = math.tan(angle_range[0]), math.tan(min(angle_range[1], math.pi / 2))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Angles that reach the bottom edge somewhere over the target: the
+        # steepest does so at the front, the flattest is the path whose apex
+        # is at the bottom edge, unless that apex lies outside the target
+        reach_lo, reach_hi = _slope_bounds(near, v0, h0, g, bottom)
+        rise = 2 * g / v0**2 * np.maximum(bottom - h0, 0.0)
+        apex_u = np.sqrt(rise / (1 - rise))
+        apex_x = v0**2 * apex_u / (g * (1 + apex_u**2))
+        far_lo, _ = _slope_bounds(far, v0, h0, g, bottom)
+        reach_lo = np.where(apex_x > far, far_lo, np.where(apex_x > near, apex_u, reach_lo))
+        # Angles that pass over the target at the front and at the back
+        front_lo, front_hi = _slope_bounds(near, v0, h0, g, height)
+        back_lo, back_hi = _slope_bounds(far, v0, h0, g, height)
+
+    # Flying over both corners is the only way to reach the target and miss
+    over_lo = np.maximum(front_lo, back_lo)
+    over_hi = np.minimum(front_hi, back_hi)
+    over = ~np.isnan(over_lo) & ~np.isnan(over_hi) & (over_lo < over_hi)
+    over_lo = np.where(over, over_lo, np.inf)
+    over_hi = np.where(over, over_hi, np.inf)
+
+    reach_lo = np.maximum(reach_lo, u_min)
+    reach_hi = np.minimum(reach_hi, u_max)
+
+    lower = np.stack([reach_lo, np.minimum(reach_hi, over_lo)], axis=-1)
+    upper = np.stack([np.maximum(reach_lo, over_hi), reach_hi], axis=-1)
+    intervals = np.stack([lower, upper], axis=-2)
+    usable = (v0 > 0) & (g > 0) & (near > 0)
+    empty = ~(intervals[..., 0] <= intervals[..., 1]) | ~usable[..., None]
+    intervals = np.where(empty[..., None], np.nan, np.arctan(intervals))
+    return AngleSolution(_compact(intervals))
+
+
+def _compact(intervals):
+    # Move the present intervals to the front so the NaN padding is last
+    missing = np.isnan(intervals[..., 0])
+    order = np.argsort(missing, axis=-1, kind="stable")
+    return np.take_along_axis(intervals, order[..., None], axis=-2)
+
+
+def _heights(v0, h0, g, drag, angle, x, options):
+    # Height of each throw as it passes x. A throw that lands short gets the
+    # (negative) shortfall instead, which keeps the function continuous
+    # where the landing point crosses x.
+    solution = integrate_drag(v0, angle, h0, g, drag, x_stop=x, **options)
+    reached = solution.stop_reason == STOP_DISTANCE
+    shortfall = solution.end_state[:, 0] - x
+    return np.where(reached, solution.end_state[:, 1], np.minimum(shortfall, 0.0))
+
+
+def _highest(v0, h0, g, drag, angle, near, far, options):
+    # Highest point of each throw between near and far: the apex when it
+    # lies in between, else the higher end. Continuous in the angle, like
+    # _heights, which gives the height at near.
+    at_near = _heights(v0, h0, g, drag, angle, near, options)
+    solution = integrate_drag(v0, angle, h0, g, drag, x_stop=far, **options)
+    at_far = np.where(solution.stop_reason == STOP_DISTANCE, solution.end_state[:, 1], -np.inf)
+    with np.errstate(invalid="ignore"):
+        between = (solution.apex_x >= near) & (solution.apex_x <= far)
+    apex = np.where(between, solution.max_height, -np.inf)
+    return np.maximum(at_near, np.maximum(at_far, apex))
+
+
+def hits_target(v0, angle_rad, h0, g, target_distance, target_height, target_width,
+                drag=None, **options):
+    """Whether each throw hits the target box, treating the rock as a point.
+
+    Arguments broadcast. Uses the same concavity test as hitting_angles;
+    under drag each throw is integrated up to the front and back of the
+    target, with any extra options passed to drag.integrate.
+    """
+    k = 0.0 if drag is None else getattr(drag, "coefficient", drag)
+    v0, angle_rad, h0, g, k, near, height, width = np.broadcast_arrays(*(
+        np.asarray(a, dtype=float) for a in (
+            v0, angle_rad, h0, g, k, target_distance, target_height, target_width)))
+    far = near + width
+    if drag is None:
+        # Drag-free height at x: h0 + x*tan(angle) - g*x^2 / (2*vx^2)
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            slope = np.tan(angle_rad)
+            curve = g / (2 * (v0 * np.cos(angle_rad))**2)
+            front = h0 + near*slope - curve*near**2
+            back = h0 + far*slope - curve*far**2
+    else:
+        rows = [np.ravel(a) for a in (v0, h0, g, k, angle_rad)]
+        front = _heights(*rows, np.ravel(near), options).reshape(near.shape)
+        back = _heights(*rows, np.ravel(far), options).reshape(near.shape)
+    usable = (v0 > 0) & (g > 0) & (near > 0)
+    return usable & (front >= 0) & (np.minimum(front, back) <= height)
+
+
+def _hitting_angles_drag(v0, h0, g, target_distance, target_height, target_width,
+                         drag, angle_range, grid_points=DRAG_GRID_POINTS,
+                         bisections=DRAG_BISECTIONS, target_bottom=0.0, **options):
+    arrays = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (
+        v0, h0, g, getattr(drag, "coefficient", drag), target_distance, target_height,
+        target_width, target_bottom)))
+    shape = arrays[0].shape
+    v0, h0, g, k, near, height, width, bottom = (np.ravel(a) for a in arrays)
+    far = near + width
+    bottom = np.maximum(bottom, 0.0)
+    n = len(v0)
+
+    # The boundary functions: reach the front, clear the front top corner,
+    # clear the back top corner and, for raised targets, rise to the bottom
+    # edge somewhere over the target. Each is f(angle) = height at x (the
+    # highest point over the target for the last) minus level.
+    raised = bool((bottom > 0).any())
+    count = 4 if raised else 3
+    xs = np.stack([near, near, far, far], axis=1)
+    levels = np.stack([np.zeros(n), height, height, bottom], axis=1)
+
+    def evaluate(rows, funcs, angles):
+        heights = np.empty(len(rows))
+        plain = funcs < 3
+        r = rows[plain]
+        heights[plain] = _heights(v0[r], h0[r], g[r], k[r], angles[plain], xs[r, funcs[plain]],
+                                  options)
+        if not plain.all():
+            r = rows[~plain]
+            heights[~plain] = _highest(v0[r], h0[r], g[r], k[r], angles[~plain], near[r], far[r],
+                                       options)
+        return heights - levels[rows, funcs]
+
+    # Bracket sign changes of every function on a shared angle grid
+    grid = np.linspace(angle_range[0], min(angle_range[1], math.pi / 2 - 1e-6), grid_points)
+    rows = np.repeat(np.arange(n), count * grid_points)
+    funcs = np.tile(np.repeat(np.arange(count), grid_points), n)
+    angles = np.tile(grid, count * n)
+    values = evaluate(rows, funcs, angles).reshape(n, count, grid_points)
+
+    change = np.signbit(values[..., :-1]) != np.signbit(values[..., 1:])
+    p, f, i = np.nonzero(change)
+    lo, hi = grid[i], grid[i + 1]
+    lo_negative = np.signbit(values[p, f, i])
+
+    # Bisect every bracket at once
+    for _ in range(bisections):
+        mid = 0.5 * (lo + hi)
+        negative = np.signbit(evaluate(p, f, mid)) if len(mid) else np.zeros(0, dtype=bool)
+        same = negative == lo_negative
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+    roots = 0.5 * (lo + hi)
+
+    # Split each problem's angle range at its boundaries and keep the pieces
+    # whose middle hits
+    counts = np.bincount(p, minlength=n)
+    width_max = counts.max() if n else 0
+    cuts = np.full((n, width_max + 2), np.nan)
+    cuts[:, 0] = grid[0]
+    slot = np.arange(len(p)) - np.repeat(np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    cuts[p, slot + 1] = roots
+    cuts[np.arange(n), counts + 1] = grid[-1]
+    cuts = np.sort(cuts, axis=1)  # NaN sorts last
+
+    starts, ends = cuts[:, :-1], cuts[:, 1:]
+    piece_rows, piece_cols = np.nonzero(~np.isnan(ends))
+    middles = 0.5 * (starts[piece_rows, piece_cols] + ends[piece_rows, piece_cols])
+    reach = evaluate(piece_rows, np.zeros_like(piece_rows), middles)
+    front = evaluate(piece_rows, np.ones_like(piece_rows), middles)
+    back = evaluate(piece_rows, np.full_like(piece_rows, 2), middles)
+    hits = np.zeros(starts.shape, dtype=bool)
+    hit = (reach >= 0) & (np.minimum(front, back) <= 0)
+    if raised:
+        hit &= evaluate(piece_rows, np.full_like(piece_rows, 3), middles) >= 0
+    hits[piece_rows, piece_cols] = hit
+
+    intervals = _merge_pieces(starts, ends, hits)
+    usable = (v0 > 0) & (g > 0) & (near > 0)
+    intervals[~usable] = np.nan
+    return AngleSolution(intervals.reshape(shape + intervals.shape[1:]))
+
+
+def _merge_pieces(starts, ends, hits):
+    # Join runs of adjacent hitting pieces into (n, K, 2) intervals
+    n, m = hits.shape
+    begins = hits & ~np.concatenate([np.zeros((n, 1), dtype=bool), hits[:, :-1]], axis=1)
+    finishes = hits & ~np.concatenate([hits[:, 1:], np.zeros((n, 1), dtype=bool)], axis=1)
+    k = max(int(begins.sum(axis=1).max()) if n else 0, 1)
+    intervals = np.full((n, k, 2), np.nan)
+    rows, cols = np.nonzero(begins)
+    slots = np.cumsum(begins, axis=1)[rows, cols] - 1
+    intervals[rows, slots, 0] = starts[rows, cols]
+    rows, cols = np.nonzero(finishes)
+    slots = np.cumsum(finishes, axis=1)[rows, cols] - 1
+    intervals[rows, slots, 1] = ends[rows, cols]
+    return intervals
@@ -0,0 +1,170 @@
+from collections import OrderedDict
+import numpy as np
+import engine
+
+# Number of trajectories kept by default, and their combined size limit
+DEFAULT_CAPACITY = 256
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Launch parameters closer than this are treated as the same throw
+DEFAULT_QUANTUM = 1e-6
+
+
+class TrajectoryCache:
+    """Memoizes engine.calculate_trajectory on quantized launch parameters.
+
+    Entries are evicted least recently used first once there are more than
+    ``capacity`` of them or their sample arrays exceed ``max_bytes``. Cached
+    results are shared between callers and must not be modified.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, max_bytes=DEFAULT_MAX_BYTES,
+                 quantum=DEFAULT_QUANTUM, solver=engine.calculate_trajectory):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.quantum = quantum
+        self.solver = solver
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _quantize(self, value):
+        if value is None:
+            return None
+        return int(round(float(value) / self.quantum))
+
+    def key(self, v0, angle_rad, h0, g, target=None, rock_size=0.0,
+            num_points=None, drag=None, summary=False, tolerance=engine.DEFAULT_TOLERANCE):
+        q = self._quantize
+        target_key = None
+        if target is not None:
+            target_key = (q(target.x), q(target.y), q(target.width), q(target.height))
+        # The flight only depends on the drag model through its coefficient
+        drag_key = None
+        if drag is not None:
+            drag_key = q(getattr(drag, "coefficient", drag))
+        return (q(v0), q(angle_rad), q(h0), q(g), target_key, q(rock_size), num_points, drag_key,
+                summary, q(tolerance))
+
+    def calculate_trajectory(self, v0, angle_rad, h0, g, target=None, rock_size=0.0,
+                             num_points=None, drag=None, summary=False,
+                             tolerance=engine.DEFAULT_TOLERANCE):
+        """Cached engine.calculate_trajectory; errors are raised, not cached."""
+        key = self.key(v0, angle_rad, h0, g, target, rock_size, num_points, drag, summary,
+                       tolerance)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        result = self.solver(v0, angle_rad, h0, g, target=target, rock_size=rock_size,
+                             num_points=num_points, drag=drag, summary=summary,
+                             tolerance=tolerance)
+        # Only the sample buffer matters; the scalars are negligible
+        size = result.nbytes
+        self._entries[key] = (result, size)
+        self.size += size
+        self._evict()
+        return result
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (len(self._entries) > self.capacity
+                                          or (self.max_bytes is not None
+                                              and self.size > self.max_bytes)):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class Memo:
+    """Memoizes any function of launch parameters on quantized arguments.
+
+    For the slider-driven computations that engine.calculate_trajectory
+    does not cover (hitting angles, spread). Numbers and arrays are
+    quantized like TrajectoryCache keys, engine.Target by its box and drag
+    models by their coefficient; other arguments must be hashable. The
+    least recently used results are evicted beyond ``capacity``. Errors are
+    raised, not cached, and results are shared and must not be modified.
+    """
+
+    def __init__(self, function, capacity=DEFAULT_CAPACITY, quantum=DEFAULT_QUANTUM):
+        self.function = function
+        self.capacity = capacity
+        self.quantum = quantum
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, value):
+        if value is None or isinstance(value, (str, bool)):
+            return value
+        if hasattr(value, "coefficient"):
+            # Drag only enters the flight through its coefficient
+            return ("drag", self._key(value.coefficient))
+        if isinstance(value, engine.Target):
+            return ("target", self._key((value.x, value.y, value.width, value.height)))
+        if isinstance(value, (tuple, list)):
+            return tuple(self._key(v) for v in value)
+        if isinstance(value, (int, float, np.ndarray, np.number)):
+            steps = np.round(np.asarray(value, dtype=float) / self.quantum).astype(np.int64)
+            return (steps.shape, steps.tobytes())
+        return value
+
+    def key(self, *args, **kwargs):
+        return (self._key(args), tuple(sorted((name, self._key(value))
+                                              for name, value in kwargs.items())))
+
+    def __call__(self, *args, **kwargs):
+        key = self.key(*args, **kwargs)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        self.misses += 1
+        result = self.function(*args, **kwargs)
+        self._entries[key] = result
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,373 @@
+import numpy as np
+import dual
+
+# Faces through which a path can enter a target box
+FACE_NONE = -1
+FACE_INSIDE = 0  # Already inside the box at the start of the path
+FACE_LEFT = 1
+FACE_RIGHT = 2
+FACE_TOP = 3
+FACE_BOTTOM = 4
+FACE_CORNER = 5  # Rounded corner of a box grown by a disc radius
+
+FACE_NAMES = {
+    FACE_NONE: "none",
+    FACE_INSIDE: "inside",
+    FACE_LEFT: "left",
+    FACE_RIGHT: "right",
+    FACE_TOP: "top",
+    FACE_BOTTOM: "bottom",
+    FACE_CORNER: "corner",
+}
+
+# Surfaces a swept disc can come to rest against
+SURFACE_NONE = -1
+SURFACE_TARGET = 0
+SURFACE_GROUND = 1
+
+# Relative slack used when checking that a root lies on a face
+_EPS = 1e-9
+
+# Largest imaginary part (relative) accepted for a real quartic root
+_IMAG_TOL = 1e-7
+
+
+class Intersection:
+    """First contact of a batch of paths with a batch of boxes."""
+
+    def __init__(self, hit, time, x, y, face):
+        self.hit = hit
+        self.time = time
+        self.x = x
+        self.y = y
+        self.face = face
+
+    def face_name(self, index=()):
+        return FACE_NAMES[int(self.face[index])]
+
+
+def _quadratic_roots(a, b, c):
+    # Real roots of a*t^2 + b*t + c = 0 in ascending order, NaN where missing.
+    # Rows with a == 0 fall back to the linear solution (returned twice).
+    a, b, c = np.broadcast_arrays(a, b, c)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        disc = b*b - 4*a*c
+        sqrt_disc = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        # Numerically stable form that avoids cancellation
+        q = -0.5 * (b + np.where(b >= 0, sqrt_disc, -sqrt_disc))
+        r1 = q / a
+        r2 = c / q
+        # fmin/fmax skip the NaN produced by the 0/0 double root at t = 0
+        lo = np.fmin(r1, r2)
+        hi = np.fmax(r1, r2)
+        linear = a == 0
+        t_lin = np.where(b != 0, -c / b, np.nan)
+        lo = np.where(linear, t_lin, lo)
+        hi = np.where(linear, t_lin, hi)
+    return lo, hi
+
+
+def _within(value, lo, hi):
+    slack = _EPS * np.maximum(1.0, np.abs(hi - lo))
+    return (value >= lo - slack) & (value <= hi + slack)
+
+
+def _first_candidate(t_end, candidates):
+    # candidates: list of (time, ok, face); pick the earliest valid one
+    times = []
+    for t, ok, _ in candidates:
+        valid = ok & (t >= 0) & (t <= t_end)
+        times.append(np.where(valid, t, np.inf))
+    times = np.stack(np.broadcast_arrays(*times), axis=-1)
+    faces = np.array([face for _, _, face in candidates])
+    best = np.argmin(times, axis=-1)
+    t_first = np.take_along_axis(times, best[..., None], axis=-1)[..., 0]
+    hit = np.isfinite(t_first)
+    face = np.where(hit, faces[best], FACE_NONE)
+    return hit, t_first, face
+
+
+def parabola_box_entry(x0, y0, vx, vy, g, t_end, box_x, box_y, box_width, box_height):
+    """Exact first time a point on a drag-free parabola enters a box.
+
+    The path is x(t) = x0 + vx*t, y(t) = y0 + vy*t - g*t^2/2 for
+    0 <= t <= t_end. All arguments broadcast, so any mix of throws and
+    boxes can be tested in one call. Touching the boundary counts as a hit.
+    """
+    x0, y0, vx, vy, g, t_end = (np.asarray(v, dtype=float) for v in (x0, y0, vx, vy, g, t_end))
+    left = np.asarray(box_x, dtype=float)
+    bottom = np.asarray(box_y, dtype=float)
+    right = left + np.asarray(box_width, dtype=float)
+    top = bottom + np.asarray(box_height, dtype=float)
+
+    def x_at(t):
+        return x0 + vx*t
+
+    def y_at(t):
+        return y0 + vy*t - 0.5*g*t*t
+
+    zero = np.zeros(np.broadcast(x0, y0, vx, vy, g, t_end, left, bottom, right, top).shape)
+    candidates = []
+
+    # Start inside the box
+    candidates.append((zero, _within(x0, left, right) & _within(y0, bottom, top), FACE_INSIDE))
+
+    # Vertical faces: x is linear in t
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for edge, face in ((left, FACE_LEFT), (right, FACE_RIGHT)):
+            t = np.where(vx != 0, (edge - x0) / vx, np.nan)
+            candidates.append((t, _within(y_at(t), bottom, top), face))
+
+    # Horizontal faces: y is quadratic in t, so both crossings are candidates
+    for edge, face in ((top, FACE_TOP), (bottom, FACE_BOTTOM)):
+        for t in _quadratic_roots(-0.5*g, vy, y0 - edge):
+            candidates.append((t, _within(x_at(t), left, right), face))
+
+    hit, t_first, face = _first_candidate(t_end, candidates)
+    with np.errstate(invalid="ignore"):
+        return Intersection(hit, t_first, np.where(hit, x_at(t_first), np.nan),
+                            np.where(hit, y_at(t_first), np.nan), face)
+
+
+def target_intersection(v0, angle_rad, h0, g, target_x, target_width, target_height, target_y=0.0):
+    """Exact entry of throws from (0, h0) into target boxes before landing.
+
+    Any argument may be a dual.Dual; the entry time and point then carry
+    their derivatives (see _differentiate_entry).
+    """
+    params = (v0, angle_rad, h0, g, target_x, target_width, target_height, target_y)
+    if dual.derivative_count(params) is not None:
+        entry = target_intersection(*(dual.value(a) for a in params))
+        return _differentiate_entry(entry, *params)
+    v0, angle_rad, h0, g = (np.asarray(v, dtype=float) for v in (v0, angle_rad, h0, g))
+    vx = v0 * np.cos(angle_rad)
+    vy = v0 * np.sin(angle_rad)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_flight = (vy + np.sqrt(vy**2 + 2*g*h0)) / g
+    t_flight = np.where(np.isfinite(t_flight) & (t_flight > 0), t_flight, -1.0)
+    return parabola_box_entry(0.0, h0, vx, vy, g, t_flight,
+                              target_x, target_y, target_width, target_height)
+
+
+def _differentiate_entry(entry, v0, angle_rad, h0, g, target_x, target_width, target_height,
+                         target_y):
+    # The entry time solves c(t, p) = 0 for the face it enters through, with
+    # c the x (left and right faces) or y (top and bottom) offset from that
+    # face, so dt/dp = -(dc/dp) / (dc/dt) at the entry
+    vx = v0 * np.cos(angle_rad)
+    vy = v0 * np.sin(angle_rad)
+    face = entry.face
+    t = np.where(entry.hit, entry.time, 0.0)
+    left = target_x
+    bottom = target_y
+    vertical = (face == FACE_LEFT) | (face == FACE_RIGHT)
+    edge = np.where(face == FACE_LEFT, left,
+                    np.where(face == FACE_RIGHT, left + target_width,
+                             np.where(face == FACE_TOP, bottom + target_height, bottom)))
+    offset = np.where(vertical, vx*t, h0 + vy*t - 0.5*g*t*t) - edge
+    rate = dual.value(np.where(vertical, vx, vy - g*t))
+    moving = entry.hit & (face != FACE_INSIDE)
+    n = dual.derivative_count((v0, angle_rad, h0, g, target_x, target_width, target_height,
+                               target_y))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grad = np.where(moving[..., None], -dual.gradient(offset) / rate[..., None], 0.0)
+    time = dual.Dual(entry.time, np.broadcast_to(grad, np.shape(entry.time) + (n,)))
+    with np.errstate(invalid="ignore"):
+        x = np.where(entry.hit, vx*time, np.nan)
+        y = np.where(entry.hit, h0 + vy*time - 0.5*g*time*time, np.nan)
+    return Intersection(entry.hit, time, x, y, face)
+
+
+class Contact:
+    """First contact of a swept disc with a target box or the ground.
+
+    ``x`` and ``y`` are the disc centre at the moment of contact and
+    ``target_hit`` tells whether the target was touched before the ground.
+    """
+
+    def __init__(self, target_hit, time, x, y, surface, face):
+        self.target_hit = target_hit
+        self.time = time
+        self.x = x
+        self.y = y
+        self.surface = surface
+        self.face = face
+
+    def face_name(self, index=()):
+        return FACE_NAMES[int(self.face[index])]
+
+
+def _quartic_roots(coeffs):
+    # Roots of the polynomials in coeffs[..., :] (highest power first),
+    # as a (..., 4) complex array, via eigenvalues of stacked companion matrices
+    shape = coeffs.shape[:-1]
+    lead = coeffs[..., :1]
+    companion = np.zeros(shape + (4, 4))
+    companion[..., 0, :] = -coeffs[..., 1:] / lead
+    companion[..., 1, 0] = 1.0
+    companion[..., 2, 1] = 1.0
+    companion[..., 3, 2] = 1.0
+    return np.linalg.eigvals(companion)
+
+
+def _first_circle_entry(ex, ey, vx, vy, g, radius, t_end):
+    # First t in [0, t_end] where a point on x = ex + vx*t,
+    # y = ey + vy*t - g*t^2/2 comes within radius of the origin
+    ex, ey, vx, vy, g, radius, t_end = np.broadcast_arrays(ex, ey, vx, vy, g, radius, t_end)
+    a = -0.5 * g
+    coeffs = np.stack([a*a, 2*a*vy, vy*vy + 2*a*ey + vx*vx,
+                       2*vy*ey + 2*vx*ex, ex*ex + ey*ey - radius*radius], axis=-1)
+
+    t_first = np.full(ex.shape, np.inf)
+    t_first[coeffs[..., 4] <= 0] = 0.0
+
+    # Parabolic rows need the full quartic
+    curved = (a != 0) & np.isinf(t_first)
+    if curved.any():
+        c = coeffs[curved]
+        roots = _quartic_roots(c)
+        real = np.abs(roots.imag) <= _IMAG_TOL * (1.0 + np.abs(roots.real))
+        t = roots.real
+        # Polish each root with a couple of Newton steps on the quartic
+        dc = c[:, :4] * np.array([4.0, 3.0, 2.0, 1.0])
+        for _ in range(2):
+            value = (((c[:, :1]*t + c[:, 1:2])*t + c[:, 2:3])*t + c[:, 3:4])*t + c[:, 4:5]
+            slope = ((dc[:, :1]*t + dc[:, 1:2])*t + dc[:, 2:3])*t + dc[:, 3:4]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                step = np.where(slope != 0, value / slope, 0.0)
+            t = t - step
+        ok = real & (t >= 0) & (t <= t_end[curved][:, None])
+        t_first[curved] = np.where(ok, t, np.inf).min(axis=-1)
+
+    # Straight rows (g == 0, e.g. polyline segments) reduce to a quadratic
+    straight = (a == 0) & np.isinf(t_first)
+    if straight.any():
+        lo, hi = _quadratic_roots(coeffs[..., 2][straight], coeffs[..., 3][straight],
+                                  coeffs[..., 4][straight])
+        end = t_end[straight]
+        t = np.where((lo >= 0) & (lo <= end), lo, np.inf)
+        t = np.where(np.isinf(t) & (hi >= 0) & (hi <= end), hi, t)
+        t_first[straight] = t
+
+    return t_first
+
+
+def _disc_box_entry(x0, y0, vx, vy, g, t_end, radius, left, bottom, right, top):
+    # A disc touches the box exactly when its centre enters the box grown by
+    # the radius: two stretched boxes plus a circle at each corner
+    wide = parabola_box_entry(x0, y0, vx, vy, g, t_end, left - radius, bottom,
+                              right - left + 2*radius, top - bottom)
+    tall = parabola_box_entry(x0, y0, vx, vy, g, t_end, left, bottom - radius,
+                              right - left, top - bottom + 2*radius)
+    times = [np.where(wide.hit, wide.time, np.inf), np.where(tall.hit, tall.time, np.inf)]
+    faces = [wide.face, tall.face]
+    for cx, cy in ((left, bottom), (left, top), (right, bottom), (right, top)):
+        t = _first_circle_entry(x0 - cx, y0 - cy, vx, vy, g, radius, t_end)
+        times.append(t)
+        faces.append(np.where(t == 0, FACE_INSIDE, FACE_CORNER))
+    times = np.stack(np.broadcast_arrays(*times), axis=-1)
+    faces = np.stack(np.broadcast_arrays(*faces), axis=-1)
+    best = np.argmin(times, axis=-1)[..., None]
+    t_first = np.take_along_axis(times, best, axis=-1)[..., 0]
+    face = np.take_along_axis(faces, best, axis=-1)[..., 0]
+    return t_first, np.where(np.isfinite(t_first), face, FACE_NONE)
+
+
+def _box_edges(box_x, box_y, box_width, box_height):
+    left = np.asarray(box_x, dtype=float)
+    bottom = np.asarray(box_y, dtype=float)
+    return left, bottom, left + np.asarray(box_width, dtype=float), bottom + np.asarray(box_height, dtype=float)
+
+
+def parabola_disc_contact(x0, y0, vx, vy, g, radius, box_x=None, box_y=0.0,
+                          box_width=0.0, box_height=0.0, ground_y=0.0):
+    """Exact first contact of a disc moving along a drag-free parabola.
+
+    The disc centre follows x(t) = x0 + vx*t, y(t) = y0 + vy*t - g*t^2/2
+    until the disc lands on the ground. Pass box_x=None to test the ground
+    only. All arguments broadcast.
+    """
+    x0, y0, vx, vy, g, radius = (np.asarray(v, dtype=float) for v in (x0, y0, vx, vy, g, radius))
+
+    # Ground contact: the descending crossing of y = ground + radius. A disc
+    # that never rises above that level lands as soon as it starts to fall.
+    _, t_ground = _quadratic_roots(-0.5*g, vy, y0 - ground_y - radius)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_ground = np.where(t_ground >= 0, t_ground, np.maximum(vy / g, 0.0))
+
+    if box_x is None:
+        t_target = np.full(t_ground.shape, np.inf)
+        face = np.full(t_ground.shape, FACE_NONE)
+    else:
+        t_target, face = _disc_box_entry(x0, y0, vx, vy, g, t_ground, radius,
+                                         *_box_edges(box_x, box_y, box_width, box_height))
+
+    target_hit = t_target <= t_ground
+    time = np.where(target_hit, t_target, t_ground)
+    surface = np.where(target_hit, SURFACE_TARGET, SURFACE_GROUND)
+    return Contact(target_hit, time, x0 + vx*time, y0 + vy*time - 0.5*g*time*time,
+                   surface, np.where(target_hit, face, FACE_NONE))
+
+
+def disc_target_contact(v0, angle_rad, h0, g, radius, target_x, target_width, target_height,
+                        target_y=0.0):
+    """First contact of a rock of the given radius thrown from (0, h0)."""
+    v0, angle_rad = np.asarray(v0, dtype=float), np.asarray(angle_rad, dtype=float)
+    return parabola_disc_contact(0.0, h0, v0*np.cos(angle_rad), v0*np.sin(angle_rad), g, radius,
+                                 target_x, target_y, target_width, target_height)
+
+
+def polyline_disc_contact(t, x, y, radius, box_x=None, box_y=0.0, box_width=0.0,
+                          box_height=0.0, ground_y=0.0):
+    """First contact of a disc whose centre follows sampled (t, x, y) paths.
+
+    t, x and y have shape (..., M) with one path per leading index; shorter
+    paths may be padded with NaN. The path is treated as straight between
+    samples, which makes the contact exact for numerically integrated paths.
+    Radius and box arguments broadcast against the leading dimensions.
+    """
+    t, x, y = (np.asarray(v, dtype=float) for v in (t, x, y))
+    radius = np.asarray(radius, dtype=float)[..., None]
+    ground = np.asarray(ground_y, dtype=float)[..., None] + radius
+
+    # Segment k runs from sample k to k+1 with parameter s in [0, 1]
+    x0, y0, t0 = x[..., :-1], y[..., :-1], t[..., :-1]
+    dx, dy, dt = np.diff(x, axis=-1), np.diff(y, axis=-1), np.diff(t, axis=-1)
+
+    # Ground: the first downward crossing of ground + radius, or a descent
+    # that starts while already in contact
+    with np.errstate(invalid="ignore", divide="ignore"):
+        crossing = (y0 > ground) & (y0 + dy <= ground)
+        s_ground = np.where(crossing, (y0 - ground) / -dy, np.inf)
+        s_ground = np.where((y0 <= ground) & (dy < 0), 0.0, s_ground)
+    t_ground_seg = t0 + s_ground*dt
+    t_ground = np.where(np.isfinite(t_ground_seg), t_ground_seg, np.inf).min(axis=-1)
+
+    if box_x is None:
+        t_target = np.full(t_ground.shape, np.inf)
+        face = np.full(t_ground.shape, FACE_NONE)
+    else:
+        edges = (np.asarray(v, dtype=float)[..., None] for v in _box_edges(box_x, box_y, box_width, box_height))
+        s_target, seg_face = _disc_box_entry(x0, y0, dx, dy, 0.0, 1.0, radius, *edges)
+        with np.errstate(invalid="ignore"):
+            t_seg = np.where(np.isfinite(s_target), t0 + s_target*dt, np.inf)
+        first = np.argmin(t_seg, axis=-1)[..., None]
+        t_target = np.take_along_axis(t_seg, first, axis=-1)[..., 0]
+        face = np.take_along_axis(seg_face, first, axis=-1)[..., 0]
+
+    target_hit = np.isfinite(t_target) & (t_target <= t_ground)
+    time = np.where(target_hit, t_target, t_ground)
+    surface = np.where(target_hit, SURFACE_TARGET,
+                       np.where(np.isfinite(t_ground), SURFACE_GROUND, SURFACE_NONE))
+
+    # Centre position at contact, interpolated within its segment
+    with np.errstate(invalid="ignore"):
+        idx = np.clip((t <= time[..., None]).sum(axis=-1) - 1, 0, t.shape[-1] - 2)[..., None]
+        ta = np.take_along_axis(t0, idx, axis=-1)[..., 0]
+        tb = ta + np.take_along_axis(dt, idx, axis=-1)[..., 0]
+        s = np.where(tb > ta, (time - ta) / (tb - ta), 0.0)
+        cx = np.take_along_axis(x0, idx, axis=-1)[..., 0] + s*np.take_along_axis(dx, idx, axis=-1)[..., 0]
+        cy = np.take_along_axis(y0, idx, axis=-1)[..., 0] + s*np.take_along_axis(dy, idx, axis=-1)[..., 0]
+    found = np.isfinite(time)
+    return Contact(target_hit, time, np.where(found, cx, np.nan), np.where(found, cy, np.nan),
+                   surface, np.where(target_hit, face, FACE_NONE))
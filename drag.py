@@ -0,0 +1,357 @@
+import numpy as np
+import dual
+
+# Sea-level air density (kg/m^3) and drag coefficient of a rough sphere
+AIR_DENSITY = 1.225
+SPHERE_DRAG_COEFFICIENT = 0.47
+
+# Why an integration stopped
+STOP_NONE = -1  # Ran out of steps or was never started
+STOP_GROUND = 0
+STOP_DISTANCE = 1
+
+# Dormand-Prince 5(4) tableau
+_DP_C = np.array([0.0, 1/5, 3/10, 4/5, 8/9, 1.0, 1.0])
+_DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+_DP_B = np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0])
+_DP_B_LOW = np.array([5179/57600, 0.0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+_DP_E = _DP_B - _DP_B_LOW
+
+# Adaptive step size control
+_SAFETY = 0.9
+_MIN_FACTOR = 0.2
+_MAX_FACTOR = 5.0
+
+# Steps per (vacuum) flight used to pick default step sizes
+_FIXED_STEPS_PER_FLIGHT = 256
+_INITIAL_STEPS_PER_FLIGHT = 100
+
+
+class DragModel:
+    """Quadratic air drag on a spherical rock of radius rock_size.
+
+    The drag deceleration is k*|v|*v with k = rho*Cd*A / (2*m). Any of the
+    parameters may be arrays so that a batch can mix rocks.
+    """
+
+    def __init__(self, rock_size, mass, drag_coefficient=SPHERE_DRAG_COEFFICIENT,
+                 air_density=AIR_DENSITY):
+        self.rock_size = rock_size
+        self.mass = mass
+        self.drag_coefficient = drag_coefficient
+        self.air_density = air_density
+
+    def __repr__(self):
+        return (f"DragModel(rock_size={self.rock_size!r}, mass={self.mass!r}, "
+                f"drag_coefficient={self.drag_coefficient!r}, air_density={self.air_density!r})")
+
+    @property
+    def coefficient(self):
+        area = np.pi * np.asarray(self.rock_size, dtype=float)**2
+        return 0.5 * self.air_density * self.drag_coefficient * area / np.asarray(self.mass, dtype=float)
+
+
+def _derivative(state, g, k):
+    # state columns: x, y, vx, vy
+    vx = state[:, 2]
+    vy = state[:, 3]
+    speed = np.sqrt(vx*vx + vy*vy)
+    return np.stack([vx, vy, -k*speed*vx, -g - k*speed*vy], axis=1)
+
+
+def _rk4_step(state, deriv, h, g, k):
+    hh = h[:, None]
+    k2 = _derivative(state + 0.5*hh*deriv, g, k)
+    k3 = _derivative(state + 0.5*hh*k2, g, k)
+    k4 = _derivative(state + hh*k3, g, k)
+    new = state + hh/6 * (deriv + 2*k2 + 2*k3 + k4)
+    return new, _derivative(new, g, k), np.zeros(len(state))
+
+
+def _dopri_step(state, deriv, h, g, k, rtol, atol):
+    hh = h[:, None]
+    stages = [deriv]
+    for i in range(1, 7):
+        increment = sum(a * stage for a, stage in zip(_DP_A[i], stages) if a != 0.0)
+        stages.append(_derivative(state + hh*increment, g, k))
+    # The 7th stage is evaluated at the 5th-order solution (FSAL)
+    new = state + hh * sum(b * stage for b, stage in zip(_DP_B, stages) if b != 0.0)
+    # Step control only looks at the values, so derivatives (dual.Dual
+    # states) are those of the scheme with the chosen steps
+    error = dual.value(hh * sum(e * stage for e, stage in zip(_DP_E, stages)))
+    scale = atol + rtol * np.maximum(np.abs(dual.value(state)), np.abs(dual.value(new)))
+    error_norm = np.sqrt(np.mean((error / scale)**2, axis=1))
+    return new, stages[6], error_norm
+
+
+def hermite(state0, deriv0, state1, deriv1, h, theta):
+    """Cubic Hermite interpolation across a step at fractions theta in [0, 1]."""
+    th = theta[:, None] if np.ndim(theta) == 1 and np.ndim(state0) == 2 else theta
+    hh = h[:, None] if np.ndim(h) == 1 and np.ndim(state0) == 2 else h
+    th2 = th*th
+    th3 = th2*th
+    return ((2*th3 - 3*th2 + 1)*state0 + (th3 - 2*th2 + th)*hh*deriv0
+            + (-2*th3 + 3*th2)*state1 + (th3 - th2)*hh*deriv1)
+
+
+def _hermite_root(p0, d0, p1, d1, h, level, iterations=8):
+    # Fraction theta of the step where the Hermite cubic of one component
+    # reaches level; starts from the chord and polishes with safeguarded Newton
+    with np.errstate(invalid="ignore", divide="ignore"):
+        theta = np.where(p1 != p0, (level - p0) / (p1 - p0), 0.0)
+    theta = np.clip(np.nan_to_num(theta), 0.0, 1.0)
+    m0 = h*d0
+    m1 = h*d1
+    for _ in range(iterations):
+        th2 = theta*theta
+        th3 = th2*theta
+        value = ((2*th3 - 3*th2 + 1)*p0 + (th3 - 2*th2 + theta)*m0
+                 + (-2*th3 + 3*th2)*p1 + (th3 - th2)*m1 - level)
+        slope = ((6*th2 - 6*theta)*p0 + (3*th2 - 4*theta + 1)*m0
+                 + (-6*th2 + 6*theta)*p1 + (3*th2 - 2*theta)*m1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            step = np.where(slope != 0, value / slope, 0.0)
+        theta = np.clip(theta - step, 0.0, 1.0)
+    return theta
+
+
+class DragSolution:
+    """Outcome of a batched drag integration.
+
+    Per-throw arrays have one entry per throw. When the integration was run
+    with record=True the accepted steps of every throw are kept in one
+    ragged buffer: the steps of throw i are path_*[path_offsets[i]:path_offsets[i+1]].
+    """
+
+    def __init__(self, n):
+        self.flight_time = np.full(n, np.nan)
+        self.distance = np.full(n, np.nan)
+        self.max_height = np.full(n, np.nan)
+        self.max_height_time = np.full(n, np.nan)
+        self.apex_x = np.full(n, np.nan)
+        self.end_state = np.full((n, 4), np.nan)
+        self.stop_reason = np.full(n, STOP_NONE)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.valid = np.zeros(n, dtype=bool)
+        self.path_offsets = None
+        self.path_t = None
+        self.path_state = None
+        self.path_deriv = None
+
+    def __len__(self):
+        return len(self.flight_time)
+
+    def path(self, i):
+        """Recorded (t, state, derivative) of throw i."""
+        if self.path_offsets is None:
+            raise ValueError("Integration was run without record=True")
+        lo, hi = self.path_offsets[i], self.path_offsets[i + 1]
+        return self.path_t[lo:hi], self.path_state[lo:hi], self.path_deriv[lo:hi]
+
+    def sample(self, i, times):
+        """States of throw i at the given times, by Hermite dense output."""
+        t, state, deriv = self.path(i)
+        times = np.clip(np.asarray(times, dtype=float), t[0], t[-1])
+        j = np.clip(np.searchsorted(t, times, side="right") - 1, 0, len(t) - 2)
+        h = t[j + 1] - t[j]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            theta = np.where(h > 0, (times - t[j]) / h, 0.0)
+        return hermite(state[j], deriv[j], state[j + 1], deriv[j + 1], h, theta)
+
+    def sample_all(self, times, rows=None):
+        """States of many throws at their own times, shape (len(rows), M, 4).
+
+        times has shape (len(rows), M), one row per throw in rows (default:
+        every throw). Throws without a recorded path come back as NaN.
+        """
+        if self.path_offsets is None:
+            raise ValueError("Integration was run without record=True")
+        counts = np.diff(self.path_offsets)
+        rows = np.arange(len(counts)) if rows is None else np.asarray(rows, dtype=int)
+        times = np.asarray(times, dtype=float)
+        out = np.full(times.shape + (4,), np.nan)
+        recorded = np.nonzero(counts[rows] >= 2)[0]
+        if len(recorded) == 0:
+            return out
+        rows = rows[recorded]
+        # Shift every path (and its query times) by its own offset so that
+        # one searchsorted over the ragged buffer finds all the steps
+        first, last = self.path_offsets[rows], self.path_offsets[rows + 1] - 1
+        spacing = np.nanmax(np.abs(self.path_t)) + 1.0
+        shifted = self.path_t + np.repeat(np.arange(len(counts)), counts) * spacing
+        clipped = np.clip(times[recorded], self.path_t[first][:, None],
+                          self.path_t[last][:, None])
+        j = np.searchsorted(shifted, clipped + rows[:, None] * spacing, side="right") - 1
+        j = np.clip(j, first[:, None], last[:, None] - 1)
+        h = self.path_t[j + 1] - self.path_t[j]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            theta = np.where(h > 0, (clipped - self.path_t[j]) / h, 0.0)
+        out[recorded] = hermite(self.path_state[j], self.path_deriv[j], self.path_state[j + 1],
+                                self.path_deriv[j + 1], h[..., None], theta[..., None])
+        return out
+
+
+def integrate(v0, angle_rad, h0, g, drag, method="adaptive", rtol=1e-6, atol=1e-6,
+              dt=None, x_stop=None, record=False, max_steps=10000):
+    """Integrate a batch of throws with quadratic drag in lockstep.
+
+    Every active throw advances one step per iteration as rows of a NumPy
+    array; throws that land (or reach x_stop) leave the active set and their
+    stopping point is located on the step by Hermite interpolation, then
+    polished by re-stepping onto it. method is "adaptive" (Dormand-Prince
+    5(4) with per-throw step control) or "fixed" (classic RK4 with step dt,
+    by default 1/256 of the drag-free flight time).
+
+    Any of v0, angle_rad, h0, g and the drag coefficient (drag itself may
+    be the coefficient) can be dual.Dual arrays. The flight time, range,
+    apex and end state then come back as Duals too, differentiated through
+    the integration and the event location in the same pass; the recorded
+    paths keep plain values.
+    """
+    if method not in ("adaptive", "fixed"):
+        raise ValueError(f"Unknown integration method: {method!r}")
+
+    k = drag.coefficient if isinstance(drag, DragModel) else drag
+    v0, angle_rad, h0, g, k, x_stop = (np.ravel(a) for a in np.broadcast_arrays(
+        dual.asarray(v0), dual.asarray(angle_rad), dual.asarray(h0), dual.asarray(g),
+        dual.asarray(k), np.asarray(np.inf if x_stop is None else x_stop, dtype=float)))
+    n = len(v0)
+    solution = DragSolution(n)
+    derivatives = dual.derivative_count((v0, angle_rad, h0, g, k))
+    if derivatives is not None:
+        for name in ("flight_time", "max_height", "max_height_time", "apex_x", "end_state"):
+            setattr(solution, name, dual.constant(getattr(solution, name), derivatives))
+
+    state = np.stack([np.zeros(n), h0, v0*np.cos(angle_rad), v0*np.sin(angle_rad)], axis=1)
+    usable = ((v0 > 0) & (g > 0) & (k >= 0) & np.isfinite(state).all(axis=1)
+              & np.isfinite(k) & (h0 >= 0))
+
+    # Drag-free flight time bounds the flight with drag and sets the step scale
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_vacuum = dual.value((state[:, 3] + np.sqrt(state[:, 3]**2 + 2*g*h0)) / g)
+    usable &= np.isfinite(t_vacuum) & (t_vacuum > 0)
+    if dt is not None:
+        step = np.broadcast_to(np.asarray(dt, dtype=float), (n,)).copy()
+    elif method == "fixed":
+        step = t_vacuum / _FIXED_STEPS_PER_FLIGHT
+    else:
+        step = t_vacuum / _INITIAL_STEPS_PER_FLIGHT
+
+    # Throws launched level or downward are at their apex immediately
+    falling = (state[:, 3] <= 0) & usable
+    solution.max_height_time[falling] = 0.0
+    solution.max_height[falling] = h0[falling]
+    solution.apex_x[falling] = 0.0
+
+    if method == "adaptive":
+        def stepper(state, deriv, h, g, k):
+            return _dopri_step(state, deriv, h, g, k, rtol, atol)
+    else:
+        stepper = _rk4_step
+
+    active = np.nonzero(usable)[0]
+    s = state[active]
+    f = _derivative(s, g[active], k[active])
+    t = np.zeros(len(active))
+    h = step[active]
+    records = []
+    if record:
+        records.append((active, t.copy(), s.copy(), f.copy()))
+
+    for _ in range(max_steps):
+        if len(active) == 0:
+            break
+        ga, ka = g[active], k[active]
+        s_new, f_new, error = stepper(s, f, h, ga, ka)
+        with np.errstate(divide="ignore"):
+            factor = np.clip(_SAFETY * error**-0.2, _MIN_FACTOR, _MAX_FACTOR)
+        accepted = error <= 1.0
+        solution.steps[active] += 1
+
+        # Apex: vertical velocity changes sign during the step
+        apex = accepted & (s[:, 3] > 0) & (s_new[:, 3] <= 0)
+        if apex.any():
+            a = np.nonzero(apex)[0]
+            theta = _hermite_root(s[a, 3], f[a, 3], s_new[a, 3], f_new[a, 3], h[a], 0.0)
+            at = hermite(s[a], f[a], s_new[a], f_new[a], h[a], theta)
+            rows = active[a]
+            solution.max_height_time[rows] = t[a] + theta*h[a]
+            solution.apex_x[rows] = at[:, 0]
+            solution.max_height[rows] = at[:, 1]
+
+        # Terminal events: landing, or reaching x_stop
+        ground = accepted & (s_new[:, 1] < 0) & (s_new[:, 3] < 0)
+        distance = accepted & (s_new[:, 0] >= x_stop[active])
+        done = ground | distance
+        if done.any():
+            d = np.nonzero(done)[0]
+            theta_ground = np.where(
+                ground[d], _hermite_root(s[d, 1], f[d, 1], s_new[d, 1], f_new[d, 1], h[d], 0.0), np.inf)
+            theta_x = np.where(
+                distance[d], _hermite_root(s[d, 0], f[d, 0], s_new[d, 0], f_new[d, 0], h[d],
+                                           x_stop[active[d]]), np.inf)
+            by_ground = theta_ground <= theta_x
+            theta = np.where(by_ground, theta_ground, theta_x)
+            component = np.where(by_ground, 1, 0)
+            level = np.where(by_ground, 0.0, x_stop[active[d]])
+            end, end_f, h_end = _polish_stop(stepper, s[d], f[d], h[d]*theta, ga[d], ka[d],
+                                             component, level)
+            rows = active[d]
+            solution.end_state[rows] = end
+            solution.flight_time[rows] = t[d] + h_end
+            solution.stop_reason[rows] = np.where(by_ground, STOP_GROUND, STOP_DISTANCE)
+            if record:
+                records.append((rows, t[d] + h_end, end, end_f))
+
+        # Advance accepted rows, retry rejected ones with a smaller step
+        moving = accepted & ~done
+        t = np.where(moving, t + h, t)
+        s = np.where(moving[:, None], s_new, s)
+        f = np.where(moving[:, None], f_new, f)
+        if record and moving.any():
+            records.append((active[moving], t[moving], s[moving], f[moving]))
+        if method == "adaptive":
+            h = h * factor
+
+        keep = ~done
+        active, s, f, t, h = active[keep], s[keep], f[keep], t[keep], h[keep]
+
+    finished = solution.stop_reason != STOP_NONE
+    # A throw that stops at x_stop has not landed: its flight time is the
+    # time to reach x_stop and it has no range
+    solution.distance = np.where(solution.stop_reason == STOP_GROUND, solution.end_state[:, 0], np.nan)
+    solution.valid = finished & (solution.flight_time > 0)
+
+    if record:
+        _collect_paths(solution, records, n)
+    return solution
+
+
+def _polish_stop(stepper, state, deriv, h, g, k, component, level, iterations=2):
+    # Re-step from the start of the step onto the Hermite estimate of the
+    # stopping point, then correct with Newton on the stopping component
+    rows = np.arange(len(state))
+    for _ in range(iterations):
+        end, end_f, _ = stepper(state, deriv, h, g, k)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correction = (level - end[rows, component]) / end_f[rows, component]
+        h = np.maximum(h + np.nan_to_num(correction), 0.0)
+    end, end_f, _ = stepper(state, deriv, h, g, k)
+    return end, end_f, h
+
+
+def _collect_paths(solution, records, n):
+    rows = np.concatenate([r[0] for r in records])
+    order = np.argsort(rows, kind="stable")
+    solution.path_offsets = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+    solution.path_t = np.concatenate([dual.value(r[1]) for r in records])[order]
+    solution.path_state = np.concatenate([dual.value(r[2]) for r in records])[order]
+    solution.path_deriv = np.concatenate([dual.value(r[3]) for r in records])[order]
@@ -0,0 +1,352 @@
+import numpy as np
+
+
+class Dual:
+    """Arrays of dual numbers for forward-mode differentiation.
+
+    ``value`` holds the values and ``grad`` their derivatives with respect
+    to n seed variables along a trailing axis, so ``grad`` has shape
+    ``value.shape + (n,)``. Arithmetic and the common NumPy functions (see
+    _UNARY, _BINARY and _FUNCTIONS) carry the derivatives along exactly;
+    comparisons and predicates such as np.isfinite look at the values only.
+    Create them with variables().
+    """
+
+    __slots__ = ("value", "grad")
+
+    def __init__(self, value, grad):
+        self.value = np.asanyarray(value, dtype=float)
+        self.grad = np.asarray(grad, dtype=float)
+
+    def __repr__(self):
+        return f"Dual(value={self.value!r}, grad={self.grad!r})"
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    @property
+    def ndim(self):
+        return self.value.ndim
+
+    @property
+    def size(self):
+        return self.value.size
+
+    @property
+    def derivatives(self):
+        return self.grad.shape[-1]
+
+    def __len__(self):
+        return len(self.value)
+
+    def _index(self, key):
+        # Indices address the value axes; the derivative axis rides along
+        return (key if isinstance(key, tuple) else (key,)) + (slice(None),)
+
+    def __getitem__(self, key):
+        return Dual(self.value[key], self.grad[self._index(key)])
+
+    def __setitem__(self, key, other):
+        self.value[key] = value(other)
+        self.grad[self._index(key)] = gradient(other) if isinstance(other, Dual) else 0.0
+
+    def copy(self):
+        return Dual(self.value.copy(), self.grad.copy())
+
+    def reshape(self, *shape):
+        shape = shape[0] if len(shape) == 1 and isinstance(shape[0], tuple) else shape
+        values = self.value.reshape(shape)
+        return Dual(values, self.grad.reshape(values.shape + (self.derivatives,)))
+
+    def ravel(self):
+        return self.reshape(-1)
+
+    # Arithmetic goes through the ufuncs below
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.true_divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.true_divide(other, self)
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __rpow__(self, other):
+        return np.power(other, self)
+
+    def __matmul__(self, other):
+        return _matmul(self, other)
+
+    def __rmatmul__(self, other):
+        return _matmul(other, self)
+
+    def __lt__(self, other):
+        return self.value < value(other)
+
+    def __le__(self, other):
+        return self.value <= value(other)
+
+    def __gt__(self, other):
+        return self.value > value(other)
+
+    def __ge__(self, other):
+        return self.value >= value(other)
+
+    def __eq__(self, other):
+        return self.value == value(other)
+
+    def __ne__(self, other):
+        return self.value != value(other)
+
+    __hash__ = None
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or "out" in kwargs:
+            return NotImplemented
+        if ufunc in _PREDICATES:
+            return ufunc(*(value(x) for x in inputs), **kwargs)
+        values = [value(x) for x in inputs]
+        if ufunc in _UNARY:
+            (x,) = inputs
+            result = ufunc(*values)
+            return Dual(result, _scale(x.grad, _UNARY[ufunc](values[0], result)))
+        if ufunc in _BINARY:
+            result = ufunc(*values)
+            da, db = _BINARY[ufunc](*values, result)
+            return Dual(result, _combine(inputs, (da, db), result.shape))
+        return NotImplemented
+
+    def __array_function__(self, func, types, args, kwargs):
+        implementation = _FUNCTIONS.get(func)
+        if implementation is None or not all(issubclass(t, (Dual, np.ndarray)) for t in types):
+            return NotImplemented
+        return implementation(*args, **kwargs)
+
+
+def value(x):
+    """The value part of x, or x itself if it is not a Dual."""
+    return x.value if isinstance(x, Dual) else x
+
+
+def gradient(x):
+    """The derivative part of x; 0 if it is not a Dual."""
+    return x.grad if isinstance(x, Dual) else 0.0
+
+
+def asarray(x):
+    """x as a float array, leaving Duals alone."""
+    return x if isinstance(x, Dual) else np.asarray(x, dtype=float)
+
+
+def constant(x, derivatives):
+    """x as a Dual with zero derivatives."""
+    x = np.asarray(value(x), dtype=float)
+    return Dual(x.copy(), np.zeros(x.shape + (derivatives,)))
+
+
+def variables(*values):
+    """Seed Duals for the given values, one derivative direction each.
+
+    The derivatives of anything computed from the returned Duals are then
+    taken with respect to them, in order along the trailing grad axis.
+    """
+    n = len(values)
+    out = []
+    for i, x in enumerate(values):
+        x = np.asarray(x, dtype=float)
+        grad = np.zeros(x.shape + (n,))
+        grad[..., i] = 1.0
+        out.append(Dual(x.copy(), grad))
+    return tuple(out)
+
+
+def derivative_count(args):
+    """Number of derivatives carried by the Duals among args; None if none."""
+    for x in args:
+        if isinstance(x, Dual):
+            return x.derivatives
+    return None
+
+
+def _lift(args):
+    n = derivative_count(args)
+    return [x if isinstance(x, Dual) else constant(x, n) for x in args]
+
+
+def _scale(grad, factor):
+    if isinstance(factor, float):
+        return grad if factor == 1.0 else grad * factor
+    # The value already warned about any inf or NaN; do not warn again
+    with np.errstate(invalid="ignore", over="ignore"):
+        return grad * np.asarray(factor)[..., None]
+
+
+def _combine(inputs, factors, shape):
+    grad = None
+    for x, factor in zip(inputs, factors):
+        if isinstance(x, Dual):
+            term = _scale(x.grad, factor)
+            grad = term if grad is None else grad + term
+    shape = shape + grad.shape[-1:]
+    if grad.shape != shape:
+        grad = np.broadcast_to(grad, shape).copy()
+    elif any(grad is x.grad for x in inputs if isinstance(x, Dual)):
+        # Results never share memory with their inputs, as in NumPy
+        grad = grad.copy()
+    return grad
+
+
+def _sqrt_grad(x, result):
+    with np.errstate(divide="ignore"):
+        return 0.5 / result
+
+
+_UNARY = {
+    np.negative: lambda x, r: -1.0,
+    np.positive: lambda x, r: 1.0,
+    np.absolute: lambda x, r: np.sign(x),
+    np.sqrt: _sqrt_grad,
+    np.square: lambda x, r: 2 * x,
+    np.exp: lambda x, r: r,
+    np.expm1: lambda x, r: r + 1,
+    np.log: lambda x, r: 1 / x,
+    np.log1p: lambda x, r: 1 / (1 + x),
+    np.sin: lambda x, r: np.cos(x),
+    np.cos: lambda x, r: -np.sin(x),
+    np.tan: lambda x, r: 1 + r*r,
+    np.arcsin: lambda x, r: 1 / np.sqrt(1 - x*x),
+    np.arccos: lambda x, r: -1 / np.sqrt(1 - x*x),
+    np.arctan: lambda x, r: 1 / (1 + x*x),
+    np.sinh: lambda x, r: np.cosh(x),
+    np.cosh: lambda x, r: np.sinh(x),
+    np.tanh: lambda x, r: 1 - r*r,
+}
+
+
+def _power_grad(a, b, r):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return b * np.power(a, b - 1), np.where(a > 0, r * np.log(np.where(a > 0, a, 1.0)), 0.0)
+
+
+def _pick(mask):
+    mask = np.asarray(mask)
+    return mask.astype(float), (~mask).astype(float)
+
+
+_BINARY = {
+    np.add: lambda a, b, r: (1.0, 1.0),
+    np.subtract: lambda a, b, r: (1.0, -1.0),
+    np.multiply: lambda a, b, r: (b, a),
+    np.true_divide: lambda a, b, r: (1 / b, -r / b),
+    np.power: _power_grad,
+    np.arctan2: lambda a, b, r: (b / (a*a + b*b), -a / (a*a + b*b)),
+    np.hypot: lambda a, b, r: (a / r, b / r),
+    np.maximum: lambda a, b, r: _pick(a >= b),
+    np.minimum: lambda a, b, r: _pick(a <= b),
+    np.fmax: lambda a, b, r: _pick((a >= b) | np.isnan(b)),
+    np.fmin: lambda a, b, r: _pick((a <= b) | np.isnan(b)),
+}
+
+_PREDICATES = {
+    np.isfinite, np.isnan, np.isinf, np.signbit, np.sign,
+    np.less, np.less_equal, np.greater, np.greater_equal, np.equal, np.not_equal,
+}
+
+
+def _matmul(a, b):
+    a, b = _lift([a, b])
+    result = a.value @ b.value
+    grad = (np.einsum("...ij,...jkn->...ikn", a.value, b.grad)
+            + np.einsum("...ijn,...jk->...ikn", a.grad, b.value))
+    return Dual(result, grad)
+
+
+def _where(condition, a, b):
+    condition = np.asarray(value(condition), dtype=bool)
+    a, b = _lift([a, b])
+    return Dual(np.where(condition, a.value, b.value),
+                np.where(condition[..., None], a.grad, b.grad))
+
+
+def _stack(arrays, axis=0):
+    arrays = _lift(arrays)
+    values = np.stack([x.value for x in arrays], axis=axis)
+    # Negative axes count from the end of the values, not the gradients
+    grad_axis = axis if axis >= 0 else axis - 1
+    return Dual(values, np.stack([np.broadcast_to(x.grad, x.value.shape + x.grad.shape[-1:])
+                                  for x in arrays], axis=grad_axis))
+
+
+def _concatenate(arrays, axis=0):
+    arrays = _lift(arrays)
+    grad_axis = axis if axis >= 0 else axis - 1
+    return Dual(np.concatenate([x.value for x in arrays], axis=axis),
+                np.concatenate([x.grad for x in arrays], axis=grad_axis))
+
+
+def _broadcast_arrays(*args):
+    shape = np.broadcast_shapes(*(np.shape(value(x)) for x in args))
+    return [Dual(np.broadcast_to(x.value, shape), np.broadcast_to(x.grad, shape + x.grad.shape[-1:]))
+            if isinstance(x, Dual) else np.broadcast_to(x, shape) for x in args]
+
+
+def _clip(x, low, high):
+    return np.minimum(np.maximum(x, low), high)
+
+
+def _nan_to_num(x, copy=True):
+    bad = ~np.isfinite(x.value)
+    return Dual(np.nan_to_num(x.value), np.where(bad[..., None], 0.0, np.nan_to_num(x.grad)))
+
+
+def _sum(x, axis=None):
+    if axis is None:
+        return Dual(x.value.sum(), x.grad.reshape(-1, x.derivatives).sum(axis=0))
+    grad_axis = axis if axis >= 0 else axis - 1
+    return Dual(x.value.sum(axis=axis), x.grad.sum(axis=grad_axis))
+
+
+_FUNCTIONS = {
+    np.where: _where,
+    np.stack: _stack,
+    np.concatenate: _concatenate,
+    np.broadcast_arrays: _broadcast_arrays,
+    np.clip: _clip,
+    np.nan_to_num: _nan_to_num,
+    np.sum: _sum,
+    np.matmul: _matmul,
+    np.copy: lambda x: x.copy(),
+    np.ravel: lambda x: x.ravel(),
+    np.reshape: lambda x, shape: x.reshape(shape),
+    np.ndim: lambda x: x.ndim,
+    np.shape: lambda x: x.shape,
+    np.size: lambda x: x.size,
+}
@@ -0,0 +1,478 @@
+import math
+import numpy as np
+import collision
+import dual
+from drag import integrate as integrate_drag
+
+# Largest distance (m) between the sampled polyline and the true path when
+# the sample count is chosen automatically, and the bounds on that count
+DEFAULT_TOLERANCE = 1e-3
+MIN_POINTS = 16
+MAX_POINTS = 4096
+
+# Dense-output samples used to hit-test integrated (drag) paths
+HIT_TEST_POINTS = 2048
+
+
+class Target:
+    """Axis-aligned target box standing on the ground."""
+
+    def __init__(self, x, width, height, y=0.0):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def __repr__(self):
+        return (f"Target(x={self.x!r}, width={self.width!r}, "
+                f"height={self.height!r}, y={self.y!r})")
+
+
+class ParabolaPath:
+    """Closed-form state of a drag-free throw at any time.
+
+    Each method takes a time or array of times and returns an (x, y) pair
+    of arrays; times outside the flight are clamped to it.
+    """
+
+    __slots__ = ("h0", "v0x", "v0y", "g", "flight_time")
+
+    def __init__(self, h0, v0x, v0y, g, flight_time):
+        self.h0 = h0
+        self.v0x = v0x
+        self.v0y = v0y
+        self.g = g
+        self.flight_time = flight_time
+
+    def _clip(self, t):
+        return np.clip(np.asarray(t, dtype=float), 0.0, self.flight_time)
+
+    def position(self, t):
+        t = self._clip(t)
+        return self.v0x * t, self.h0 + t * (self.v0y - 0.5 * self.g * t)
+
+    def velocity(self, t):
+        t = self._clip(t)
+        return np.full_like(t, self.v0x), self.v0y - self.g * t
+
+    def acceleration(self, t):
+        t = self._clip(t)
+        return np.zeros_like(t), np.full_like(t, -self.g)
+
+
+class DragPath:
+    """State of an integrated (drag) throw at any time.
+
+    Interpolates the recorded steps of a drag.DragSolution with its Hermite
+    dense output; same interface as ParabolaPath.
+    """
+
+    __slots__ = ("solution", "index", "g", "k")
+
+    def __init__(self, solution, index, g, k):
+        self.solution = solution
+        self.index = index
+        self.g = g
+        self.k = k
+
+    def _state(self, t):
+        t = np.asarray(t, dtype=float)
+        state = self.solution.sample(self.index, t.ravel())
+        return state.T.reshape((4,) + t.shape)
+
+    def position(self, t):
+        x, y, _, _ = self._state(t)
+        return x, y
+
+    def velocity(self, t):
+        _, _, vx, vy = self._state(t)
+        return vx, vy
+
+    def acceleration(self, t):
+        _, _, vx, vy = self._state(t)
+        speed = np.hypot(vx, vy)
+        return -self.k * speed * vx, -self.g - self.k * speed * vy
+
+
+class TrajectoryResult:
+    """Result of a single throw.
+
+    The sampled path lives in one (3, N) buffer, ``samples``, whose rows are
+    t, x and y; ``times``, ``x`` and ``y`` are views of those rows, or None
+    for a summary-only result. position, velocity and acceleration evaluate
+    the path at any time without the samples. Fields are also available by
+    key (``result["x"]``) for older callers.
+    """
+
+    FIELDS = ("times", "x", "y", "v0x", "v0y", "max_height", "distance",
+              "flight_time", "max_height_time", "max_height_x", "target_hit", "hit_time")
+
+    __slots__ = ("samples", "v0x", "v0y", "max_height", "distance", "flight_time",
+                 "max_height_time", "max_height_x", "target_hit", "hit_time", "evaluator")
+
+    def __init__(self, samples, v0x, v0y, max_height, distance, flight_time,
+                 max_height_time, max_height_x=None, target_hit=False, hit_time=None,
+                 evaluator=None):
+        self.samples = samples
+        self.v0x = v0x
+        self.v0y = v0y
+        self.max_height = max_height
+        self.distance = distance
+        self.flight_time = flight_time
+        self.max_height_time = max_height_time
+        # Horizontal position of the apex (v0x * max_height_time without drag)
+        self.max_height_x = v0x * max_height_time if max_height_x is None else max_height_x
+        self.target_hit = target_hit
+        self.hit_time = hit_time
+        self.evaluator = evaluator
+
+    def _path(self):
+        if self.evaluator is None:
+            raise ValueError("This trajectory has no path to evaluate")
+        return self.evaluator
+
+    def position(self, t):
+        """(x, y) at time(s) t."""
+        return self._path().position(t)
+
+    def velocity(self, t):
+        """(vx, vy) at time(s) t."""
+        return self._path().velocity(t)
+
+    def acceleration(self, t):
+        """(ax, ay) at time(s) t."""
+        return self._path().acceleration(t)
+
+    @property
+    def times(self):
+        return None if self.samples is None else self.samples[0]
+
+    @property
+    def x(self):
+        return None if self.samples is None else self.samples[1]
+
+    @property
+    def y(self):
+        return None if self.samples is None else self.samples[2]
+
+    @property
+    def nbytes(self):
+        return 0 if self.samples is None else self.samples.nbytes
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+
+class TrajectoryBatch:
+    """Many throws stored together in one ragged buffer.
+
+    ``samples`` is a (3, total) array of t, x and y; throw i occupies the
+    columns offsets[i]:offsets[i+1]. The per-throw scalars are arrays, with
+    NaN hit_time for throws that miss. Indexing returns a TrajectoryResult
+    whose samples are a view into the shared buffer.
+    """
+
+    SCALARS = ("v0x", "v0y", "max_height", "distance", "flight_time",
+               "max_height_time", "max_height_x", "hit_time")
+
+    __slots__ = ("offsets", "samples", "target_hit") + SCALARS
+
+    def __init__(self, offsets, samples, target_hit, **scalars):
+        self.offsets = offsets
+        self.samples = samples
+        self.target_hit = target_hit
+        for key in self.SCALARS:
+            setattr(self, key, scalars[key])
+
+    @classmethod
+    def from_results(cls, results):
+        """Pack a sequence of TrajectoryResult into one batch."""
+        results = list(results)
+        lengths = [0 if r.samples is None else r.samples.shape[1] for r in results]
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.intp)
+        samples = np.empty((3, offsets[-1]))
+        for r, lo, hi in zip(results, offsets[:-1], offsets[1:]):
+            if r.samples is not None:
+                samples[:, lo:hi] = r.samples
+        scalars = {key: np.array([getattr(r, key) for r in results], dtype=float)
+                   for key in cls.SCALARS if key != "hit_time"}
+        scalars["hit_time"] = np.array([np.nan if r.hit_time is None else r.hit_time
+                                        for r in results], dtype=float)
+        target_hit = np.array([r.target_hit for r in results], dtype=bool)
+        return cls(offsets, samples, target_hit, **scalars)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        return (self.samples.nbytes + self.offsets.nbytes + self.target_hit.nbytes
+                + sum(getattr(self, key).nbytes for key in self.SCALARS))
+
+    def path(self, i):
+        """The (3, N) t/x/y view of throw i."""
+        return self.samples[:, self.offsets[i]:self.offsets[i + 1]]
+
+    def __getitem__(self, i):
+        hit_time = self.hit_time[i]
+        return TrajectoryResult(
+            self.path(i),
+            **{key: float(getattr(self, key)[i]) for key in self.SCALARS if key != "hit_time"},
+            target_hit=bool(self.target_hit[i]),
+            hit_time=None if np.isnan(hit_time) else float(hit_time),
+        )
+
+
+def sample_count(flight_time, max_acceleration, tolerance=DEFAULT_TOLERANCE):
+    """Number of evenly timed samples that keep the chords within tolerance.
+
+    A chord over a time step dt strays at most a*dt^2/8 from a path whose
+    acceleration is at most a, so long or sharply bending flights get more
+    points and short lobs get fewer.
+    """
+    if tolerance <= 0:
+        return MAX_POINTS
+    dt = math.sqrt(8 * tolerance / max_acceleration)
+    return min(max(math.ceil(flight_time / dt) + 1, MIN_POINTS), MAX_POINTS)
+
+
+def calculate_trajectory(v0, angle_rad, h0, g, target=None, rock_size=0.0,
+                         num_points=None, drag=None, summary=False,
+                         tolerance=DEFAULT_TOLERANCE):
+    """Compute the trajectory of a throw.
+
+    Without a drag model the closed-form parabola is used; pass a
+    drag.DragModel to integrate the flight with quadratic air drag. With a
+    positive rock_size the target test treats the rock as a disc of that
+    radius rather than a point. The path is sampled at num_points evenly
+    spaced times, or, when num_points is None, at as few as keep the polyline
+    within tolerance metres of the true path (see sample_count). With
+    summary=True no samples are built and only the scalar fields are filled
+    in. Raises ValueError for parameters that do not describe a valid throw.
+    """
+    if v0 <= 0 or g <= 0:
+        raise ValueError("Velocity and gravity must be positive values!")
+
+    if drag is not None:
+        return _calculate_drag_trajectory(v0, angle_rad, h0, g, target, rock_size,
+                                          num_points, drag, summary, tolerance)
+
+    # Calculate velocity components
+    v0x = v0 * math.cos(angle_rad)
+    v0y = v0 * math.sin(angle_rad)
+
+    # Calculate time when projectile hits the ground
+    # Using quadratic formula: h0 + v0y*t - 0.5*g*t^2 = 0
+    # at^2 + bt + c = 0, where a = -0.5*g, b = v0y, c = h0
+    discriminant = v0y**2 + 2*g*h0
+
+    if discriminant >= 0:
+        t_flight = (v0y + math.sqrt(discriminant)) / g
+    else:
+        # It never reaches the ground (only possible below ground level)
+        t_flight = 0
+
+    if t_flight <= 0:
+        raise ValueError("Invalid trajectory - Check your parameters")
+
+    # Calculate range
+    distance = v0x * t_flight
+
+    # Calculate maximum height time
+    t_max_height = v0y / g if v0y > 0 else 0
+
+    # Calculate maximum height
+    max_height = h0 + v0y**2 / (2*g) if v0y > 0 else h0
+
+    # Create time points and x, y coordinates in one (3, N) buffer
+    samples = None
+    if not summary:
+        if num_points is None:
+            num_points = sample_count(t_flight, g, tolerance)
+        samples = np.empty((3, num_points))
+        t, x, y = samples
+        t[:] = np.linspace(0, t_flight, num_points)
+        np.multiply(v0x, t, out=x)
+        np.multiply(-0.5 * g, t, out=y)
+        y += v0y
+        y *= t
+        y += h0
+
+    # Check if target is hit, solving exactly for the entry point
+    target_hit = False
+    hit_time = None
+
+    if target is not None and rock_size > 0:
+        contact = collision.disc_target_contact(v0, angle_rad, h0, g, rock_size, target.x,
+                                                target.width, target.height, target.y)
+        if contact.target_hit:
+            target_hit = True
+            hit_time = float(contact.time)
+    elif target is not None:
+        entry = collision.target_intersection(v0, angle_rad, h0, g, target.x, target.width,
+                                              target.height, target.y)
+        if entry.hit:
+            target_hit = True
+            hit_time = float(entry.time)
+
+    return TrajectoryResult(
+        samples=samples,
+        v0x=v0x,
+        v0y=v0y,
+        max_height=max_height,
+        distance=distance,
+        flight_time=t_flight,
+        max_height_time=t_max_height,
+        target_hit=target_hit,
+        hit_time=hit_time,
+        evaluator=ParabolaPath(h0, v0x, v0y, g, t_flight),
+    )
+
+
+def _calculate_drag_trajectory(v0, angle_rad, h0, g, target, rock_size, num_points, drag,
+                               summary, tolerance):
+    # The recorded path is only needed for samples, evaluation or the
+    # target test
+    record = not summary or target is not None
+    solution = integrate_drag(v0, angle_rad, h0, g, drag, record=record)
+    if not solution.valid[0]:
+        raise ValueError("Invalid trajectory - Check your parameters")
+
+    k = float(getattr(drag, "coefficient", drag))
+
+    t_flight = float(solution.flight_time[0])
+    samples = None
+    if not summary:
+        if num_points is None:
+            # Drag adds at most k*v^2 to gravity, and the speed peaks either
+            # at launch or at landing
+            vx, vy = solution.end_state[0, 2:]
+            speed = max(v0, math.hypot(vx, vy))
+            num_points = sample_count(t_flight, g + k * speed**2, tolerance)
+        samples = np.empty((3, num_points))
+        samples[0] = np.linspace(0, t_flight, num_points)
+        samples[1:] = solution.sample(0, samples[0])[:, :2].T
+
+    target_hit = False
+    hit_time = None
+
+    if target is not None:
+        # Hit-test the rock against a finely resampled copy of the path
+        dense_points = max(samples.shape[1], HIT_TEST_POINTS) if not summary else HIT_TEST_POINTS
+        t_dense = np.linspace(0, t_flight, dense_points)
+        dense = solution.sample(0, t_dense)
+        contact = collision.polyline_disc_contact(t_dense, dense[:, 0], dense[:, 1], rock_size,
+                                                  target.x, target.y, target.width, target.height)
+        if contact.target_hit:
+            target_hit = True
+            hit_time = float(contact.time)
+
+    return TrajectoryResult(
+        samples=samples,
+        v0x=v0 * math.cos(angle_rad),
+        v0y=v0 * math.sin(angle_rad),
+        max_height=float(solution.max_height[0]),
+        distance=float(solution.distance[0]),
+        flight_time=t_flight,
+        max_height_time=float(solution.max_height_time[0]),
+        max_height_x=float(solution.apex_x[0]),
+        target_hit=target_hit,
+        hit_time=hit_time,
+        evaluator=DragPath(solution, 0, g, k) if record else None,
+    )
+
+
+class BatchResult:
+    """Summary of many throws solved at once.
+
+    Every field is a masked array; rows that do not describe a valid throw
+    are masked out instead of raising. Fields solved from dual.Dual
+    parameters are Duals whose values are masked.
+    """
+
+    FIELDS = ("flight_time", "distance", "max_height", "max_height_time")
+
+    def __init__(self, flight_time, distance, max_height, max_height_time, valid):
+        self.valid = valid
+        invalid = ~valid
+        self.flight_time = _masked(flight_time, invalid)
+        self.distance = _masked(distance, invalid)
+        self.max_height = _masked(max_height, invalid)
+        self.max_height_time = _masked(max_height_time, invalid)
+
+    def __len__(self):
+        return self.valid.size
+
+    @property
+    def shape(self):
+        return self.valid.shape
+
+
+def _masked(field, mask):
+    if isinstance(field, dual.Dual):
+        return dual.Dual(np.ma.masked_array(field.value, mask=mask), field.grad)
+    return np.ma.masked_array(field, mask=mask)
+
+
+def _store(fields, shape, out):
+    # Reshape the result arrays, or copy them into the caller's buffers
+    if out is None:
+        return BatchResult(*(np.reshape(a, shape) for a in fields))
+    if any(isinstance(a, dual.Dual) for a in fields):
+        raise ValueError("out cannot hold the derivatives of dual parameters")
+    if len(out) != len(fields):
+        raise ValueError(f"out needs {len(fields)} arrays: {BatchResult.FIELDS + ('valid',)}")
+    for dst, src in zip(out, fields):
+        dst[...] = np.reshape(src, dst.shape)
+    return BatchResult(*out)
+
+
+def solve_batch(v0, angle_rad, h0, g, drag=None, out=None, **options):
+    """Solve the flight of every (v0, angle_rad, h0, g) row.
+
+    The inputs are broadcast against each other, so scalars and arrays can
+    be mixed freely. With a drag model the rows are integrated together by
+    drag.integrate, which receives any extra options. drag may also be the
+    drag coefficient k itself, as a number or array. out may give arrays of
+    the same size for BatchResult.FIELDS followed by valid (for example
+    views of shared memory); the results are written there and the returned
+    BatchResult views them.
+
+    Any parameter may be a dual.Dual (see dual.variables), in which case
+    the fields come back as Duals carrying their exact derivatives, with or
+    without drag.
+    """
+    if drag is not None:
+        k = getattr(drag, "coefficient", drag)
+        shape = np.broadcast(*(np.asarray(dual.value(a)) for a in (v0, angle_rad, h0, g, k))).shape
+        solution = integrate_drag(v0, angle_rad, h0, g, drag, **options)
+        return _store((solution.flight_time, solution.distance, solution.max_height,
+                       solution.max_height_time, solution.valid), shape, out)
+
+    v0, angle_rad, h0, g = np.broadcast_arrays(
+        dual.asarray(v0), dual.asarray(angle_rad), dual.asarray(h0), dual.asarray(g))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Calculate velocity components
+        v0x = v0 * np.cos(angle_rad)
+        v0y = v0 * np.sin(angle_rad)
+
+        # Time when the projectile hits the ground (same quadratic as above)
+        discriminant = v0y**2 + 2*g*h0
+        t_flight = (v0y + np.sqrt(discriminant)) / g
+
+        distance = v0x * t_flight
+
+        rising = v0y > 0
+        t_max_height = np.where(rising, v0y / g, 0.0)
+        max_height = np.where(rising, h0 + v0y**2 / (2*g), h0)
+
+        valid = (v0 > 0) & (g > 0) & (discriminant >= 0) & (t_flight > 0)
+        valid &= np.isfinite(distance) & np.isfinite(max_height)
+
+    return _store((t_flight, distance, max_height, t_max_height, valid), valid.shape, out)
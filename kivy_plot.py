@@ -0,0 +1,329 @@
+import math
+import time
+import numpy as np
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import (Color, Ellipse, InstructionGroup, Line, Mesh, PopMatrix, PushMatrix,
+                           Rectangle, Rotate, Scale, Translate)
+from kivy.graphics.scissor_instructions import ScissorPop, ScissorPush
+from kivy.metrics import dp
+from kivy.uix.widget import Widget
+from kivy.utils import get_color_from_hex
+import scenery
+
+# Room for the tick labels around the plot area (dp): left, bottom, right, top
+MARGINS = (36, 24, 8, 8)
+
+# Rough number of grid lines along each axis
+GRID_LINES = 6
+
+
+class FrameRate:
+    """Frames per second actually shown, measured over about window seconds."""
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.fps = None
+        self._start = None
+        self._frames = 0
+
+    def tick(self):
+        """Count a shown frame; returns the latest measurement (None at first)."""
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+            return self.fps
+        self._frames += 1
+        elapsed = now - self._start
+        if elapsed >= self.window:
+            self.fps = self._frames / elapsed
+            self._start = now
+            self._frames = 0
+        return self.fps
+
+
+def _grid_step(span):
+    # 1, 2 or 5 times a power of ten, giving about GRID_LINES lines
+    raw = span / GRID_LINES
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def _color(hex_color, alpha=1.0):
+    r, g, b, _ = get_color_from_hex(hex_color)
+    return Color(r, g, b, alpha)
+
+
+class NativePlot(Widget):
+    """The simulator's plot drawn with Kivy graphics instructions.
+
+    The alternative to scene.Plot, with the same interface (set_view,
+    show_throw, show_spread/hide_spread, move_rock, update and animate):
+    shapes are Rectangle, Ellipse, Line and Mesh instructions on the
+    GPU-composited canvas instead of an Agg raster uploaded as a texture.
+    Positions are in metres inside the view. The scenery is only rebuilt
+    when the view or the widget changes size, a throw or spread only
+    rebuilds its own group, and animation frames just move the rock and
+    its trail.
+    """
+
+    def __init__(self, **kwargs):
+        super(NativePlot, self).__init__(**kwargs)
+        self.widget = self
+        self.limits = (-5, 50, -1, 20)
+        self.data = None
+        self.rock_size = 0.0
+        self.target = None
+        self.spread = None
+        self.rock_at = None
+
+        self._frame = InstructionGroup()
+        self._scenery = InstructionGroup()
+        self._throw = InstructionGroup()
+        self._spread = InstructionGroup()
+        self._moving = InstructionGroup()
+        self._trail = Line(points=[], width=dp(1.5))
+        self._rock = Ellipse(pos=(0, 0), size=(0, 0))
+        for group in (self._frame, self._scenery, self._throw, self._spread, self._moving):
+            self.canvas.add(group)
+        self.canvas.add(ScissorPop())
+        self.bind(pos=self._layout, size=self._layout)
+        self._layout()
+
+    # Metres to window pixels
+    def _layout(self, *args):
+        left, bottom, right, top = (dp(margin) for margin in MARGINS)
+        x0, x1, y0, y1 = self.limits
+        self._sx = max(self.width - left - right, 1) / (x1 - x0)
+        self._sy = max(self.height - bottom - top, 1) / (y1 - y0)
+        self._ox = self.x + left - x0 * self._sx
+        self._oy = self.y + bottom - y0 * self._sy
+        self._draw_frame()
+        self._draw_scenery()
+        self._draw_throw()
+        self._draw_spread()
+        self._draw_moving()
+
+    def _px(self, x, y):
+        return self._ox + x * self._sx, self._oy + y * self._sy
+
+    def _points(self, x, y):
+        # Interleaved pixel coordinates for Line
+        points = np.empty(2 * len(x))
+        points[0::2] = self._ox + np.asarray(x) * self._sx
+        points[1::2] = self._oy + np.asarray(y) * self._sy
+        return points.tolist()
+
+    def _rectangle(self, group, x, y, width, height):
+        group.add(Rectangle(pos=self._px(x, y), size=(width * self._sx, height * self._sy)))
+
+    def _circle(self, group, x, y, radius):
+        cx, cy = self._px(x, y)
+        rx, ry = radius * self._sx, radius * self._sy
+        group.add(Ellipse(pos=(cx - rx, cy - ry), size=(2 * rx, 2 * ry)))
+
+    def _polygon(self, group, corners):
+        # Triangle fan over the corners
+        vertices = []
+        for x, y in corners:
+            vertices += [*self._px(x, y), 0, 0]
+        indices = [i for k in range(1, len(corners) - 1) for i in (0, k, k + 1)]
+        group.add(Mesh(vertices=vertices, indices=indices, mode='triangles'))
+
+    def _text(self, group, text, x, y, color=(0, 0, 0, 1), font_size=11, anchor=(0, 0)):
+        # Text at pixel position (x, y); anchor is the fraction of the text's
+        # size left of and below that point
+        label = CoreLabel(text=text, font_size=dp(font_size), color=color)
+        label.refresh()
+        texture = label.texture
+        group.add(Color(1, 1, 1, 1))
+        group.add(Rectangle(texture=texture, size=texture.size,
+                            pos=(x - anchor[0] * texture.width, y - anchor[1] * texture.height)))
+
+    def _arrow(self, group, start, end):
+        # Line from start to end in pixels, with a filled head at end
+        (x0, y0), (x1, y1) = start, end
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length == 0:
+            return
+        ux, uy = (x1 - x0) / length, (y1 - y0) / length
+        head = dp(8)
+        group.add(Line(points=[x0, y0, x1 - ux * head, y1 - uy * head], width=dp(1)))
+        base_x, base_y = x1 - ux * head, y1 - uy * head
+        group.add(Mesh(vertices=[x1, y1, 0, 0,
+                                 base_x - uy * head / 2, base_y + ux * head / 2, 0, 0,
+                                 base_x + uy * head / 2, base_y - ux * head / 2, 0, 0],
+                       indices=[0, 1, 2], mode='triangles'))
+
+    def _draw_frame(self):
+        # Plot area, grid and tick labels, then clip everything after them
+        # to the plot area
+        group = self._frame
+        group.clear()
+        x0, x1, y0, y1 = self.limits
+        left, bottom = self._px(x0, y0)
+        right, top = self._px(x1, y1)
+        group.add(Color(1, 1, 1, 1))
+        group.add(Rectangle(pos=(left, bottom), size=(right - left, top - bottom)))
+
+        for (low, high), vertical in (((x0, x1), True), ((y0, y1), False)):
+            step = _grid_step(high - low)
+            for value in np.arange(math.ceil(low / step) * step, high + step * 1e-9, step):
+                if vertical:
+                    x, _ = self._px(value, y0)
+                    group.add(Color(0, 0, 0, 0.15))
+                    group.add(Line(points=[x, bottom, x, top]))
+                    self._text(group, f"{value:g}", x, bottom - dp(2), anchor=(0.5, 1))
+                else:
+                    _, y = self._px(x0, value)
+                    group.add(Color(0, 0, 0, 0.15))
+                    group.add(Line(points=[left, y, right, y]))
+                    self._text(group, f"{value:g}", left - dp(3), y, anchor=(1, 0.5))
+
+        group.add(Color(0, 0, 0, 1))
+        group.add(Line(rectangle=(left, bottom, right - left, top - bottom)))
+        group.add(ScissorPush(x=int(left), y=int(bottom), width=int(math.ceil(right - left)),
+                              height=int(math.ceil(top - bottom))))
+
+    def _draw_scenery(self):
+        group = self._scenery
+        group.clear()
+        group.add(_color(scenery.GROUND_COLOR))
+        self._rectangle(group, *scenery.ground())
+
+        group.add(_color(scenery.GRASS_COLOR))
+        for blade in scenery.grass():
+            self._rectangle(group, *blade)
+
+        for x, height in scenery.TREES:
+            trunk, foliage = scenery.tree(x, 0, height)
+            group.add(_color(scenery.TRUNK_COLOR))
+            self._rectangle(group, *trunk)
+            group.add(_color(scenery.FOLIAGE_COLOR))
+            self._polygon(group, foliage)
+
+        # The thrower
+        head, limbs, widths = scenery.person(0, 0)
+        group.add(_color(scenery.PERSON_COLOR))
+        self._circle(group, *head)
+        for ((xa, ya), (xb, yb)), width in zip(limbs, widths):
+            group.add(Line(points=[*self._px(xa, ya), *self._px(xb, yb)], width=dp(width) / 2))
+
+    def _draw_throw(self):
+        group = self._throw
+        group.clear()
+        target = self.target
+        if target is not None:
+            group.add(_color(scenery.TARGET_COLOR, scenery.TARGET_ALPHA))
+            self._rectangle(group, target.x, target.y, target.width, target.height)
+            for color, center, radius in scenery.target_rings(target.x, target.y, target.width,
+                                                              target.height):
+                group.add(_color(color))
+                self._circle(group, *center, radius)
+
+        data = self.data
+        if data is None:
+            return
+        group.add(_color('#0000ff', 0.7))
+        group.add(Line(points=self._points(data.x, data.y), dash_length=dp(6), dash_offset=dp(3)))
+
+        group.add(_color('#95a5a6'))
+        self._circle(group, data.distance, 0, self.rock_size)
+        if data.max_height_time > 0:
+            group.add(_color('#95a5a6', 0.5))
+            self._circle(group, data.max_height_x, data.max_height, self.rock_size)
+
+            group.add(Color(0, 0, 0, 1))
+            tip = self._px(data.max_height_x, data.max_height)
+            label = self._px(data.max_height_x + 2, data.max_height + 1)
+            self._arrow(group, label, tip)
+            self._text(group, f"Max Height: {data.max_height:.2f} m", *label)
+
+        group.add(Color(0, 0, 0, 1))
+        tip = self._px(data.distance, 0.2)
+        label = self._px(data.distance - 5, 2)
+        self._arrow(group, label, tip)
+        self._text(group, f"Range: {data.distance:.2f} m", *label)
+
+    def _draw_spread(self):
+        group = self._spread
+        group.clear()
+        if self.spread is None:
+            return
+        (x, y), width, height, angle = self.spread
+        # The ellipse is rotated in metres, then scaled to pixels
+        group.add(PushMatrix())
+        group.add(Translate(*self._px(x, y)))
+        group.add(Scale(x=self._sx, y=self._sy, z=1.0))
+        group.add(Rotate(angle=angle, axis=(0, 0, 1)))
+        group.add(_color('#3498db', 0.3))
+        group.add(Ellipse(pos=(-width/2, -height/2), size=(width, height)))
+        group.add(_color('#2c3e50', 0.3))
+        group.add(Line(ellipse=(-width/2, -height/2, width, height)))
+        group.add(PopMatrix())
+
+    def _draw_moving(self):
+        group = self._moving
+        group.clear()
+        group.add(_color('#0000ff'))
+        group.add(self._trail)
+        group.add(_color('#95a5a6'))
+        group.add(self._rock)
+        self._move_moving()
+
+    def _move_moving(self):
+        if self.rock_at is None:
+            self._rock.size = (0, 0)
+            self._trail.points = []
+            return
+        x, y, time = self.rock_at
+        cx, cy = self._px(x, y)
+        rx, ry = self.rock_size * self._sx, self.rock_size * self._sy
+        self._rock.pos = (cx - rx, cy - ry)
+        self._rock.size = (2 * rx, 2 * ry)
+        data = self.data
+        if time is None or data is None or data.times is None:
+            self._trail.points = []
+            return
+        n = np.searchsorted(data.times, time, side='right')
+        self._trail.points = self._points(np.append(data.x[:n], x), np.append(data.y[:n], y))
+
+    def set_view(self, x_max, y_max):
+        """Show distances -5..x_max and heights -1..y_max."""
+        limits = (-5, x_max, -1, y_max)
+        if limits != self.limits:
+            self.limits = limits
+            self._layout()
+
+    def show_throw(self, data, rock_size, target=None):
+        """Show a computed throw and a target (or None); hides the rock."""
+        self.data = data
+        self.rock_size = rock_size
+        self.target = target
+        self.rock_at = None
+        self._draw_throw()
+        self._move_moving()
+
+    def show_spread(self, center, width, height, angle):
+        """Show the landing spread ellipse (metres, angle in degrees)."""
+        self.spread = (center, width, height, angle)
+        self._draw_spread()
+
+    def hide_spread(self):
+        self.spread = None
+        self._draw_spread()
+
+    def move_rock(self, x, y, time=None):
+        """Show the animated rock at (x, y), with its trail up to time if given."""
+        self.rock_at = (x, y, time)
+        self._move_moving()
+
+    def update(self):
+        # The canvas redraws itself when its instructions change
+        pass
+
+    def animate(self):
+        """Show an animation frame; always succeeds."""
+        return True
@@ -1,5 +1,13 @@
 import math
+import os
 import numpy as np
+import engine
+import drag
+import aiming
+import cache
+import uncertainty
+import range_table
+import kivy_plot
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -7,19 +15,25 @@ from kivy.uix.button import Button
 from kivy.uix.slider import Slider
 from kivy.uix.checkbox import CheckBox
 from kivy.uix.textinput import TextInput
-from kivy.garden.matplotlib.backend_kivyagg import FigureCanvasKivyAgg
 from kivy.uix.gridlayout import GridLayout
 from kivy.clock import Clock
 from kivy.uix.scrollview import ScrollView
 from kivy.properties import NumericProperty, BooleanProperty, StringProperty
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle, Circle, Polygon
 from kivy.config import Config
+from kivy.utils import platform
 
 # Set up configuration
 Config.set('graphics', 'width', '800')
 Config.set('graphics', 'height', '600')
 
+# Animation frames per second (at most; see animate_throw)
+ANIMATION_FPS = 30
+
+# Plot renderer: "matplotlib" (Agg rasters shown as a texture) or "kivy"
+# (native canvas instructions, the default on phones). The ROCK_RENDERER
+# environment variable picks one at startup.
+RENDERER = os.environ.get("ROCK_RENDERER", "kivy" if platform in ("android", "ios") else "matplotlib")
+
 class ProjectileSimulator(BoxLayout):
     initial_velocity = NumericProperty(20.0)
     angle = NumericProperty(45.0)
@@ -30,6 +44,13 @@ class ProjectileSimulator(BoxLayout):
     target_distance = NumericProperty(30.0)
     target_height = NumericProperty(2.0)
     target_width = NumericProperty(1.0)
+    drag_enabled = BooleanProperty(False)
+    drag_coefficient = NumericProperty(0.47)
+    air_density = NumericProperty(1.225)
+    rock_mass = NumericProperty(2.0)
+    speed_spread = NumericProperty(0.5)
+    angle_spread = NumericProperty(1.0)
+    height_spread = NumericProperty(0.05)
     status_text = StringProperty("Ready to throw! Adjust parameters and click 'Throw Rock!'")
     
     def __init__(self, **kwargs):
@@ -70,6 +91,22 @@ class ProjectileSimulator(BoxLayout):
         # Advanced settings (initially hidden)
         self.adv_section = BoxLayout(orientation='vertical', size_hint=(1, None), height=0, opacity=0)
         self.adv_section.add_widget(self.create_slider_row("Gravity (m/s²):", 1, 20, 0.1, self.gravity, self.set_gravity))
+        
+        # Air drag settings
+        drag_row = BoxLayout(orientation='horizontal', size_hint=(1, None), height=40)
+        drag_check = CheckBox(active=self.drag_enabled, size_hint=(None, 1), width=30)
+        drag_check.bind(active=self.set_drag_enabled)
+        drag_row.add_widget(drag_check)
+        drag_row.add_widget(Label(text="Air Drag", halign='left', valign='middle', text_size=(None, 40)))
+        self.adv_section.add_widget(drag_row)
+        self.adv_section.add_widget(self.create_slider_row("Drag Coefficient (Cd):", 0.1, 2, 0.01, self.drag_coefficient, self.set_drag_coefficient))
+        self.adv_section.add_widget(self.create_slider_row("Air Density (kg/m³):", 0.1, 2, 0.005, self.air_density, self.set_air_density))
+        self.adv_section.add_widget(self.create_slider_row("Rock Mass (kg):", 0.1, 20, 0.1, self.rock_mass, self.set_rock_mass))
+        
+        # Throw-to-throw spread (standard deviations) for the landing ellipse
+        self.adv_section.add_widget(self.create_slider_row("Speed Spread (m/s):", 0, 5, 0.1, self.speed_spread, self.set_speed_spread))
+        self.adv_section.add_widget(self.create_slider_row("Angle Spread (°):", 0, 10, 0.1, self.angle_spread, self.set_angle_spread))
+        self.adv_section.add_widget(self.create_slider_row("Height Spread (m):", 0, 1, 0.01, self.height_spread, self.set_height_spread))
         param_section.add_widget(self.adv_section)
         
         control_layout.add_widget(param_section)
@@ -116,10 +153,18 @@ class ProjectileSimulator(BoxLayout):
         results_section.add_widget(self.flight_time_label)
         results_section.add_widget(self.target_hit_label)
         
+        self.angles_label = Label(text="Hitting Angles: --", size_hint=(1, None), height=30, halign='left')
+        self.angles_label.bind(size=self.angles_label.setter('text_size'))
+        results_section.add_widget(self.angles_label)
+        
+        self.spread_label = Label(text="Spread: --", size_hint=(1, None), height=30, halign='left')
+        self.spread_label.bind(size=self.spread_label.setter('text_size'))
+        results_section.add_widget(self.spread_label)
+        
         control_layout.add_widget(results_section)
         
         # Buttons
-        buttons_layout = BoxLayout(orientation='vertical', size_hint=(1, None), height=100, spacing=10)
+        buttons_layout = BoxLayout(orientation='vertical', size_hint=(1, None), height=230, spacing=10)
         
         self.throw_button = Button(text="Throw Rock!", size_hint=(1, None), height=50)
         self.throw_button.bind(on_press=self.calculate)
@@ -130,6 +175,14 @@ class ProjectileSimulator(BoxLayout):
         buttons_layout.add_widget(self.throw_button)
         buttons_layout.add_widget(self.animate_button)
         
+        self.aim_button = Button(text="Find Hitting Angles", size_hint=(1, None), height=50)
+        self.aim_button.bind(on_press=self.find_hitting_angles)
+        buttons_layout.add_widget(self.aim_button)
+        
+        self.save_button = Button(text="Save Image", size_hint=(1, None), height=50)
+        self.save_button.bind(on_press=self.save_image)
+        buttons_layout.add_widget(self.save_button)
+        
         control_layout.add_widget(buttons_layout)
         
         # Status bar
@@ -147,8 +200,19 @@ class ProjectileSimulator(BoxLayout):
         
         # Animation variables
         self.animation_event = None
-        self.frame_num = 0
-        self.rock = None
+        self.animation_time = 0.0
+        self.frame_rate = None
+        
+        # Throws repeat often while scrubbing sliders back and forth
+        self.trajectory_cache = cache.TrajectoryCache()
+        # So do the hitting angles and the spread behind the slider callbacks
+        self.angles_cache = cache.Memo(aiming.hitting_angles)
+        self.spread_cache = cache.Memo(uncertainty.linearized_spread)
+        
+        # Precomputed ranges for live aiming under drag, created on first use
+        self.range_tables = None
+        
+        self.update_spread()
     
     def create_section(self, title):
         section = BoxLayout(orientation='vertical', size_hint=(1, None), spacing=5)
@@ -202,6 +266,18 @@ class ProjectileSimulator(BoxLayout):
                 property_name = "target_height"
             elif instance == getattr(self, "target_width_input", None):
                 property_name = "target_width"
+            elif instance == getattr(self, "drag_coefficient_input", None):
+                property_name = "drag_coefficient"
+            elif instance == getattr(self, "air_density_input", None):
+                property_name = "air_density"
+            elif instance == getattr(self, "rock_mass_input", None):
+                property_name = "rock_mass"
+            elif instance == getattr(self, "speed_spread_input", None):
+                property_name = "speed_spread"
+            elif instance == getattr(self, "angle_spread_input", None):
+                property_name = "angle_spread"
+            elif instance == getattr(self, "height_spread_input", None):
+                property_name = "height_spread"
                 
             if property_name:
                 setattr(self, property_name, float(value))
@@ -231,16 +307,19 @@ class ProjectileSimulator(BoxLayout):
         self.initial_velocity = value
         if hasattr(self, "throwing_speed_input"):
             self.throwing_speed_input.text = f"{value:.1f}"
+        self.update_spread()
     
     def set_angle(self, instance, value):
         self.angle = value
         if hasattr(self, "throwing_angle_input"):
             self.throwing_angle_input.text = f"{value:.1f}"
+        self.update_spread()
     
     def set_height(self, instance, value):
         self.height = value
         if hasattr(self, "throwing_height_input"):
             self.throwing_height_input.text = f"{value:.1f}"
+        self.update_spread()
     
     def set_rock_size(self, instance, value):
         self.rock_size = value
@@ -251,111 +330,114 @@ class ProjectileSimulator(BoxLayout):
         self.gravity = value
         if hasattr(self, "gravity_input"):
             self.gravity_input.text = f"{value:.1f}"
+        self.update_spread()
     
     def set_target_enabled(self, instance, value):
         self.target_enabled = value
+        self.update_hitting_angles(live=True)
+        self.update_spread()
     
     def set_target_distance(self, instance, value):
         self.target_distance = value
         if hasattr(self, "target_distance_input"):
             self.target_distance_input.text = f"{value:.1f}"
+        self.update_hitting_angles(live=True)
+        self.update_spread()
     
     def set_target_height(self, instance, value):
         self.target_height = value
         if hasattr(self, "target_height_input"):
             self.target_height_input.text = f"{value:.1f}"
+        self.update_hitting_angles(live=True)
+        self.update_spread()
     
     def set_target_width(self, instance, value):
         self.target_width = value
         if hasattr(self, "target_width_input"):
             self.target_width_input.text = f"{value:.1f}"
+        self.update_hitting_angles(live=True)
+        self.update_spread()
+    
+    def set_drag_enabled(self, instance, value):
+        self.drag_enabled = value
+        self.update_spread()
+    
+    def set_drag_coefficient(self, instance, value):
+        self.drag_coefficient = value
+        if hasattr(self, "drag_coefficient_input"):
+            self.drag_coefficient_input.text = f"{value:.2f}"
+    
+    def set_air_density(self, instance, value):
+        self.air_density = value
+        if hasattr(self, "air_density_input"):
+            self.air_density_input.text = f"{value:.3f}"
+    
+    def set_rock_mass(self, instance, value):
+        self.rock_mass = value
+        if hasattr(self, "rock_mass_input"):
+            self.rock_mass_input.text = f"{value:.1f}"
+    
+    def set_speed_spread(self, instance, value):
+        self.speed_spread = value
+        if hasattr(self, "speed_spread_input"):
+            self.speed_spread_input.text = f"{value:.1f}"
+        self.update_spread()
+    
+    def set_angle_spread(self, instance, value):
+        self.angle_spread = value
+        if hasattr(self, "angle_spread_input"):
+            self.angle_spread_input.text = f"{value:.1f}"
+        self.update_spread()
+    
+    def set_height_spread(self, instance, value):
+        self.height_spread = value
+        if hasattr(self, "height_spread_input"):
+            self.height_spread_input.text = f"{value:.2f}"
+        self.update_spread()
     
     def toggle_advanced(self, instance):
         if self.adv_section.opacity == 0:
-            self.adv_section.height = 50
+            self.adv_section.height = 40 * len(self.adv_section.children)
             self.adv_section.opacity = 1
         else:
             self.adv_section.height = 0
             self.adv_section.opacity = 0
     
     def setup_plot(self):
-        self.figure = plt.Figure(figsize=(6, 4), dpi=100)
-        self.ax = self.figure.add_subplot(111)
-        self.canvas = FigureCanvasKivyAgg(self.figure)
+        if RENDERER == "kivy":
+            self.plot = kivy_plot.NativePlot()
+        else:
+            # Imported here so that the native renderer starts without matplotlib
+            import matplotlib.pyplot as plt
+            from kivy.garden.matplotlib.backend_kivyagg import FigureCanvasKivyAgg
+            import scene
+            figure = plt.Figure(figsize=(6, 4), dpi=100)
+            self.plot = scene.Plot(figure, FigureCanvasKivyAgg(figure))
         self.plot_layout.clear_widgets()
-        self.plot_layout.add_widget(self.canvas)
-        self.initialize_scene()
-    
-    def initialize_scene(self):
-        self.ax.clear()
-        
-        self.ax.set_xlim(-5, 50)
-        self.ax.set_ylim(-1, 20)
-        
-        # Draw ground
-        ground = Rectangle((-5, -1), 60, 1, color='#7f8c8d')
-        self.ax.add_patch(ground)
-        
-        # Draw grass
-        for i in range(0, 55, 2):
-            grass_height = 0.2 + 0.1 * np.random.random()
-            grass = Rectangle((i-5, 0), 0.1, grass_height, color='#27ae60')
-            self.ax.add_patch(grass)
-        
-        # Draw trees
-        self.draw_tree(10, 0, height=5)
-        self.draw_tree(25, 0, height=6)
-        self.draw_tree(40, 0, height=4.5)
-        
-        # Draw person
-        self.draw_person(0, 0)
-        
-        self.ax.set_xlabel('Distance (m)')
-        self.ax.set_ylabel('Height (m)')
-        self.ax.set_title('Rock Trajectory')
-        self.ax.grid(True, alpha=0.3)
-        
-        self.canvas.draw()
+        self.plot_layout.add_widget(self.plot.widget)
+        self.plot.update()
     
-    def draw_person(self, x, y):
-        head = Circle((x, y+1.7), 0.3, color='#f39c12')
-        self.ax.add_patch(head)
-        
-        self.ax.plot([x, x], [y+1.4, y+0.7], color='#f39c12', linewidth=3)
-        self.ax.plot([x, x+0.5], [y+1.2, y+1.3], color='#f39c12', linewidth=2)
-        self.ax.plot([x, x-0.3], [y+0.7, y], color='#f39c12', linewidth=2)
-        self.ax.plot([x, x+0.3], [y+0.7, y], color='#f39c12', linewidth=2)
-    
-    def draw_tree(self, x, y, height=5):
-        trunk = Rectangle((x-0.5, y), 1, height*0.4, color='#795548')
-        self.ax.add_patch(trunk)
-        
-        tree_width = height * 0.6
-        tree_top = y + height
-        
-        foliage = Polygon([
-            [x-tree_width/2, y+height*0.3],
-            [x+tree_width/2, y+height*0.3],
-            [x, tree_top]
-        ], closed=True, color='#2ecc71')
-        self.ax.add_patch(foliage)
-    
-    def draw_target(self, x, y, width, height):
-        target = Rectangle((x, y), width, height, color='#e74c3c', alpha=0.8)
-        self.ax.add_patch(target)
-        
-        bullseye_x = x + width/2
-        bullseye_y = y + height/2
-        bullseye_size = min(width, height) * 0.3
-        
-        outer_ring = Circle((bullseye_x, bullseye_y), bullseye_size, color='white')
-        self.ax.add_patch(outer_ring)
-        
-        inner_ring = Circle((bullseye_x, bullseye_y), bullseye_size*0.6, color='#e74c3c')
-        self.ax.add_patch(inner_ring)
+    def save_image(self, instance):
+        # Static export always goes through matplotlib, whichever renderer
+        # is on screen
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import scene
+        figure = Figure(figsize=(6, 4), dpi=150)
+        plot = scene.Plot(figure, FigureCanvasAgg(figure))
+        if getattr(self, 'trajectory_data', None) is not None:
+            self.plot_trajectory(self.trajectory_data, self.rock_size, plot=plot)
+        else:
+            self.update_spread(plot=plot)
         
-        center = Circle((bullseye_x, bullseye_y), bullseye_size*0.2, color='white')
-        self.ax.add_patch(center)
+        path = os.path.join(App.get_running_app().user_data_dir, "rock_throw.png")
+        try:
+            plot.save(path)
+        except OSError as e:
+            self.status_text = f"Error: {str(e)}"
+        else:
+            self.status_text = f"Image saved to {path}"
+        self.status_bar.text = self.status_text
     
     def calculate(self, instance):
         try:
@@ -384,123 +466,172 @@ class ProjectileSimulator(BoxLayout):
             self.status_text = f"Error: {str(e)}"
             self.status_bar.text = self.status_text
     
-    def calculate_trajectory(self, v0, angle_rad, h0, g):
-        v0x = v0 * math.cos(angle_rad)
-        v0y = v0 * math.sin(angle_rad)
+    def get_drag_model(self):
+        if not self.drag_enabled:
+            return None
+        return drag.DragModel(self.rock_size, self.rock_mass, self.drag_coefficient, self.air_density)
+    
+    def find_hitting_angles(self, instance):
+        if not self.target_enabled:
+            self.status_text = "Enable the target first!"
+            self.status_bar.text = self.status_text
+            return
         
-        # Calculate time when projectile hits the ground
-        discriminant = v0y**2 + 2*g*h0
+        solution = self.update_hitting_angles()
+        if solution is not None and solution.hit:
+            self.status_text = (f"Low solution: {math.degrees(solution.low):.1f}° | "
+                                f"High solution: {math.degrees(solution.high):.1f}°")
+            self.status_bar.text = self.status_text
+    
+    def get_range_table(self):
+        # Tables live in the app's data directory, so they survive restarts
+        if self.range_tables is None:
+            directory = os.path.join(App.get_running_app().user_data_dir, "range_tables")
+            self.range_tables = range_table.TableCache(directory)
+        # Built in the background; None until then
+        return self.range_tables.get(self.gravity, self.get_drag_model(), self.height,
+                                     block=False, on_ready=self.range_table_ready)
+    
+    def range_table_ready(self, table):
+        # Called from the cache's worker thread; refresh on the UI thread
+        Clock.schedule_once(lambda dt: self.update_hitting_angles(live=True))
+    
+    def update_hitting_angles(self, live=False):
+        # Live updates from the target sliders only run the closed-form
+        # (drag-free) solver, which is cheap enough for every slider tick;
+        # under drag they look the angles up in a precomputed range table.
+        # The drag solver itself only runs on the Find Hitting Angles button.
+        if not hasattr(self, "angles_label") or not self.target_enabled:
+            return None
+        if live and self.drag_enabled:
+            try:
+                table = self.get_range_table()
+            except Exception as e:
+                self.status_text = f"Error: {str(e)}"
+                self.status_bar.text = self.status_text
+                return None
+            if table is None:
+                # range_table_ready refreshes the label once it is built
+                self.angles_label.text = "Hitting Angles: building table…"
+                return None
+            # The table only knows where throws land, so this is the throws
+            # that come down on the target (grown by the rock); ones that
+            # strike its front face are left to the exact solver
+            intervals = table.intervals_for(self.initial_velocity,
+                                            self.target_distance - self.rock_size,
+                                            self.target_distance + self.target_width + self.rock_size)
+            if intervals:
+                ranges = ", ".join(f"{math.degrees(lo):.1f}°–{math.degrees(hi):.1f}°" for lo, hi in intervals)
+                self.angles_label.text = f"Hitting Angles: ≈ {ranges}"
+            else:
+                self.angles_label.text = "Hitting Angles: None"
+            return None
         
-        if discriminant >= 0:
-            t_flight = (v0y + math.sqrt(discriminant)) / g
-        else:
+        try:
+            solution = self.angles_cache(self.initial_velocity, self.height, self.gravity,
+                                         self.target_distance, self.target_height,
+                                         self.target_width, drag=self.get_drag_model())
+        except Exception as e:
+            self.status_text = f"Error: {str(e)}"
+            self.status_bar.text = self.status_text
             return None
-            
-        # Calculate range
-        distance = v0x * t_flight
         
-        # Calculate maximum height time
-        t_max_height = v0y / g if v0y > 0 else 0
+        intervals = solution.interval_list()
+        if intervals:
+            ranges = ", ".join(f"{math.degrees(lo):.1f}°–{math.degrees(hi):.1f}°" for lo, hi in intervals)
+            self.angles_label.text = f"Hitting Angles: {ranges}"
+        else:
+            self.angles_label.text = "Hitting Angles: None"
+        return solution
+    
+    def update_spread(self, redraw=True, plot=None):
+        # First-order propagation of the spread is closed-form and cheap
+        # enough for every slider tick; it only covers drag-free throws
+        if not hasattr(self, "spread_label"):
+            return
+        plot = plot or self.plot
+        if self.drag_enabled:
+            plot.hide_spread()
+            self.spread_label.text = "Spread: drag-free throws only"
+            if redraw:
+                plot.update()
+            return
         
-        # Calculate maximum height
-        max_height = h0 + v0y**2 / (2*g) if v0y > 0 else h0
+        target = None
+        if self.target_enabled:
+            target = engine.Target(self.target_distance, self.target_width, self.target_height)
+        covariance = uncertainty.diagonal_covariance(self.speed_spread, math.radians(self.angle_spread),
+                                                     self.height_spread)
+        spread = self.spread_cache(self.initial_velocity, math.radians(self.angle), self.height,
+                                   self.gravity, covariance, target=target)
+        width, height, angle = spread.ellipse(2)
+        if not (np.isfinite(spread.distance) and np.isfinite(width) and np.isfinite(height)):
+            plot.hide_spread()
+            self.spread_label.text = "Spread: --"
+            if redraw:
+                plot.update()
+            return
         
-        # Create time points for trajectory
-        if t_flight > 0:
-            num_points = 200
-            t = np.linspace(0, t_flight, num_points)
-            
-            # Calculate x and y coordinates
-            x = v0x * t
-            y = h0 + v0y * t - 0.5 * g * t**2
-            
-            target_hit = False
-            hit_time = None
-            
-            if self.target_enabled:
-                target_x = self.target_distance
-                target_y = 0
-                target_height = self.target_height
-                target_width = self.target_width
-                
-                for i in range(len(t)-1):
-                    if (target_x <= x[i] <= target_x + target_width and
-                        target_y <= y[i] <= target_y + target_height):
-                        target_hit = True
-                        hit_time = t[i]
-                        break
-            
-            # Update result labels
-            self.max_height_label.text = f"Maximum Height: {max_height:.2f} m"
-            self.distance_label.text = f"Range: {distance:.2f} m"
-            self.flight_time_label.text = f"Flight Time: {t_flight:.2f} s"
-            
-            if self.target_enabled:
-                if target_hit:
-                    self.target_hit_label.text = f"Target Hit: Yes! At {hit_time:.2f} s"
-                else:
-                    self.target_hit_label.text = "Target Hit: No"
-            else:
-                self.target_hit_label.text = "Target Hit: No target set"
-            
-            return {
-                "times": t,
-                "x": x,
-                "y": y,
-                "v0x": v0x,
-                "v0y": v0y,
-                "max_height": max_height,
-                "distance": distance,
-                "flight_time": t_flight,
-                "max_height_time": t_max_height,
-                "target_hit": target_hit,
-                "hit_time": hit_time
-            }
-        else:
-            self.status_text = "Error: Invalid trajectory - Check your parameters"
+        plot.show_spread((float(spread.distance), 0), float(width), float(height), float(angle))
+        
+        text = f"Spread: ±{2 * float(spread.distance_std):.2f} m (2σ)"
+        if spread.hit_probability is not None:
+            text += f" | Hit ≈ {float(spread.hit_probability):.0%}"
+        self.spread_label.text = text
+        if redraw:
+            plot.update()
+    
+    def calculate_trajectory(self, v0, angle_rad, h0, g):
+        target = None
+        if self.target_enabled:
+            target = engine.Target(self.target_distance, self.target_width, self.target_height)
+        
+        try:
+            data = self.trajectory_cache.calculate_trajectory(v0, angle_rad, h0, g, target=target,
+                                                              rock_size=self.rock_size,
+                                                              drag=self.get_drag_model())
+        except ValueError as e:
+            self.status_text = f"Error: {str(e)}"
             self.status_bar.text = self.status_text
             return None
+        
+        # Update result labels
+        self.max_height_label.text = f"Maximum Height: {data.max_height:.2f} m"
+        self.distance_label.text = f"Range: {data.distance:.2f} m"
+        self.flight_time_label.text = f"Flight Time: {data.flight_time:.2f} s"
+        
+        if target is not None:
+            if data.target_hit:
+                self.target_hit_label.text = f"Target Hit: Yes! At {data.hit_time:.2f} s"
+            else:
+                self.target_hit_label.text = "Target Hit: No"
+        else:
+            self.target_hit_label.text = "Target Hit: No target set"
+        
+        return data
     
-    def plot_trajectory(self, data, rock_size):
+    def plot_trajectory(self, data, rock_size, plot=None):
         if data is None:
             return
         
-        self.initialize_scene()
-        
-        self.ax.plot(data["x"], data["y"], 'blue', linestyle='--', alpha=0.7, linewidth=1.5)
+        # Stop animating the previous throw on screen
+        if plot is None:
+            plot = self.plot
+            if self.animation_event is not None:
+                self.toggle_animation(None)
         
-        x_max = max(50, data["distance"] * 1.1)
-        y_max = max(20, data["max_height"] * 1.2)
-        self.ax.set_xlim(-5, x_max)
-        self.ax.set_ylim(-1, y_max)
+        x_max = max(50, data.distance * 1.1)
+        y_max = max(20, data.max_height * 1.2)
+        plot.set_view(x_max, y_max)
         
+        # Move the path, target, rocks and annotations to this throw
+        target = None
         if self.target_enabled:
-            target_x = self.target_distance
-            target_height = self.target_height
-            target_width = self.target_width
-            self.draw_target(target_x, 0, target_width, target_height)
-        
-        rock_x = data["distance"]
-        rock_y = 0
-        final_rock = Circle((rock_x, rock_y), rock_size, color='#95a5a6')
-        self.ax.add_patch(final_rock)
-        
-        if data["max_height_time"] > 0:
-            peak_x = data["v0x"] * data["max_height_time"]
-            peak_rock = Circle((peak_x, data["max_height"]), rock_size, color='#95a5a6', alpha=0.5)
-            self.ax.add_patch(peak_rock)
-            
-            self.ax.annotate(f'Max Height: {data["max_height"]:.2f} m', 
-                             xy=(peak_x, data["max_height"]), 
-                             xytext=(peak_x+2, data["max_height"]+1),
-                             arrowprops=dict(facecolor='black', shrink=0.05, width=1.5, headwidth=8))
+            target = engine.Target(self.target_distance, self.target_width, self.target_height)
+        plot.show_throw(data, rock_size, target)
         
-        self.ax.annotate(f'Range: {data["distance"]:.2f} m', 
-                         xy=(data["distance"], 0.2), 
-                         xytext=(data["distance"]-5, 2),
-                         arrowprops=dict(facecolor='black', shrink=0.05, width=1.5, headwidth=8))
-        
-        self.canvas.draw()
+        self.update_spread(redraw=False, plot=plot)
+        plot.update()
     
     def toggle_animation(self, instance):
         if self.animation_event is None:
@@ -519,38 +650,53 @@ class ProjectileSimulator(BoxLayout):
             return
         
         # Reset animation
-        self.frame_num = 0
-        if self.rock is None:
-            rock_size = self.rock_size
-            self.rock = Circle((0, self.height), rock_size, color='#95a5a6')
-            self.ax.add_patch(self.rock)
+        data = self.trajectory_data
+        self.animation_time = 0.0
+        self.frame_rate = kivy_plot.FrameRate()
+        self.plot.move_rock(0, self.height, time=0.0)
+        
+        # Bring the plot up to date once; frames then only redraw the rock
+        # and its trail (blitted over a snapshot with matplotlib)
+        self.plot.update()
+        shown_frame = None
+        shown_time = 0.0
         
         # Animation update function
         def update_animation(dt):
-            if self.frame_num < len(self.trajectory_data["times"]):
-                x = self.trajectory_data["x"][self.frame_num]
-                y = self.trajectory_data["y"][self.frame_num]
-                self.rock.center = (x, y)
-                
-                time = self.trajectory_data["times"][self.frame_num]
-                self.status_text = f"Time: {time:.2f}s | Position: ({x:.2f}m, {y:.2f}m)"
+            nonlocal shown_frame, shown_time
+            # Follow the clock rather than counting ticks, so skipped and
+            # late frames do not slow the throw down
+            if shown_time >= data.flight_time:
+                # Start over once the landing has been shown
+                self.animation_time = shown_time = 0.0
+            self.animation_time = min(self.animation_time + dt, data.flight_time)
+            
+            # Skip ticks that come before the last frame reached the screen
+            if shown_frame == Clock.frames_displayed:
+                return
+            
+            time = self.animation_time
+            x, y = data.position(time)
+            self.plot.move_rock(x, y, time=time)
+            if not self.plot.animate():
+                return
+            fps = self.frame_rate.tick()
+            
+            self.status_text = f"Time: {time:.2f}s | Position: ({x:.2f}m, {y:.2f}m)"
+            if fps is not None:
+                self.status_text += f" | {fps:.0f} fps"
+            self.status_bar.text = self.status_text
+            
+            if (self.target_enabled and data.target_hit and 
+                data.hit_time <= time and data.hit_time >= shown_time):
+                self.status_text = "TARGET HIT! 🎯"
                 self.status_bar.text = self.status_text
-                
-                if (self.target_enabled and self.trajectory_data["target_hit"] and 
-                    self.trajectory_data["hit_time"] <= time and 
-                    self.trajectory_data["hit_time"] >= self.trajectory_data["times"][max(0, self.frame_num-1)]):
-                    self.status_text = "TARGET HIT! 🎯"
-                    self.status_bar.text = self.status_text
-                
-                self.frame_num += 1
-                self.canvas.draw()
-            else:
-                # Reset animation to start
-                self.frame_num = 0
+            
+            shown_frame = Clock.frames_displayed
+            shown_time = time
         
         # Schedule the animation
-        interval = self.trajectory_data["flight_time"] / len(self.trajectory_data["times"])
-        self.animation_event = Clock.schedule_interval(update_animation, interval)
+        self.animation_event = Clock.schedule_interval(update_animation, 1.0 / ANIMATION_FPS)
 
 class ProjectileMotionApp(App):
     def build(self):
@@ -558,3 +704,4 @@ class ProjectileMotionApp(App):
         return ProjectileSimulator()
 
 if __name__ == '__main__':
+    ProjectileMotionApp().run()
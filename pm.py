@@ -1,6 +1,6 @@
 import tkinter as tk
 import math
-import numpy as np
+import engine
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
@@ -87,6 +87,15 @@ class ProjectileMotionSimulator:
         self.ax.set_title('Projectile Motion Trajectory')
         self.ax.grid(True)
         
+        # Artists are created once here and updated in place by plot_trajectory
+        self.path, = self.ax.plot([], [], 'b-', linewidth=2)
+        self.start_point = self.ax.scatter([0], [0], color='green', s=50, label='Start')
+        self.landing_point = self.ax.scatter([0], [0], color='red', s=50, label='Landing')
+        self.peak_point = self.ax.scatter([0], [0], color='orange', s=50, label='Max Height')
+        self.message = self.ax.text(0.5, 0.5, 'Invalid trajectory - Check your parameters', 
+                                    horizontalalignment='center', verticalalignment='center',
+                                    transform=self.ax.transAxes)
+        
         # Initialize an empty plot
         self.plot_trajectory(20, math.radians(45), 0, 9.8)
         
@@ -113,75 +122,52 @@ class ProjectileMotionSimulator:
             tk.messagebox.showerror("Error", f"An error occurred: {str(e)}")
     
     def plot_trajectory(self, v0, angle_rad, h0, g):
-        # Clear previous plot
-        self.ax.clear()
-        
-        # Calculate velocity components
-        v0x = v0 * math.cos(angle_rad)
-        v0y = v0 * math.sin(angle_rad)
-        
-        # Calculate flight time
-        # For the case where the projectile returns to the same height
-        # Using the quadratic formula: h0 + v0y*t - 0.5*g*t^2 = 0
-        if v0y**2 + 2*g*h0 >= 0:  # Check if projectile will reach the ground
-            t_flight = (v0y + math.sqrt(v0y**2 + 2*g*h0)) / g
-        else:
-            # If it won't reach the ground (e.g., thrown downward with insufficient velocity)
-            t_flight = 0
-            
-        # Calculate range
-        distance = v0x * t_flight
-        
-        # Calculate maximum height time
-        t_max_height = v0y / g if v0y > 0 else 0
-        
-        # Calculate maximum height
-        max_height = h0 + v0y**2 / (2*g) if v0y > 0 else h0
-        
-        # Update result labels
-        self.result_labels["max_height"].set(f"Maximum Height: {max_height:.2f} m")
-        self.result_labels["distance"].set(f"Range: {distance:.2f} m")
-        self.result_labels["flight_time"].set(f"Flight Time: {t_flight:.2f} s")
-        
-        # Create time points for plotting
-        if t_flight > 0:
-            # Create more points for a smoother curve
-            num_points = 200
-            t = np.linspace(0, t_flight, num_points)
-            
-            # Calculate x and y coordinates
-            x = v0x * t
-            y = h0 + v0y * t - 0.5 * g * t**2
-            
-            # Plot trajectory
-            self.ax.plot(x, y, 'b-', linewidth=2)
+        try:
+            data = engine.calculate_trajectory(v0, angle_rad, h0, g)
+        except ValueError:
+            data = None
+        
+        if data is not None:
+            # Update result labels
+            self.result_labels["max_height"].set(f"Maximum Height: {data.max_height:.2f} m")
+            self.result_labels["distance"].set(f"Range: {data.distance:.2f} m")
+            self.result_labels["flight_time"].set(f"Flight Time: {data.flight_time:.2f} s")
             
-            # Plot start and end points
-            self.ax.scatter([0], [h0], color='green', s=50, label='Start')
-            self.ax.scatter([distance], [0], color='red', s=50, label='Landing')
+            # Move the trajectory and its start and end points
+            self.path.set_data(data.x, data.y)
+            self.start_point.set_offsets([[0, h0]])
+            self.landing_point.set_offsets([[data.distance, 0]])
             
-            # Plot maximum height point
-            if t_max_height > 0 and t_max_height < t_flight:
-                max_height_x = v0x * t_max_height
-                self.ax.scatter([max_height_x], [max_height], color='orange', s=50, label='Max Height')
+            # Maximum height point
+            peaked = data.max_height_time > 0 and data.max_height_time < data.flight_time
+            if peaked:
+                max_height_x = data.v0x * data.max_height_time
+                self.peak_point.set_offsets([[max_height_x, data.max_height]])
             
             # Set plot limits with proper margins
-            x_margin = max(distance * 0.1, 1)
-            y_margin = max(max_height * 0.1, 1)
+            x_margin = max(data.distance * 0.1, 1)
+            y_margin = max(data.max_height * 0.1, 1)
             
-            self.ax.set_xlim(-x_margin, distance + x_margin)
-            self.ax.set_ylim(-y_margin, max_height + y_margin)
+            self.ax.set_xlim(-x_margin, data.distance + x_margin)
+            self.ax.set_ylim(-y_margin, data.max_height + y_margin)
         else:
-            self.ax.text(0.5, 0.5, 'Invalid trajectory - Check your parameters', 
-                         horizontalalignment='center', verticalalignment='center',
-                         transform=self.ax.transAxes)
-        
-        # Set plot labels and grid
-        self.ax.set_xlabel('Horizontal Distance (m)')
-        self.ax.set_ylabel('Height (m)')
-        self.ax.set_title('Projectile Motion Trajectory')
-        self.ax.grid(True)
-        self.ax.legend()
+            self.result_labels["max_height"].set("Maximum Height: --")
+            self.result_labels["distance"].set("Range: --")
+            self.result_labels["flight_time"].set("Flight Time: --")
+            peaked = False
+        
+        for artist in (self.path, self.start_point, self.landing_point):
+            artist.set_visible(data is not None)
+        self.peak_point.set_visible(peaked)
+        self.message.set_visible(data is None)
+        
+        # The legend lists the points shown
+        points = [point for point in (self.start_point, self.landing_point, self.peak_point)
+                  if point.get_visible()]
+        if points:
+            self.ax.legend(handles=points)
+        elif self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
         
         # Update canvas
         self.canvas.draw()
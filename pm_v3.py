@@ -1,9 +1,9 @@
 import tkinter as tk
 import math
-import numpy as np
+import engine
+import scene
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.patches import Rectangle, Circle, Polygon
 import matplotlib.image as mpimg
 from matplotlib.animation import FuncAnimation
 
@@ -196,6 +196,7 @@ t = time
         self.ax = self.figure.add_subplot(111, facecolor="#1e272e")
         self.canvas = FigureCanvasTkAgg(self.figure, plot_frame)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.scene = scene.BlittedScene(self.canvas, self.ax)
         
         # Configure plot
         self.ax.set_xlabel('Distance (m)', color="#ecf0f1")
@@ -243,6 +244,10 @@ t = time
             self.animate_button.config(text="Animate Throw")
     
     def initialize_scene(self):
+        # The scenery is drawn once into the cached background; throws only
+        # move the dynamic artists on top (see plot_trajectory)
+        self.scene.clear()
+        
         # Clear the plot
         self.ax.clear()
         
@@ -250,23 +255,8 @@ t = time
         self.ax.set_xlim(-5, 50)
         self.ax.set_ylim(-1, 20)
         
-        # Draw ground
-        ground = Rectangle((-5, -1), 60, 1, color='#7f8c8d')
-        self.ax.add_patch(ground)
-        
-        # Draw grass
-        for i in range(0, 55, 2):
-            grass_height = 0.2 + 0.1 * np.random.random()
-            grass = Rectangle((i-5, 0), 0.1, grass_height, color='#27ae60')
-            self.ax.add_patch(grass)
-        
-        # Draw trees (at random positions)
-        self.draw_tree(10, 0, height=5)
-        self.draw_tree(25, 0, height=6)
-        self.draw_tree(40, 0, height=4.5)
-        
-        # Draw person
-        self.draw_person(0, 0)
+        # Ground, grass, trees and the thrower, in two collections
+        scene.add_scenery(self.ax)
         
         # Configure plot
         self.ax.set_xlabel('Distance (m)', color="#ecf0f1")
@@ -277,63 +267,14 @@ t = time
             spine.set_color('#7f8c8d')
         self.ax.grid(True, alpha=0.3)
         
+        # The throw's artists, created once and updated in place
+        self.throw = scene.ThrowArtists(self.scene, path_color='white', text_color='white',
+                                        arrow_color='#e74c3c')
+        self.rock = self.throw.rock
+        
         # Update canvas
         self.canvas.draw()
     
-    def draw_person(self, x, y):
-        # Draw stick figure
-        # Head
-        head = Circle((x, y+1.7), 0.3, color='#f39c12')
-        self.ax.add_patch(head)
-        
-        # Body
-        self.ax.plot([x, x], [y+1.4, y+0.7], color='#f39c12', linewidth=3)
-        
-        # Arms
-        self.ax.plot([x, x+0.5], [y+1.2, y+1.3], color='#f39c12', linewidth=2)  # Right arm raised
-        
-        # Legs
-        self.ax.plot([x, x-0.3], [y+0.7, y], color='#f39c12', linewidth=2)  # Left leg
-        self.ax.plot([x, x+0.3], [y+0.7, y], color='#f39c12', linewidth=2)  # Right leg
-    
-    def draw_tree(self, x, y, height=5):
-        # Draw trunk
-        trunk = Rectangle((x-0.5, y), 1, height*0.4, color='#795548')
-        self.ax.add_patch(trunk)
-        
-        # Draw foliage (triangle)
-        tree_width = height * 0.6
-        tree_top = y + height
-        
-        foliage = Polygon([
-            [x-tree_width/2, y+height*0.3],  # Left bottom
-            [x+tree_width/2, y+height*0.3],  # Right bottom
-            [x, tree_top]                     # Top
-        ], closed=True, color='#2ecc71')
-        self.ax.add_patch(foliage)
-    
-    def draw_target(self, x, y, width, height):
-        # Draw target
-        target = Rectangle((x, y), width, height, color='#e74c3c', alpha=0.8)
-        self.ax.add_patch(target)
-        
-        # Draw bullseye
-        bullseye_x = x + width/2
-        bullseye_y = y + height/2
-        bullseye_size = min(width, height) * 0.3
-        
-        # Outer ring
-        outer_ring = Circle((bullseye_x, bullseye_y), bullseye_size, color='white')
-        self.ax.add_patch(outer_ring)
-        
-        # Inner ring
-        inner_ring = Circle((bullseye_x, bullseye_y), bullseye_size*0.6, color='#e74c3c')
-        self.ax.add_patch(inner_ring)
-        
-        # Center
-        center = Circle((bullseye_x, bullseye_y), bullseye_size*0.2, color='white')
-        self.ax.add_patch(center)
-    
     def calculate(self):
         try:
             # Get values from inputs
@@ -367,151 +308,49 @@ t = time
             self.status_var.set(f"Error: {str(e)}")
     
     def calculate_trajectory(self, v0, angle_rad, h0, g):
-        # Calculate velocity components
-        v0x = v0 * math.cos(angle_rad)
-        v0y = v0 * math.sin(angle_rad)
-        
-        # Calculate time when projectile hits the ground
-        # Using quadratic formula: h0 + v0y*t - 0.5*g*t^2 = 0
-        # at^2 + bt + c = 0, where a = -0.5*g, b = v0y, c = h0
-        discriminant = v0y**2 + 2*g*h0
-        
-        if discriminant >= 0:
-            t_flight = (v0y + math.sqrt(discriminant)) / g
-        else:
-            # If it won't reach the ground (this shouldn't happen in normal cases)
-            t_flight = 0
-            
-        # Calculate range
-        distance = v0x * t_flight
+        # Describe the target for the engine
+        target = None
+        if self.target_enabled.get():
+            target = engine.Target(self.target_distance.get(), self.target_width.get(),
+                                   self.target_height.get())
         
-        # Calculate maximum height time
-        t_max_height = v0y / g if v0y > 0 else 0
+        data = engine.calculate_trajectory(v0, angle_rad, h0, g, target=target,
+                                           rock_size=self.rock_size.get())
         
-        # Calculate maximum height
-        max_height = h0 + v0y**2 / (2*g) if v0y > 0 else h0
+        # Update result labels
+        self.result_labels["max_height"].set(f"Maximum Height: {data.max_height:.2f} m")
+        self.result_labels["distance"].set(f"Range: {data.distance:.2f} m")
+        self.result_labels["flight_time"].set(f"Flight Time: {data.flight_time:.2f} s")
         
-        # Create time points for trajectory
-        if t_flight > 0:
-            num_points = 200
-            t = np.linspace(0, t_flight, num_points)
-            
-            # Calculate x and y coordinates
-            x = v0x * t
-            y = h0 + v0y * t - 0.5 * g * t**2
-            
-            # Check if target is hit
-            target_hit = False
-            hit_time = None
-            
-            if self.target_enabled.get():
-                target_x = self.target_distance.get()
-                target_y = 0
-                target_height = self.target_height.get()
-                target_width = self.target_width.get()
-                
-                # Check if any point of trajectory is within target
-                for i in range(len(t)-1):
-                    if (target_x <= x[i] <= target_x + target_width and
-                        target_y <= y[i] <= target_y + target_height):
-                        target_hit = True
-                        hit_time = t[i]
-                        break
-            
-            # Update result labels
-            self.result_labels["max_height"].set(f"Maximum Height: {max_height:.2f} m")
-            self.result_labels["distance"].set(f"Range: {distance:.2f} m")
-            self.result_labels["flight_time"].set(f"Flight Time: {t_flight:.2f} s")
-            
-            if self.target_enabled.get():
-                if target_hit:
-                    self.result_labels["target_hit"].set(f"Target Hit: Yes! At {hit_time:.2f} s")
-                else:
-                    self.result_labels["target_hit"].set("Target Hit: No")
+        if target is not None:
+            if data.target_hit:
+                self.result_labels["target_hit"].set(f"Target Hit: Yes! At {data.hit_time:.2f} s")
             else:
-                self.result_labels["target_hit"].set("Target Hit: No target set")
-            
-            # Return trajectory data
-            return {
-                "times": t,
-                "x": x,
-                "y": y,
-                "v0x": v0x,
-                "v0y": v0y,
-                "max_height": max_height,
-                "distance": distance,
-                "flight_time": t_flight,
-                "max_height_time": t_max_height,
-                "target_hit": target_hit,
-                "hit_time": hit_time
-            }
+                self.result_labels["target_hit"].set("Target Hit: No")
         else:
-            self.status_var.set("Error: Invalid trajectory - Check your parameters")
-            return None
+            self.result_labels["target_hit"].set("Target Hit: No target set")
+        
+        return data
     
     def plot_trajectory(self, data, rock_size):
         if data is None:
             return
         
-        # Reinitialize the scene
-        self.initialize_scene()
-        
-        # Plot trajectory path
-        self.ax.plot(data["x"], data["y"], 'white', linestyle='--', alpha=0.7, linewidth=1.5)
-        
         # Get plot limits
-        x_max = max(50, data["distance"] * 1.1)
-        y_max = max(20, data["max_height"] * 1.2)
+        x_max = max(50, data.distance * 1.1)
+        y_max = max(20, data.max_height * 1.2)
         self.ax.set_xlim(-5, x_max)
         self.ax.set_ylim(-1, y_max)
         
-        # Draw the target if enabled
+        # Move the path, target, rocks and annotations to this throw
+        target = None
         if self.target_enabled.get():
-            target_x = self.target_distance.get()
-            target_height = self.target_height.get()
-            target_width = self.target_width.get()
-            self.draw_target(target_x, 0, target_width, target_height)
-        
-        # Draw rock at final position
-        rock_x = data["distance"]
-        rock_y = 0
-        final_rock = Circle((rock_x, rock_y), rock_size, color='#95a5a6')
-        self.ax.add_patch(final_rock)
-        
-        # Draw rock at peak position
-        if data["max_height_time"] > 0:
-            peak_x = data["v0x"] * data["max_height_time"]
-            peak_rock = Circle((peak_x, data["max_height"]), rock_size, color='#95a5a6', alpha=0.5)
-            self.ax.add_patch(peak_rock)
-        
-        # Draw annotations
-        # Maximum height
-        if data["max_height_time"] > 0:
-            peak_x = data["v0x"] * data["max_height_time"]
-            self.ax.annotate(f'Max Height: {data["max_height"]:.2f} m', 
-                             xy=(peak_x, data["max_height"]), 
-                             xytext=(peak_x+2, data["max_height"]+1),
-                             arrowprops=dict(facecolor='white', shrink=0.05, width=1.5, headwidth=8),
-                             color='white')
-        
-        # Range
-        self.ax.annotate(f'Range: {data["distance"]:.2f} m', 
-                         xy=(data["distance"], 0.2), 
-                         xytext=(data["distance"]-5, 2),
-                         arrowprops=dict(facecolor='white', shrink=0.05, width=1.5, headwidth=8),
-                         color='white')
-        
-        # Initial velocity vector
-        arrow_length = data["v0x"] * 0.5
-        arrow_height = data["v0y"] * 0.5
-        self.ax.arrow(0, data["y"][0], arrow_length, arrow_height, 
-                     head_width=0.5, head_length=1, fc='#e74c3c', ec='#e74c3c', linewidth=2)
-        
-        self.ax.text(arrow_length/2, data["y"][0] + arrow_height/2 + 0.5, 
-                    f'{self.initial_velocity.get():.1f} m/s', color='#e74c3c')
+            target = engine.Target(self.target_distance.get(), self.target_width.get(),
+                                   self.target_height.get())
+        self.throw.show(data, rock_size, target)
         
-        # Update canvas
-        self.canvas.draw()
+        # Blit the throw over the cached scenery
+        self.scene.update()
     
     def animate_throw(self):
         if not hasattr(self, 'trajectory_data') or self.trajectory_data is None:
@@ -526,37 +365,35 @@ t = time
         # Re-draw the scene to prevent flickering
         self.plot_trajectory(self.trajectory_data, self.rock_size.get())
             
-        # Create rock object if it doesn't exist
-        rock_size = self.rock_size.get()
-        self.rock = Circle((0, self.height.get()), rock_size, color='#95a5a6')
-        self.ax.add_patch(self.rock)
+        # Start the rock at the thrower
+        self.throw.move_rock(0, self.height.get())
         
-        # Create a list to keep track of artists that need updating
-        self.animated_artists = [self.rock]
+        # Every dynamic artist is redrawn over the background each frame
+        self.animated_artists = self.scene.artists
         
         # Animation function
         def update(frame_num):
             # Get the position at this frame
-            if frame_num < len(self.trajectory_data["times"]):
-                x = self.trajectory_data["x"][frame_num]
-                y = self.trajectory_data["y"][frame_num]
-                self.rock.center = (x, y)
+            if frame_num < len(self.trajectory_data.times):
+                x = self.trajectory_data.x[frame_num]
+                y = self.trajectory_data.y[frame_num]
+                self.throw.move_rock(x, y)
                 
                 # Update status bar with current time and position
-                time = self.trajectory_data["times"][frame_num]
+                time = self.trajectory_data.times[frame_num]
                 self.status_var.set(f"Time: {time:.2f}s | Position: ({x:.2f}m, {y:.2f}m)")
                 
                 # Handle target hit
-                if (self.target_enabled.get() and self.trajectory_data["target_hit"] and 
-                    self.trajectory_data["hit_time"] <= time and 
-                    self.trajectory_data["hit_time"] >= self.trajectory_data["times"][max(0, frame_num-1)]):
+                if (self.target_enabled.get() and self.trajectory_data.target_hit and 
+                    self.trajectory_data.hit_time <= time and 
+                    self.trajectory_data.hit_time >= self.trajectory_data.times[max(0, frame_num-1)]):
                     self.status_var.set("TARGET HIT! 🎯")
             
             return self.animated_artists
         
         # Create animation with blitting to prevent flickering
-        frames = len(self.trajectory_data["times"])
-        interval = max(10, self.trajectory_data["flight_time"]*1000/frames)  # Ensure minimum interval
+        frames = len(self.trajectory_data.times)
+        interval = max(10, self.trajectory_data.flight_time*1000/frames)  # Ensure minimum interval
         
         self.anim = FuncAnimation(
             self.figure, update, frames=frames, 
@@ -0,0 +1,238 @@
+import numpy as np
+
+# Bits of resolution of the Sobol points, which also caps their number
+SOBOL_BITS = 32
+
+# Primitive polynomial degree s, coefficients a and initial direction
+# numbers m for Sobol dimensions 2, 3, ... (Joe and Kuo, new-joe-kuo-6.21201).
+# Dimension 1 is the van der Corput sequence.
+_JOE_KUO = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+)
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73)
+
+# Acklam's rational approximation to the inverse normal CDF
+_ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+             1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+             6.680131188771972e+01, -1.328068155288572e+01)
+_ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+             -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+             3.754408661907416e+00)
+_ACKLAM_LOW = 0.02425
+
+
+def _polyval(coeffs, x):
+    result = np.zeros_like(x)
+    for c in coeffs:
+        result = result * x + c
+    return result
+
+
+def norm_ppf(u):
+    """Inverse standard normal CDF, vectorized (relative error below 1.2e-9)."""
+    u = np.asarray(u, dtype=float)
+    out = np.empty_like(u)
+    low = u < _ACKLAM_LOW
+    high = u > 1 - _ACKLAM_LOW
+    middle = ~(low | high)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = u[middle] - 0.5
+        r = q*q
+        out[middle] = (_polyval(_ACKLAM_A, r) * q) / (_polyval(_ACKLAM_B, r) * r + 1)
+        q = np.sqrt(-2 * np.log(u[low]))
+        out[low] = _polyval(_ACKLAM_C, q) / (_polyval(_ACKLAM_D, q) * q + 1)
+        q = np.sqrt(-2 * np.log1p(-u[high]))
+        out[high] = -_polyval(_ACKLAM_C, q) / (_polyval(_ACKLAM_D, q) * q + 1)
+    return out
+
+
+def norm_cdf(x):
+    """Standard normal CDF, vectorized (relative error below 1.2e-7).
+
+    Uses the Chebyshev fit to erfc from Numerical Recipes.
+    """
+    z = np.abs(np.asarray(x, dtype=float)) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = _polyval((0.17087277, -0.82215223, 1.48851587, -1.13520398, 0.27886807,
+                     -0.18628806, 0.09678418, 0.37409196, 1.00002368, -1.26551223), t)
+    tail = 0.5 * t * np.exp(-z*z + poly)
+    return np.where(np.asarray(x) >= 0, 1.0 - tail, tail)
+
+
+def _direction_numbers(dimension):
+    # Column j of dimension d's generating matrix as a SOBOL_BITS-bit integer
+    bits = SOBOL_BITS
+    v = np.zeros((dimension, bits), dtype=np.uint64)
+    v[0] = [1 << (bits - 1 - j) for j in range(bits)]
+    for d in range(1, dimension):
+        s, a, m = _JOE_KUO[d - 1]
+        m = list(m)
+        for j in range(s, bits):
+            # m_j = 2a_1 m_{j-1} ^ ... ^ 2^{s-1} a_{s-1} m_{j-s+1} ^ 2^s m_{j-s} ^ m_{j-s}
+            value = m[j - s] ^ (m[j - s] << s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    value ^= m[j - k] << k
+            m.append(value)
+        v[d] = [m[j] << (bits - 1 - j) for j in range(bits)]
+    return v
+
+
+def _scramble_matrices(v, rng):
+    # Left-multiply every generating matrix by a random unit lower
+    # triangular binary matrix (linear matrix scrambling). Row i of the
+    # result is the parity of (L_i & column) over the column bits.
+    dimension, bits = v.shape
+    out = np.zeros_like(v)
+    for d in range(dimension):
+        columns = v[d]
+        for i in range(bits):
+            # Random bits above row i (more significant), and row i itself
+            above = int(rng.integers(0, 1 << i)) if i else 0
+            row = ((above << 1) | 1) << (bits - 1 - i)
+            masked = columns & np.uint64(row)
+            parity = np.zeros(bits, dtype=np.uint64)
+            while masked.any():
+                parity ^= masked & np.uint64(1)
+                masked >>= np.uint64(1)
+            out[d] |= parity << np.uint64(bits - 1 - i)
+    return out
+
+
+class Sobol:
+    """Sobol low-discrepancy points in [0, 1)^dimension.
+
+    With scramble=True (the default) the points get a random linear matrix
+    scramble and digital shift, which keeps their net structure, avoids the
+    corner point 0 and makes independent replicates possible. Points are
+    addressed by index, so any range can be generated without the ones
+    before it (see points).
+    """
+
+    MAX_DIMENSION = len(_JOE_KUO) + 1
+
+    def __init__(self, dimension, scramble=True, seed=None):
+        if not 1 <= dimension <= self.MAX_DIMENSION:
+            raise ValueError(f"Sobol dimension must be between 1 and {self.MAX_DIMENSION}")
+        self.dimension = dimension
+        self.scramble = scramble
+        self.directions = _direction_numbers(dimension)
+        self.shift = np.zeros(dimension, dtype=np.uint64)
+        if scramble:
+            rng = np.random.default_rng(seed)
+            self.directions = _scramble_matrices(self.directions, rng)
+            self.shift = rng.integers(0, 1 << SOBOL_BITS, size=dimension,
+                                      dtype=np.uint64)
+        self.index = 0
+
+    def points(self, start, stop):
+        """Points start..stop-1 of the sequence, shape (stop - start, dimension)."""
+        if stop > 1 << SOBOL_BITS:
+            raise ValueError(f"Sobol sequences are limited to 2**{SOBOL_BITS} points")
+        n = np.arange(start, stop, dtype=np.uint64)
+        gray = n ^ (n >> np.uint64(1))
+        x = np.broadcast_to(self.shift, (len(n), self.dimension)).copy()
+        # Point n is the XOR of the direction numbers picked by the bits of
+        # its Gray code; indices below 2**b only have b bits to look at
+        for j in range(max(int(stop - 1).bit_length(), 1)):
+            bit = (gray >> np.uint64(j)) & np.uint64(1)
+            x ^= bit[:, None] * self.directions[:, j]
+        # Centre each point in its cell so that no coordinate is exactly 0
+        return (x.astype(float) + 0.5) / float(1 << SOBOL_BITS)
+
+    def random(self, n):
+        """The next n points."""
+        out = self.points(self.index, self.index + n)
+        self.index += n
+        return out
+
+    def reset(self):
+        self.index = 0
+
+
+class Halton:
+    """Halton points in [0, 1)^dimension, one prime base per dimension.
+
+    With scramble=True every digit of every base goes through its own
+    random permutation, which breaks up the correlation between the higher
+    dimensions. Points are addressed by index like Sobol.
+    """
+
+    MAX_DIMENSION = len(_PRIMES)
+
+    def __init__(self, dimension, scramble=True, seed=None, digits=None):
+        if not 1 <= dimension <= self.MAX_DIMENSION:
+            raise ValueError(f"Halton dimension must be between 1 and {self.MAX_DIMENSION}")
+        self.dimension = dimension
+        self.scramble = scramble
+        self.bases = _PRIMES[:dimension]
+        # Enough digits to resolve double precision in every base
+        self.digits = [digits or int(np.ceil(53 * np.log(2) / np.log(b))) for b in self.bases]
+        self.permutations = None
+        if scramble:
+            rng = np.random.default_rng(seed)
+            self.permutations = [
+                np.array([rng.permutation(b) for _ in range(k)]) for b, k in zip(self.bases, self.digits)]
+        self.index = 0
+
+    def points(self, start, stop):
+        """Points start..stop-1 of the sequence, shape (stop - start, dimension)."""
+        n = np.arange(start, stop, dtype=np.int64)
+        out = np.zeros((len(n), self.dimension))
+        for d, (base, digits) in enumerate(zip(self.bases, self.digits)):
+            remaining = n.copy()
+            scale = 1.0 / base
+            value = np.zeros(len(n))
+            for k in range(digits):
+                digit = remaining % base
+                if self.permutations is not None:
+                    digit = self.permutations[d][k][digit]
+                value += digit * scale
+                remaining //= base
+                scale /= base
+            # Keep the truncated expansion inside (0, 1), like Sobol's
+            out[:, d] = np.clip(value, 0.5 * scale, 1 - 0.5 * scale)
+        return out
+
+    def random(self, n):
+        """The next n points."""
+        out = self.points(self.index, self.index + n)
+        self.index += n
+        return out
+
+    def reset(self):
+        self.index = 0
+
+
+SAMPLERS = {"sobol": Sobol, "halton": Halton}
+
+
+def sampler(method, dimension, scramble=True, seed=None):
+    """A Sobol or Halton generator by name."""
+    try:
+        cls = SAMPLERS[method]
+    except KeyError:
+        raise ValueError(f"Unknown sampling method: {method!r}") from None
+    return cls(dimension, scramble=scramble, seed=seed)
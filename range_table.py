@@ -0,0 +1,325 @@
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import engine
+
+# Grid of the table: speeds (m/s) and launch angles (radians), end points
+# included. 0.5 m/s by 0.25 degree steps over the app's slider ranges; the
+# angles start one step above 0, since a flat throw from ground level never
+# leaves the ground and is not a valid throw.
+DEFAULT_V0_RANGE = (1.0, 50.0)
+DEFAULT_V0_POINTS = 99
+DEFAULT_ANGLE_RANGE = (np.pi / 720, np.pi / 2)
+DEFAULT_ANGLE_POINTS = 360
+
+# Tables kept in memory by TableCache
+DEFAULT_CACHE_SIZE = 4
+
+# Table files kept on disk by TableCache (about 570 KB each); the least
+# recently used ones beyond this are deleted
+DEFAULT_DISK_SIZE = 32
+
+# TableCache rounds every configuration before it picks a table, so nearby
+# slider positions share one: gravity to 0.1 m/s², launch height to 0.25 m
+# and the drag coefficient to two significant figures
+GRAVITY_STEP = 0.1
+HEIGHT_STEP = 0.25
+DRAG_DIGITS = 2
+
+# Bumped whenever the file layout or the way tables are solved changes
+FORMAT_VERSION = 2
+
+
+class RangeTable:
+    """Range and apex height of every throw on a (v0, angle) grid.
+
+    Built once for a gravity, drag coefficient k and launch height h0 (see
+    build) and saved as an .npz file. Forward lookups interpolate
+    bilinearly; inverse lookups (angles_for) binary-search the runs of
+    angles along which the range only rises or only falls, which are split
+    up when the table is built.
+    """
+
+    def __init__(self, g, k, h0, v0, angle, distance, max_height):
+        self.g = g
+        self.k = k
+        self.h0 = h0
+        self.v0 = v0
+        self.angle = angle
+        self.distance = distance
+        self.max_height = max_height
+        self.segments = [_segments(row) for row in distance]
+        # Plain floats and lists keep the scalar queries free of array overhead
+        self._v0_low = float(v0[0])
+        self._v0_step = float(v0[1] - v0[0])
+        self._angle_low = float(angle[0])
+        self._angle_step = float(angle[1] - angle[0])
+        self._rows = [row.tolist() for row in distance]
+
+    @classmethod
+    def build(cls, g, k=0.0, h0=0.0, v0_range=DEFAULT_V0_RANGE, v0_points=DEFAULT_V0_POINTS,
+              angle_range=DEFAULT_ANGLE_RANGE, angle_points=DEFAULT_ANGLE_POINTS, **options):
+        """Solve every throw of the grid with engine.solve_batch."""
+        v0 = np.linspace(v0_range[0], v0_range[1], v0_points)
+        angle = np.linspace(angle_range[0], angle_range[1], angle_points)
+        result = engine.solve_batch(v0[:, None], angle[None, :], h0, g, drag=k or None, **options)
+        if not result.valid.all():
+            raise ValueError("Range table grid contains invalid throws")
+        return cls(g, k, h0, v0, angle, np.ma.getdata(result.distance).copy(),
+                   np.ma.getdata(result.max_height).copy())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data["version"]) != FORMAT_VERSION:
+                raise ValueError(f"Range table {path} has an old format")
+            g, k, h0 = (float(x) for x in data["config"])
+            return cls(g, k, h0, data["v0"], data["angle"], data["distance"], data["max_height"])
+
+    def save(self, path):
+        # Write to a temporary file first so readers never see half a table;
+        # its name is unique to the thread in case two build the same table
+        partial = f"{path}.{os.getpid()}-{threading.get_ident()}.partial.npz"
+        np.savez(partial, version=FORMAT_VERSION, config=np.array([self.g, self.k, self.h0]),
+                 v0=self.v0, angle=self.angle, distance=self.distance, max_height=self.max_height)
+        os.replace(partial, path)
+
+    def _locate(self, v0, angle):
+        # Cell indices and fractions; arguments outside the grid are clamped
+        i = np.clip((np.asarray(v0, dtype=float) - self._v0_low) / self._v0_step,
+                    0, len(self.v0) - 1)
+        j = np.clip((np.asarray(angle, dtype=float) - self._angle_low) / self._angle_step,
+                    0, len(self.angle) - 1)
+        i0 = np.minimum(i.astype(int), len(self.v0) - 2)
+        j0 = np.minimum(j.astype(int), len(self.angle) - 2)
+        return i0, j0, i - i0, j - j0
+
+    def _interpolate(self, table, v0, angle):
+        i0, j0, u, w = self._locate(v0, angle)
+        return ((1 - u) * ((1 - w) * table[i0, j0] + w * table[i0, j0 + 1])
+                + u * ((1 - w) * table[i0 + 1, j0] + w * table[i0 + 1, j0 + 1]))
+
+    def range_at(self, v0, angle):
+        """Interpolated range of throws; arguments broadcast."""
+        return self._interpolate(self.distance, v0, angle)
+
+    def max_height_at(self, v0, angle):
+        """Interpolated apex height of throws; arguments broadcast."""
+        return self._interpolate(self.max_height, v0, angle)
+
+    def _row(self, v0):
+        # The row interpolated at v0, and its monotone runs: those of the
+        # nearer grid row, with every boundary slid onto the interpolated
+        # row's own peak or trough, which lies within a few steps of it
+        i = min(max((v0 - self._v0_low) / self._v0_step, 0.0), len(self.v0) - 1.0)
+        i0 = min(int(i), len(self.v0) - 2)
+        u = i - i0
+        below = self._rows[i0]
+        above = self._rows[i0 + 1]
+
+        def row(j):
+            return (1 - u) * below[j] + u * above[j]
+
+        segments = self.segments[i0 if u < 0.5 else i0 + 1]
+        bounds = [segments[0][0]] + [stop for _, stop, _ in segments]
+        for n, (start, stop, rising) in enumerate(segments[:-1]):
+            # A peak ends a rising run, a trough a falling one
+            sign = 1 if rising else -1
+            b = bounds[n + 1]
+            while b + 1 < bounds[n + 2] and sign * (row(b + 1) - row(b)) > 0:
+                b += 1
+            while b - 1 > bounds[n] and sign * (row(b - 1) - row(b)) > 0:
+                b -= 1
+            bounds[n + 1] = b
+        return row, [(a, b, rising) for a, b, (_, _, rising) in zip(bounds[:-1], bounds[1:],
+                                                                      segments)]
+
+    def _search(self, row, start, stop, rising, distance):
+        # Binary search of one monotone run for the grid step that brackets
+        # the distance, then the angle interpolated within that step
+        a, b = start, stop
+        while b - a > 1:
+            mid = (a + b) // 2
+            if (row(mid) <= distance) == rising:
+                a = mid
+            else:
+                b = mid
+        ra, rb = row(a), row(b)
+        fraction = (distance - ra) / (rb - ra) if rb != ra else 0.0
+        return self._angle_low + (a + fraction) * self._angle_step
+
+    def _edge(self, row, start, stop, rising, lo, hi, distance):
+        # Angle of a run where the range meets an edge of [near, far]; an
+        # edge beyond the run's extremes maps straight to that end, so runs
+        # meeting at a peak inside the range join up exactly
+        if distance >= hi:
+            end = stop if rising else start
+        elif distance <= lo:
+            end = start if rising else stop
+        else:
+            return self._search(row, start, stop, rising, distance)
+        return self._angle_low + end * self._angle_step
+
+    def angles_for(self, v0, distance):
+        """Launch angles whose throws at speed v0 land at distance, ascending.
+
+        Consistent with range_at: every monotone run of the row interpolated
+        at v0 that spans the distance is binary-searched for it, in
+        O(log n) table reads. Empty when the distance is out of reach.
+        """
+        row, segments = self._row(v0)
+        angles = []
+        for start, stop, rising in segments:
+            first, last = row(start), row(stop)
+            lo, hi = (first, last) if rising else (last, first)
+            if lo <= distance <= hi:
+                angles.append(self._search(row, start, stop, rising, distance))
+        return angles
+
+    def intervals_for(self, v0, near, far):
+        """Launch-angle intervals whose throws at speed v0 land in [near, far].
+
+        Ascending (low, high) pairs found like angles_for, one per monotone
+        run that reaches into the range; runs meeting at a peak are merged.
+        """
+        row, segments = self._row(v0)
+        intervals = []
+        for start, stop, rising in segments:
+            first, last = row(start), row(stop)
+            lo, hi = (first, last) if rising else (last, first)
+            if hi < near or lo > far:
+                continue
+            ends = sorted(self._edge(row, start, stop, rising, lo, hi, d) for d in (near, far))
+            if intervals and ends[0] <= intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], ends[1]))
+            else:
+                intervals.append(tuple(ends))
+        return intervals
+
+
+def _segments(row):
+    # Split a row into runs where the range only rises or only falls, as
+    # (start, stop, rising) with inclusive grid indices
+    step = np.sign(np.diff(row))
+    # Flat steps belong to the run before them
+    for j in range(1, len(step)):
+        if step[j] == 0:
+            step[j] = step[j - 1]
+    breaks = np.nonzero(step[1:] != step[:-1])[0] + 1
+    bounds = np.concatenate([[0], breaks, [len(step)]])
+    return [(int(a), int(b), bool(step[a] >= 0)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def table_path(directory, g, k, h0, **grid):
+    """File name of a table, derived from everything it was built from."""
+    config = repr((FORMAT_VERSION, round(g, 9), round(k, 12), round(h0, 9), sorted(grid.items())))
+    return os.path.join(directory, f"range-{hashlib.sha1(config.encode()).hexdigest()[:16]}.npz")
+
+
+def quantize(g, k, h0):
+    """The (g, k, h0) of the table TableCache uses for a configuration."""
+    g = round(g / GRAVITY_STEP) * GRAVITY_STEP
+    h0 = max(round(h0 / HEIGHT_STEP) * HEIGHT_STEP, 0.0)
+    if k > 0:
+        k = round(k, DRAG_DIGITS - 1 - math.floor(math.log10(k)))
+    return round(g, 9), k, round(h0, 9)
+
+
+class TableCache:
+    """Range tables by configuration: in memory, then on disk, else built.
+
+    get() returns the table for a gravity, drag model (or coefficient, or
+    None) and launch height, rounded by quantize(), loading or building it
+    only when that configuration was not used recently. Built tables are
+    saved to directory so later runs start instantly; at most disk_size
+    files are kept there. Extra grid arguments go to RangeTable.build.
+    """
+
+    def __init__(self, directory, size=DEFAULT_CACHE_SIZE, disk_size=DEFAULT_DISK_SIZE, **grid):
+        self.directory = directory
+        self.size = size
+        self.disk_size = disk_size
+        self.grid = grid
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._failed = {}
+
+    def get(self, g, drag=None, h0=0.0, block=True, on_ready=None):
+        """The table for a configuration.
+
+        With block=False a table that is not in memory is loaded or built
+        in a background thread, and get returns None until it is ready;
+        on_ready(table) is then called from that thread.
+        """
+        config = quantize(g, float(getattr(drag, "coefficient", drag) or 0.0), h0)
+        path = table_path(self.directory, *config, **self.grid)
+        with self._lock:
+            table = self._tables.get(path)
+            if table is not None:
+                self._tables.move_to_end(path)
+                return table
+            if not block:
+                if path in self._failed:
+                    raise self._failed[path]
+                if path not in self._pending:
+                    self._pending.add(path)
+                    threading.Thread(target=self._fetch, args=(path, config, on_ready),
+                                     daemon=True).start()
+                return None
+        return self._fetch(path, config)
+
+    def _fetch(self, path, config, on_ready=None):
+        try:
+            table = self._load_or_build(path, config)
+        except Exception as e:
+            if on_ready is None:
+                raise
+            # Raised again by the next non-blocking get instead of retrying
+            with self._lock:
+                self._failed[path] = e
+            return None
+        else:
+            with self._lock:
+                self._tables[path] = table
+                self._tables.move_to_end(path)
+                while len(self._tables) > self.size:
+                    self._tables.popitem(last=False)
+        finally:
+            with self._lock:
+                self._pending.discard(path)
+        if on_ready is not None:
+            on_ready(table)
+        return table
+
+    def _load_or_build(self, path, config):
+        if os.path.exists(path):
+            try:
+                table = RangeTable.load(path)
+                # The file's time stamp tracks when it was last used
+                os.utime(path)
+                return table
+            except (OSError, ValueError, KeyError):
+                # Damaged or outdated; rebuild it
+                pass
+        table = RangeTable.build(*config, **self.grid)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            table.save(path)
+            self._prune()
+        except OSError:
+            # A read-only or full disk only costs the next start-up
+            pass
+        return table
+
+    def _prune(self):
+        # Delete the least recently used table files beyond disk_size
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.startswith("range-") and name.endswith(".npz")
+                 and ".partial" not in name]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for stale in paths[self.disk_size:]:
+            os.remove(stale)
@@ -0,0 +1,331 @@
+import math
+import numpy as np
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.patches import Circle, Ellipse, Polygon, Rectangle
+import scenery
+
+
+def tree_patches(x, y, height=5):
+    """Trunk and foliage of a tree standing at (x, y)."""
+    trunk, foliage = scenery.tree(x, y, height)
+    return [Rectangle(trunk[:2], *trunk[2:], color=scenery.TRUNK_COLOR),
+            Polygon(foliage, closed=True, color=scenery.FOLIAGE_COLOR)]
+
+
+def person_parts(x, y):
+    """Head patch, limb segments and limb widths of a stick figure at (x, y)."""
+    (head_x, head_y, radius), limbs, widths = scenery.person(x, y)
+    return Circle((head_x, head_y), radius, color=scenery.PERSON_COLOR), limbs, widths
+
+
+def target_patches(x, y, width, height):
+    """Target box and bullseye rings, outermost first."""
+    return ([Rectangle((x, y), width, height, color=scenery.TARGET_COLOR,
+                       alpha=scenery.TARGET_ALPHA)]
+            + [Circle(center, radius, color=color)
+               for color, center, radius in scenery.target_rings(x, y, width, height)])
+
+
+def add_scenery(ax, seed=scenery.GRASS_SEED):
+    """Draw the ground, grass, trees and thrower on ax in two collections.
+
+    Every shape goes into one PatchCollection and the stick figure's limbs
+    into one LineCollection, so the scenery costs two draw calls instead
+    of one per shape. Returns both collections.
+    """
+    x, y, width, height = scenery.ground()
+    patches = [Rectangle((x, y), width, height, color=scenery.GROUND_COLOR)]
+    patches += [Rectangle((x, y), width, height, color=scenery.GRASS_COLOR)
+                for x, y, width, height in scenery.grass(seed)]
+    for x, height in scenery.TREES:
+        patches += tree_patches(x, 0, height)
+    head, limbs, widths = person_parts(0, 0)
+    patches.append(head)
+    
+    shapes = ax.add_collection(PatchCollection(patches, match_original=True), autolim=False)
+    lines = ax.add_collection(LineCollection(limbs, colors=scenery.PERSON_COLOR,
+                                             linewidths=widths), autolim=False)
+    return shapes, lines
+
+
+class BlittedScene:
+    """Static scenery rendered once, with the changing artists blitted over it.
+
+    Everything drawn on the axes the normal way (ground, trees, labels,
+    grid) makes up the background, which a full draw renders and caches as
+    a bitmap. Artists registered with add() are animated instead: update()
+    restores the cached bitmap and redraws only them, then blits the
+    figure. Any full draw, say after a resize, recaptures the background,
+    and update() falls back to one when the axis limits or the canvas size
+    changed since.
+
+    Animations go one step further with blit_frame(): everything but the
+    few artists that move is snapshotted once, so a frame only restores
+    the snapshot and draws those.
+    """
+
+    def __init__(self, canvas, ax):
+        self.canvas = canvas
+        self.ax = ax
+        self.artists = []
+        self.background = None
+        self.frozen = None
+        self._view = None
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def add(self, artist):
+        """Register an artist already on the axes as dynamic; returns it."""
+        artist.set_animated(True)
+        self.artists.append(artist)
+        return artist
+
+    def remove(self, artist):
+        self.artists.remove(artist)
+        artist.remove()
+        self.frozen = None
+
+    def clear(self):
+        """Remove every dynamic artist from the axes."""
+        for artist in self.artists:
+            artist.remove()
+        self.artists = []
+        self.frozen = None
+
+    def invalidate(self):
+        """Force a full draw on the next update, after changing the scenery."""
+        self.background = None
+        self.frozen = None
+
+    def _current_view(self):
+        return (self.ax.get_xlim(), self.ax.get_ylim(), self.canvas.get_width_height())
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.frozen = None
+        self._view = self._current_view()
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+
+    def update(self):
+        """Show the current state of the dynamic artists."""
+        self.frozen = None
+        if self.background is None or self._current_view() != self._view:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def blit_frame(self, moving):
+        """Show an animation frame in which only the artists in moving changed.
+
+        The first frame snapshots the background with the other dynamic
+        artists on it; later frames restore the snapshot, draw the moving
+        artists and blit. update() or any full draw drops the snapshot.
+        There is no full-draw fallback: while the background is missing or
+        out of date (until the canvas redraws after a resize) frames are
+        skipped, and False is returned for them.
+        """
+        if self.background is None or self._current_view() != self._view:
+            return False
+        if self.frozen is None:
+            self.canvas.restore_region(self.background)
+            for artist in self.artists:
+                if artist not in moving:
+                    self.ax.draw_artist(artist)
+            self.frozen = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.canvas.restore_region(self.frozen)
+        for artist in moving:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
+        return True
+
+
+class ThrowArtists:
+    """The artists of a throw, created once and moved to every new throw.
+
+    show() updates the path, target, rocks and annotations in place
+    (set_data, set_center, set_position, set_visible) instead of replacing
+    them, so re-throwing allocates no new artists. They are all dynamic
+    artists of the scene. The velocity arrow is only drawn when given an
+    arrow_color.
+    """
+
+    def __init__(self, scene, path_color='blue', text_color='black', arrow_color=None):
+        self.scene = scene
+        self.artists = []
+        ax = scene.ax
+        
+        def add(artist):
+            self.artists.append(artist)
+            return scene.add(artist)
+        
+        self.path = add(ax.plot([], [], color=path_color, linestyle='--', alpha=0.7, linewidth=1.5)[0])
+        
+        # Target and bullseye rings, outermost first
+        self.target = add(ax.add_patch(Rectangle((0, 0), 0, 0, color=scenery.TARGET_COLOR,
+                                                 alpha=scenery.TARGET_ALPHA)))
+        self.rings = [add(ax.add_patch(Circle((0, 0), 0, color=color)))
+                      for color, scale in scenery.TARGET_RINGS]
+        
+        self.final_rock = add(ax.add_patch(Circle((0, 0), 0, color='#95a5a6')))
+        self.peak_rock = add(ax.add_patch(Circle((0, 0), 0, color='#95a5a6', alpha=0.5)))
+        
+        arrowprops = dict(facecolor=text_color, shrink=0.05, width=1.5, headwidth=8)
+        self.peak_label = add(ax.annotate('', xy=(0, 0), xytext=(0, 0), arrowprops=arrowprops,
+                                          color=text_color))
+        self.range_label = add(ax.annotate('', xy=(0, 0), xytext=(0, 0), arrowprops=arrowprops,
+                                           color=text_color))
+        
+        self.arrow = self.arrow_label = None
+        if arrow_color is not None:
+            self.arrow = add(ax.arrow(0, 0, 0, 0, head_width=0.5, head_length=1, fc=arrow_color,
+                                      ec=arrow_color, linewidth=2))
+            self.arrow_label = add(ax.text(0, 0, '', color=arrow_color))
+        
+        # The animated rock and the path it has flown so far, shown by move_rock
+        self.trail = add(ax.plot([], [], color=path_color, linewidth=2)[0])
+        self.rock = add(ax.add_patch(Circle((0, 0), 0, color='#95a5a6')))
+        self.data = None
+        self.hide()
+
+    def hide(self):
+        """Hide the whole throw."""
+        for artist in self.artists:
+            artist.set_visible(False)
+
+    def show(self, data, rock_size, target=None):
+        """Move the artists to a computed throw and a target (or None)."""
+        self.data = data
+        self.path.set_data(data.x, data.y)
+        self.path.set_visible(True)
+        
+        self.show_target(target)
+        
+        self.final_rock.set_center((data.distance, 0))
+        self.final_rock.set_radius(rock_size)
+        self.final_rock.set_visible(True)
+        
+        peaked = data.max_height_time > 0
+        if peaked:
+            peak = (data.max_height_x, data.max_height)
+            self.peak_rock.set_center(peak)
+            self.peak_rock.set_radius(rock_size)
+            self.peak_label.set_text(f'Max Height: {data.max_height:.2f} m')
+            self.peak_label.xy = peak
+            self.peak_label.set_position((peak[0] + 2, peak[1] + 1))
+        self.peak_rock.set_visible(peaked)
+        self.peak_label.set_visible(peaked)
+        
+        self.range_label.set_text(f'Range: {data.distance:.2f} m')
+        self.range_label.xy = (data.distance, 0.2)
+        self.range_label.set_position((data.distance - 5, 2))
+        self.range_label.set_visible(True)
+        
+        if self.arrow is not None:
+            # Initial velocity vector at half scale
+            h0 = data.y[0]
+            dx, dy = data.v0x * 0.5, data.v0y * 0.5
+            self.arrow.set_data(x=0, y=h0, dx=dx, dy=dy)
+            self.arrow.set_visible(True)
+            self.arrow_label.set_text(f'{math.hypot(data.v0x, data.v0y):.1f} m/s')
+            self.arrow_label.set_position((dx / 2, h0 + dy / 2 + 0.5))
+            self.arrow_label.set_visible(True)
+        
+        self.rock.set_radius(rock_size)
+        self.rock.set_visible(False)
+        self.trail.set_visible(False)
+
+    def show_target(self, target):
+        """Move the target and its bullseye, or hide them if target is None."""
+        for patch in (self.target, *self.rings):
+            patch.set_visible(target is not None)
+        if target is None:
+            return
+        self.target.set_xy((target.x, target.y))
+        self.target.set_width(target.width)
+        self.target.set_height(target.height)
+        rings = scenery.target_rings(target.x, target.y, target.width, target.height)
+        for ring, (color, center, radius) in zip(self.rings, rings):
+            ring.set_center(center)
+            ring.set_radius(radius)
+
+    def move_rock(self, x, y, time=None):
+        """Show the animated rock at (x, y).
+
+        Given the flight time it is at, the trail behind it is drawn too.
+        """
+        self.rock.set_center((x, y))
+        self.rock.set_visible(True)
+        if time is None or self.data is None or self.data.times is None:
+            return
+        n = np.searchsorted(self.data.times, time, side='right')
+        self.trail.set_data(np.append(self.data.x[:n], x), np.append(self.data.y[:n], y))
+        self.trail.set_visible(True)
+
+
+class Plot:
+    """The Kivy simulator's plot on a matplotlib canvas.
+
+    Scenery, throw and landing spread ellipse on one axes, behind the
+    interface main.py shares with kivy_plot.NativePlot: set_view,
+    show_throw, show_spread/hide_spread, move_rock, update and animate.
+    The canvas is a FigureCanvasKivyAgg on screen, or an Agg canvas for
+    saving images with save().
+    """
+
+    def __init__(self, figure, canvas):
+        self.figure = figure
+        self.canvas = self.widget = canvas
+        self.ax = figure.add_subplot(111)
+        self.scene = BlittedScene(canvas, self.ax)
+        
+        self.ax.set_xlim(-5, 50)
+        self.ax.set_ylim(-1, 20)
+        add_scenery(self.ax)
+        self.ax.set_xlabel('Distance (m)')
+        self.ax.set_ylabel('Height (m)')
+        self.ax.set_title('Rock Trajectory')
+        self.ax.grid(True, alpha=0.3)
+        
+        self.throw = ThrowArtists(self.scene)
+        self.spread = self.scene.add(self.ax.add_patch(
+            Ellipse((0, 0), 0, 0, facecolor='#3498db', edgecolor='#2c3e50', alpha=0.3)))
+        self.spread.set_visible(False)
+
+    def set_view(self, x_max, y_max):
+        """Show distances -5..x_max and heights -1..y_max."""
+        self.ax.set_xlim(-5, x_max)
+        self.ax.set_ylim(-1, y_max)
+
+    def show_throw(self, data, rock_size, target=None):
+        """Show a computed throw and a target (or None); hides the rock."""
+        self.throw.show(data, rock_size, target)
+
+    def show_spread(self, center, width, height, angle):
+        """Show the landing spread ellipse (metres, angle in degrees)."""
+        self.spread.center = center
+        self.spread.width = width
+        self.spread.height = height
+        self.spread.angle = angle
+        self.spread.set_visible(True)
+
+    def hide_spread(self):
+        self.spread.set_visible(False)
+
+    def move_rock(self, x, y, time=None):
+        """Show the animated rock at (x, y), with its trail up to time if given."""
+        self.throw.move_rock(x, y, time=time)
+
+    def update(self):
+        self.scene.update()
+
+    def animate(self):
+        """Blit an animation frame; False if it had to be skipped."""
+        return self.scene.blit_frame((self.throw.trail, self.throw.rock))
+
+    def save(self, path, **kwargs):
+        self.figure.savefig(path, **kwargs)
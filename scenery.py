@@ -0,0 +1,66 @@
+import numpy as np
+
+# Seed of the grass heights, so that the scenery comes out the same on
+# every draw and its rendering can be cached
+GRASS_SEED = 7
+
+# Trees of the scenery as (x, height)
+TREES = ((10, 5), (25, 6), (40, 4.5))
+
+# Colours shared by the matplotlib and Kivy renderers
+GROUND_COLOR = '#7f8c8d'
+GRASS_COLOR = '#27ae60'
+TRUNK_COLOR = '#795548'
+FOLIAGE_COLOR = '#2ecc71'
+PERSON_COLOR = '#f39c12'
+TARGET_COLOR = '#e74c3c'
+
+# Opacity of the target box
+TARGET_ALPHA = 0.8
+
+# Bullseye rings as (colour, radius relative to the outermost), outermost first
+TARGET_RINGS = (('#ffffff', 1.0), (TARGET_COLOR, 0.6), ('#ffffff', 0.2))
+
+
+def ground():
+    """The strip of ground as a rectangle (x, y, width, height)."""
+    return (-5, -1, 60, 1)
+
+
+def grass(seed=GRASS_SEED):
+    """Blades of grass as rectangles (x, y, width, height)."""
+    rng = np.random.default_rng(seed)
+    starts = range(0, 55, 2)
+    grass_heights = 0.2 + 0.1 * rng.random(len(starts))
+    return [(i-5, 0, 0.1, grass_height) for i, grass_height in zip(starts, grass_heights)]
+
+
+def tree(x, y, height=5):
+    """Trunk rectangle (x, y, width, height) and foliage triangle of a tree."""
+    trunk = (x-0.5, y, 1, height*0.4)
+    tree_width = height * 0.6
+    foliage = [
+        (x-tree_width/2, y+height*0.3),  # Left bottom
+        (x+tree_width/2, y+height*0.3),  # Right bottom
+        (x, y+height)                     # Top
+    ]
+    return trunk, foliage
+
+
+def person(x, y):
+    """Head circle (x, y, radius), limb segments and limb widths of a stick figure."""
+    head = (x, y+1.7, 0.3)
+    limbs = [
+        [(x, y+1.4), (x, y+0.7)],      # Body
+        [(x, y+1.2), (x+0.5, y+1.3)],  # Right arm raised
+        [(x, y+0.7), (x-0.3, y)],      # Left leg
+        [(x, y+0.7), (x+0.3, y)],      # Right leg
+    ]
+    return head, limbs, [3, 2, 2, 2]
+
+
+def target_rings(x, y, width, height):
+    """Bullseye of a target box as (colour, centre, radius), outermost first."""
+    center = (x + width/2, y + height/2)
+    size = min(width, height) * 0.3
+    return [(color, center, size*scale) for color, scale in TARGET_RINGS]
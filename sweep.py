@@ -0,0 +1,265 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+import numpy as np
+import engine
+import qmc
+
+# Throws solved per task; large enough to amortize scheduling, small enough
+# to keep every core busy and memory per worker modest
+DEFAULT_CHUNK_SIZE = 65536
+
+# Chunks queued per worker at any time
+CHUNKS_PER_WORKER = 2
+
+AXES = ("v0", "angle_rad", "h0", "g", "drag")
+
+
+class SweepChunk:
+    """Results for the grid points start:stop in flat (C) order."""
+
+    __slots__ = ("start", "stop", "result")
+
+    def __init__(self, start, stop, result):
+        self.start = start
+        self.stop = stop
+        self.result = result
+
+    def __repr__(self):
+        return f"SweepChunk(start={self.start!r}, stop={self.stop!r})"
+
+
+class Grid:
+    """Outer product of parameter axes, generated a chunk at a time.
+
+    Every argument is a scalar or a 1-D array; the array ones become grid
+    axes in the order v0, angle_rad, h0, g, drag. drag is None or the drag
+    coefficient k (see drag.DragModel.coefficient).
+    """
+
+    def __init__(self, v0, angle_rad, h0, g, drag=None):
+        self.values = {}
+        for name, value in zip(AXES, (v0, angle_rad, h0, g, drag)):
+            if value is not None:
+                value = np.asarray(getattr(value, "coefficient", value), dtype=float)
+                if value.ndim > 1:
+                    raise ValueError(f"Sweep axis {name} must be a scalar or 1-D array")
+            self.values[name] = value
+        self.axes = tuple(name for name in AXES
+                          if self.values[name] is not None and self.values[name].ndim == 1)
+        self.shape = tuple(len(self.values[name]) for name in self.axes)
+        self.size = int(np.prod(self.shape))
+
+    def parameters(self, start, stop):
+        """Flat parameter arrays for the grid points start:stop."""
+        params = dict(self.values)
+        if not self.axes:
+            return params
+        index = np.unravel_index(np.arange(start, stop), self.shape)
+        for name, i in zip(self.axes, index):
+            params[name] = self.values[name][i]
+        return params
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        return _chunks(self.size, chunk_size)
+
+
+class Design:
+    """Scattered parameter points from a low-discrepancy sequence.
+
+    Every parameter is a scalar or a (low, high) range; the ranges are
+    filled evenly by size points of a scrambled Sobol or Halton sequence
+    (method), which covers a many-parameter space with far fewer throws
+    than a grid. Points are generated by index, a chunk at a time, in the
+    worker that solves them. Usable wherever sweep takes a Grid.
+    """
+
+    def __init__(self, size, v0, angle_rad, h0, g, drag=None, method="sobol", seed=None):
+        self.values = {}
+        self.ranges = {}
+        for name, value in zip(AXES, (v0, angle_rad, h0, g, drag)):
+            if isinstance(value, tuple):
+                self.ranges[name] = (float(value[0]), float(value[1]))
+            else:
+                self.values[name] = getattr(value, "coefficient", value)
+        self.axes = tuple(self.ranges)
+        self.generator = qmc.sampler(method, max(len(self.axes), 1), seed=seed)
+        self.shape = (size,)
+        self.size = size
+
+    def parameters(self, start, stop):
+        """Flat parameter arrays for the points start:stop."""
+        params = dict(self.values)
+        u = self.generator.points(start, stop)
+        for i, name in enumerate(self.axes):
+            low, high = self.ranges[name]
+            params[name] = low + (high - low) * u[:, i]
+        return params
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        return _chunks(self.size, chunk_size)
+
+
+def _chunks(size, chunk_size):
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+
+class SharedResults:
+    """Sweep outputs in one shared-memory block.
+
+    Holds flat float64 arrays for engine.BatchResult.FIELDS and a bool
+    valid array, for a grid of the given shape. Worker processes attach by
+    name and write their chunks in place, so the parent reads results
+    without any copying or pickling. The creating process should call
+    unlink() (or use it as a context manager) once every view of the
+    results has been dropped.
+    """
+
+    def __init__(self, shape, name=None):
+        self.shape = tuple(shape)
+        self.size = int(np.prod(self.shape))
+        nbytes = max(self.size * (8 * len(engine.BatchResult.FIELDS) + 1), 1)
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            # Child processes share the creator's resource tracker, so
+            # attaching does not hand ownership of the block to them
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.arrays = self._views()
+
+    def _views(self):
+        n = self.size
+        count = len(engine.BatchResult.FIELDS)
+        floats = np.ndarray((count, n), dtype=float, buffer=self.memory.buf)
+        valid = np.ndarray(n, dtype=bool, buffer=self.memory.buf, offset=8 * count * n)
+        return tuple(floats) + (valid,)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def slices(self, start, stop):
+        """Output arrays for the grid points start:stop, as solve_batch's out."""
+        return tuple(a[start:stop] for a in self.arrays)
+
+    def result(self):
+        """The whole grid as a BatchResult viewing the shared block."""
+        return engine.BatchResult(*(a.reshape(self.shape) for a in self.arrays))
+
+    def close(self):
+        self.arrays = None
+        self.memory.close()
+
+    def unlink(self):
+        self.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.unlink()
+
+
+# Shared blocks already attached in this worker, by name; the pool's
+# workers exit with the sweep, which releases them
+_attached = {}
+
+
+def _shared_results(shape, name):
+    results = _attached.get(name)
+    if results is None:
+        results = _attached[name] = SharedResults(shape, name)
+    return results
+
+
+def _solve(grid, start, stop, options, out=None):
+    params = grid.parameters(start, stop)
+    return engine.solve_batch(params["v0"], params["angle_rad"], params["h0"], params["g"],
+                              drag=params["drag"], out=out, **options)
+
+
+def _solve_chunk(grid, start, stop, options, out_name=None):
+    # Runs in a worker process
+    if out_name is not None:
+        # Write into shared memory; only the range goes back
+        _solve(grid, start, stop, options, _shared_results(grid.shape, out_name).slices(start, stop))
+        return start, stop, None
+    # Ship plain arrays back; the parent rebuilds the masked result
+    result = _solve(grid, start, stop, options)
+    n = stop - start
+    return start, stop, tuple(np.broadcast_to(np.ma.getdata(getattr(result, key)), n)
+                              for key in engine.BatchResult.FIELDS) + (
+                                  np.broadcast_to(result.valid, n),)
+
+
+def sweep(v0, angle_rad, h0, g, drag=None, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=None,
+          out=None, **options):
+    """Solve every point of a parameter grid across worker processes.
+
+    The grid (see Grid) is split into chunks of chunk_size points that are
+    solved by engine.solve_batch, which receives any extra options, in a
+    process pool of max_workers (default: one per core). Chunks are yielded
+    as SweepChunk objects as soon as they finish, in no particular order.
+    With max_workers=1 the chunks are solved in this process, in order.
+    A prebuilt Grid or Design may be passed as v0, in which case the other
+    parameter arguments are ignored.
+
+    With out, a SharedResults of the grid's shape, workers write straight
+    into shared memory and each chunk's result views its slice of it.
+    """
+    grid = v0 if isinstance(v0, (Grid, Design)) else Grid(v0, angle_rad, h0, g, drag)
+    chunks = grid.chunks(chunk_size)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    out_name = None
+    if out is not None:
+        if out.shape != grid.shape:
+            raise ValueError(f"Output shape {out.shape} does not match the grid {grid.shape}")
+        out_name = out.name
+
+    def make_chunk(start, stop, fields):
+        if fields is None:
+            fields = out.slices(start, stop)
+        return SweepChunk(start, stop, engine.BatchResult(*fields))
+
+    if max_workers <= 1 or len(chunks) <= 1:
+        for start, stop in chunks:
+            if out is None:
+                yield make_chunk(*_solve_chunk(grid, start, stop, options))
+            else:
+                yield SweepChunk(start, stop,
+                                 _solve(grid, start, stop, options, out.slices(start, stop)))
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # Keep a bounded number of chunks in flight so that huge grids do not
+        # queue every task (and its result) at once
+        pending = set()
+        queue = iter(chunks)
+        limit = max_workers * CHUNKS_PER_WORKER
+        while True:
+            while len(pending) < limit:
+                chunk = next(queue, None)
+                if chunk is None:
+                    break
+                pending.add(executor.submit(_solve_chunk, grid, *chunk, options, out_name))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield make_chunk(*future.result())
+
+
+def collect(chunks, shape):
+    """Assemble streamed chunks into one BatchResult of the grid's shape."""
+    size = int(np.prod(shape))
+    fields = [np.full(size, np.nan) for _ in engine.BatchResult.FIELDS]
+    valid = np.zeros(size, dtype=bool)
+    for chunk in chunks:
+        for out, key in zip(fields, engine.BatchResult.FIELDS):
+            out[chunk.start:chunk.stop] = np.ma.getdata(getattr(chunk.result, key))
+        valid[chunk.start:chunk.stop] = chunk.result.valid
+    return engine.BatchResult(*(a.reshape(shape) for a in fields), valid.reshape(shape))
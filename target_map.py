@@ -0,0 +1,123 @@
+import numpy as np
+import uncertainty
+
+# Cells per side of the first, coarse pass and the number of times the
+# cells on the hit boundary are halved after it: 64 * 2**4 + 1 = 1025
+# points per side at full resolution
+DEFAULT_BASE_CELLS = 64
+DEFAULT_LEVELS = 4
+
+
+class TargetMap:
+    """Hit/miss map of a target over launch speed and launch angle.
+
+    The map is a square lattice of size x size points, rows along the angle
+    and columns along v0. ``hit`` holds the hit fraction of every point
+    (exactly 0 or 1 once refined) and ``miss`` the signed miss distance:
+    how far short (negative) or long (positive) of the target the throw
+    lands, 0 for hits. Everything else is interpolated from the corners of
+    the cell it lies in.
+
+    refine() works coarse to fine: every pass solves the corners of the
+    current cells and only splits the cells whose corners disagree, which
+    is where the hit boundary runs. A cell with one throw short and another
+    long is split as well, since some throw in between must land on the
+    target. Extra options go to uncertainty.solve_and_hit_test.
+    """
+
+    def __init__(self, v0_range, angle_range, h0, g, target, rock_size=0.0, drag=None,
+                 base_cells=DEFAULT_BASE_CELLS, levels=DEFAULT_LEVELS, **options):
+        self.h0 = h0
+        self.g = g
+        self.target = target
+        self.rock_size = rock_size
+        self.drag = drag
+        self.options = options
+        self.base_cells = base_cells
+        self.levels = levels
+        self.size = base_cells * 2**levels + 1
+        self.v0 = np.linspace(v0_range[0], v0_range[1], self.size)
+        self.angle = np.linspace(angle_range[0], angle_range[1], self.size)
+        self.hit = np.zeros((self.size, self.size))
+        self.miss = np.full((self.size, self.size), np.nan)
+        self.evaluations = 0
+        self.level = None
+        self._known = np.zeros((self.size, self.size), dtype=bool)
+        self._point_hit = np.zeros((self.size, self.size))
+        self._point_miss = np.full((self.size, self.size), np.nan)
+
+    @property
+    def extent(self):
+        """(left, right, bottom, top) of the map in v0 and angle, for imshow."""
+        return (self.v0[0], self.v0[-1], self.angle[0], self.angle[-1])
+
+    def _evaluate(self, rows, cols):
+        # Solve the lattice points not solved yet
+        flat = np.unique(rows * self.size + cols)
+        flat = flat[~self._known.flat[flat]]
+        if len(flat) == 0:
+            return
+        rows, cols = np.divmod(flat, self.size)
+        v0 = self.v0[cols]
+        angle = self.angle[rows]
+        target = self.target
+        # One solve gives both the hit test and the landing point
+        batch, hit = uncertainty.solve_and_hit_test(v0, angle, self.h0, self.g, target,
+                                                    self.rock_size, self.drag, **self.options)
+        landing = np.ma.filled(batch.distance, np.nan)
+        near = target.x - self.rock_size
+        far = target.x + target.width + self.rock_size
+        miss = np.where(landing < near, landing - near, np.where(landing > far, landing - far, 0.0))
+        self._point_hit[rows, cols] = hit
+        self._point_miss[rows, cols] = np.where(hit, 0.0, miss)
+        self._known[rows, cols] = True
+        self.evaluations += len(flat)
+
+    def _fill(self, rows, cols, step):
+        # Bilinear fill of every cell from its corners
+        offsets = np.arange(step + 1)
+        u = (offsets / step)[:, None]
+        w = (offsets / step)[None, :]
+        weights = ((1 - u) * (1 - w), (1 - u) * w, u * (1 - w), u * w)
+        corners = ((rows, cols), (rows, cols + step), (rows + step, cols), (rows + step, cols + step))
+        cell_rows = rows[:, None, None] + offsets[None, :, None]
+        cell_cols = cols[:, None, None] + offsets[None, None, :]
+        for image, points in ((self.hit, self._point_hit), (self.miss, self._point_miss)):
+            image[cell_rows, cell_cols] = sum(
+                weight * points[r, c][:, None, None] for weight, (r, c) in zip(weights, corners))
+
+    def refine(self):
+        """Refine the map pass by pass, yielding the pass number after each.
+
+        The map is complete (if coarse) after the first pass, so it can be
+        shown right away and redrawn as it sharpens.
+        """
+        step = 2**self.levels
+        starts = np.arange(self.base_cells) * step
+        rows, cols = (a.ravel() for a in np.meshgrid(starts, starts, indexing="ij"))
+        for level in range(self.levels + 1):
+            self._evaluate(np.concatenate([rows, rows, rows + step, rows + step]),
+                           np.concatenate([cols, cols + step, cols, cols + step]))
+            self._fill(rows, cols, step)
+            self.level = level
+            yield level
+            if step == 1:
+                break
+
+            # Split the cells whose corners disagree on the hit, or where
+            # one throw falls short and another long
+            corners = ((rows, cols), (rows, cols + step), (rows + step, cols), (rows + step, cols + step))
+            hits = np.stack([self._point_hit[r, c] for r, c in corners])
+            signs = np.stack([np.sign(self._point_miss[r, c]) for r, c in corners])
+            mixed = (hits.min(axis=0) != hits.max(axis=0)) | (
+                (np.nanmin(signs, axis=0, initial=0) < 0) & (np.nanmax(signs, axis=0, initial=0) > 0))
+            rows, cols = rows[mixed], cols[mixed]
+            step //= 2
+            rows = np.concatenate([rows, rows, rows + step, rows + step])
+            cols = np.concatenate([cols, cols + step, cols, cols + step])
+
+    def compute(self):
+        """Refine the map completely and return it."""
+        for _ in self.refine():
+            pass
+        return self
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import aiming
+import drag
+import engine
+
+# Edges of the solved intervals are only compared this far (radians) away
+EDGE_MARGIN = 1e-3
+
+CASES = [
+    # v0, h0, distance, height, width, bottom
+    (15.0, 1.0, 15.0, 2.0, 3.0, 0.0),
+    (25.0, 1.5, 20.0, 0.5, 1.0, 0.0),
+    (20.0, 0.0, 10.0, 8.0, 0.5, 0.0),
+    (18.0, 1.0, 15.0, 4.0, 2.0, 2.5),
+    (30.0, 2.0, 25.0, 9.0, 3.0, 6.0),
+    (12.0, 1.0, 40.0, 2.0, 2.0, 0.0),
+]
+
+
+def brute_force(v0, h0, distance, height, width, bottom, model, angles):
+    target = engine.Target(distance, width, height - bottom, y=bottom)
+    return np.array([engine.calculate_trajectory(v0, angle, h0, 9.81, target=target,
+                                                 drag=model, summary=True).target_hit
+                     for angle in angles])
+
+
+def inside(intervals, angles):
+    return np.array([any(lo <= angle <= hi for lo, hi in intervals) for angle in angles])
+
+
+def near_edge(intervals, angles):
+    edges = np.array([edge for interval in intervals for edge in interval])
+    if len(edges) == 0:
+        return np.zeros(len(angles), dtype=bool)
+    return (np.abs(angles[:, None] - edges[None, :]) < EDGE_MARGIN).any(axis=1)
+
+
+@pytest.mark.parametrize("model", [None, drag.DragModel(0.05, 0.3)])
+@pytest.mark.parametrize("case", CASES)
+def test_intervals_match_brute_force(case, model):
+    v0, h0, distance, height, width, bottom = case
+    solution = aiming.hitting_angles(v0, h0, 9.81, distance, height, width, drag=model,
+                                     target_bottom=bottom)
+    intervals = solution.interval_list()
+    angles = np.linspace(0.0, np.pi / 2, 181)[1:-1]
+    expected = brute_force(v0, h0, distance, height, width, bottom, model, angles)
+    checked = ~near_edge(intervals, angles)
+    assert (inside(intervals, angles) == expected)[checked].all()
+    assert bool(solution.hit) == expected.any()
+
+
+def test_closed_form_level_target():
+    # A 1 m wide sliver on the ground at the drag-free range R hits at
+    # the two angles with sin(2*angle) = g*R/v0^2
+    v0, distance = 20.0, 30.0
+    solution = aiming.hitting_angles(v0, 0.0, 9.81, distance, 1e-9, 1e-9)
+    flat = 0.5 * np.arcsin(9.81 * distance / v0**2)
+    assert solution.low == pytest.approx(flat, abs=1e-6)
+    assert solution.high == pytest.approx(np.pi / 2 - flat, abs=1e-6)
+
+
+def test_hits_target_agrees_with_intervals():
+    solution = aiming.hitting_angles(15.0, 1.0, 9.81, 15.0, 2.0, 3.0)
+    angles = np.linspace(0.01, 1.56, 200)
+    intervals = solution.interval_list()
+    hit = aiming.hits_target(15.0, angles, 1.0, 9.81, 15.0, 2.0, 3.0)
+    checked = ~near_edge(intervals, angles)
+    assert (hit == inside(intervals, angles))[checked].all()
+
+
+def test_broadcasts():
+    solution = aiming.hitting_angles(np.array([5.0, 15.0, 25.0])[:, None], 1.0, 9.81,
+                                     np.array([10.0, 20.0]), 2.0, 1.0)
+    assert solution.hit.shape == (3, 2)
+    assert not solution.hit[0].any()
+    assert np.isnan(solution.low[0]).all()
@@ -0,0 +1,75 @@
+import pytest
+import aiming
+import cache
+import drag
+import engine
+import uncertainty
+
+
+def test_trajectory_cache_hits_within_quantum():
+    trajectories = cache.TrajectoryCache()
+    first = trajectories.calculate_trajectory(20.0, 0.7, 1.0, 9.81)
+    assert trajectories.calculate_trajectory(20.0 + 1e-8, 0.7, 1.0, 9.81) is first
+    assert trajectories.calculate_trajectory(20.1, 0.7, 1.0, 9.81) is not first
+    assert trajectories.stats()["hits"] == 1
+    assert trajectories.stats()["misses"] == 2
+
+
+def test_trajectory_cache_keys_on_target_and_drag():
+    trajectories = cache.TrajectoryCache()
+    plain = trajectories.calculate_trajectory(20.0, 0.7, 1.0, 9.81)
+    target = trajectories.calculate_trajectory(20.0, 0.7, 1.0, 9.81, target=engine.Target(20, 2, 3))
+    model = trajectories.calculate_trajectory(20.0, 0.7, 1.0, 9.81, drag=drag.DragModel(0.05, 0.3))
+    assert len({id(plain), id(target), id(model)}) == 3
+    # Models with the same coefficient share an entry
+    assert trajectories.calculate_trajectory(20.0, 0.7, 1.0, 9.81,
+                                             drag=drag.DragModel(0.05, 0.3)) is model
+
+
+def test_trajectory_cache_evicts_least_recently_used():
+    trajectories = cache.TrajectoryCache(capacity=2)
+    first = trajectories.calculate_trajectory(10.0, 0.7, 1.0, 9.81)
+    trajectories.calculate_trajectory(11.0, 0.7, 1.0, 9.81)
+    assert trajectories.calculate_trajectory(10.0, 0.7, 1.0, 9.81) is first
+    trajectories.calculate_trajectory(12.0, 0.7, 1.0, 9.81)
+    assert len(trajectories) == 2
+    assert trajectories.evictions == 1
+    assert trajectories.calculate_trajectory(10.0, 0.7, 1.0, 9.81) is first
+
+
+def test_trajectory_cache_byte_budget():
+    trajectories = cache.TrajectoryCache(max_bytes=1)
+    trajectories.calculate_trajectory(10.0, 0.7, 1.0, 9.81)
+    trajectories.calculate_trajectory(11.0, 0.7, 1.0, 9.81)
+    # The newest entry is always kept
+    assert len(trajectories) == 1
+
+
+def test_trajectory_cache_does_not_cache_errors():
+    trajectories = cache.TrajectoryCache()
+    with pytest.raises(ValueError):
+        trajectories.calculate_trajectory(-1.0, 0.7, 1.0, 9.81)
+    assert len(trajectories) == 0
+
+
+def test_memo_hitting_angles():
+    angles = cache.Memo(aiming.hitting_angles, capacity=2)
+    model = drag.DragModel(0.05, 0.3)
+    first = angles(20.0, 1.0, 9.81, 15.0, 3.0, 2.0, drag=model)
+    assert angles(20.0, 1.0, 9.81, 15.0, 3.0, 2.0, drag=drag.DragModel(0.05, 0.3)) is first
+    assert angles(20.0, 1.0, 9.81, 15.0, 3.0, 2.0) is not first
+    angles(21.0, 1.0, 9.81, 15.0, 3.0, 2.0)
+    assert angles.stats()["evictions"] == 1
+    assert len(angles) == 2
+
+
+def test_memo_keys_on_arrays_and_targets():
+    spread = cache.Memo(uncertainty.linearized_spread)
+    covariance = uncertainty.diagonal_covariance(0.5, 0.01, 0.1)
+    first = spread(20.0, 0.7, 1.0, 9.81, covariance, target=engine.Target(20, 2, 3))
+    assert spread(20.0, 0.7, 1.0, 9.81, covariance.copy(), target=engine.Target(20, 2, 3)) is first
+    assert spread(20.0, 0.7, 1.0, 9.81, 2 * covariance, target=engine.Target(20, 2, 3)) is not first
+    assert spread(20.0, 0.7, 1.0, 9.81, covariance, target=engine.Target(21, 2, 3)) is not first
+    assert spread.stats()["hits"] == 1
+    spread.clear()
+    assert len(spread) == 0
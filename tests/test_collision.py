@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import collision
+
+G = 9.81
+
+
+def box_distance(x, y, box_x, box_y, width, height):
+    # Distance from points to a box, 0 inside it
+    dx = np.maximum(np.maximum(box_x - x, x - (box_x + width)), 0.0)
+    dy = np.maximum(np.maximum(box_y - y, y - (box_y + height)), 0.0)
+    return np.hypot(dx, dy)
+
+
+def brute_force_contact(v0, angle, h0, radius, box):
+    # First time on a fine grid that the disc touches the box or the ground
+    vx, vy = v0 * np.cos(angle), v0 * np.sin(angle)
+    t = np.linspace(0, 2 * (vy + np.sqrt(vy**2 + 2*G*h0)) / G, 200001)
+    x, y = vx * t, h0 + vy * t - 0.5 * G * t**2
+    touching = box_distance(x, y, *box) <= radius
+    landed = y <= radius
+    first_touch = t[np.argmax(touching)] if touching.any() else np.inf
+    first_landing = t[np.argmax(landed & (t > 0) & (vy - G * t < 0))]
+    return first_touch <= first_landing, min(first_touch, first_landing)
+
+
+def test_point_entry_matches_sampling():
+    rng = np.random.default_rng(3)
+    v0 = rng.uniform(5, 25, 100)
+    angle = rng.uniform(0.05, 1.5, 100)
+    entry = collision.target_intersection(v0, angle, 1.0, G, 15.0, 2.0, 3.0)
+    for i in range(len(v0)):
+        hit, time = brute_force_contact(v0[i], angle[i], 1.0, 0.0, (15.0, 0.0, 2.0, 3.0))
+        assert bool(entry.hit[i]) == hit
+        if hit:
+            assert entry.time[i] == pytest.approx(time, abs=1e-4)
+
+
+def test_disc_contact_matches_sampling():
+    # Raised box, so that the rock can clip its rounded lower corners too
+    box = (15.0, 1.0, 2.0, 3.0)
+    rng = np.random.default_rng(4)
+    v0 = rng.uniform(5, 25, 100)
+    angle = rng.uniform(0.05, 1.5, 100)
+    contact = collision.disc_target_contact(v0, angle, 1.0, G, 0.3, box[0], box[2], box[3],
+                                            target_y=box[1])
+    for i in range(len(v0)):
+        hit, time = brute_force_contact(v0[i], angle[i], 1.0, 0.3, box)
+        assert bool(contact.target_hit[i]) == hit
+        assert contact.time[i] == pytest.approx(time, abs=1e-4)
+
+
+def test_corner_contact():
+    # A flat throw that only grazes the top-left corner of the box: its
+    # centre passes over the corner, but within the disc radius of it
+    radius = 0.2
+    vx, vy = 10.0, 0.5 * G
+    # The centre is back at its launch height 3 m at t = 1, x = 10
+    corner = (10.0, 3.0 - 0.25 * radius)
+    box = (corner[0], 0.0, 1.0, corner[1])
+    contact = collision.parabola_disc_contact(0.0, 3.0, vx, vy, G, radius, *box)
+    assert contact.target_hit
+    assert collision.FACE_NAMES[int(contact.face)] == "corner"
+    centre = np.array([contact.x, contact.y])
+    assert np.hypot(*(centre - np.array(corner))) == pytest.approx(radius)
+    assert contact.x < corner[0]
+
+
+def test_polyline_contact_matches_parabola():
+    vx, vy, radius = 9.0, 7.0, 0.25
+    box = (8.0, 0.0, 1.5, 2.0)
+    t = np.linspace(0, 2 * (vy + np.sqrt(vy**2 + 2*G)) / G, 20001)
+    x, y = vx * t, 1.0 + vy * t - 0.5 * G * t**2
+    sampled = collision.polyline_disc_contact(t, x, y, radius, *box)
+    exact = collision.parabola_disc_contact(0.0, 1.0, vx, vy, G, radius, *box)
+    assert bool(sampled.target_hit) == bool(exact.target_hit)
+    assert sampled.time == pytest.approx(exact.time, abs=1e-5)
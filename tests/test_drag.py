@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+import drag
+import engine
+
+V0 = np.array([8.0, 15.0, 25.0])
+ANGLE = np.array([0.3, 0.8, 1.2])
+
+
+def test_vanishing_drag_matches_parabola():
+    solution = drag.integrate(V0, ANGLE, 1.0, 9.81, 1e-12)
+    exact = engine.solve_batch(V0, ANGLE, 1.0, 9.81)
+    assert solution.valid.all()
+    assert solution.distance == pytest.approx(np.ma.getdata(exact.distance), rel=1e-6)
+    assert solution.flight_time == pytest.approx(np.ma.getdata(exact.flight_time), rel=1e-6)
+    assert solution.max_height == pytest.approx(np.ma.getdata(exact.max_height), rel=1e-6)
+
+
+def test_adaptive_and_fixed_steps_agree():
+    adaptive = drag.integrate(V0, ANGLE, 1.0, 9.81, 0.02, rtol=1e-9, atol=1e-9)
+    fixed = drag.integrate(V0, ANGLE, 1.0, 9.81, 0.02, method="fixed")
+    assert adaptive.distance == pytest.approx(fixed.distance, rel=1e-6)
+    assert adaptive.flight_time == pytest.approx(fixed.flight_time, rel=1e-6)
+
+
+def test_drag_shortens_the_throw():
+    free = engine.solve_batch(V0, ANGLE, 1.0, 9.81)
+    solution = drag.integrate(V0, ANGLE, 1.0, 9.81, drag.DragModel(0.05, 0.2))
+    assert (solution.distance < np.ma.getdata(free.distance)).all()
+    assert solution.end_state[:, 1] == pytest.approx(0.0, abs=1e-9)
+    assert (solution.stop_reason == drag.STOP_GROUND).all()
+
+
+def test_x_stop():
+    solution = drag.integrate(V0, ANGLE, 1.0, 9.81, 0.02, x_stop=5.0)
+    assert (solution.stop_reason == drag.STOP_DISTANCE).all()
+    assert solution.end_state[:, 0] == pytest.approx(5.0)
+
+
+def test_sample_all_matches_sample():
+    solution = drag.integrate(V0, ANGLE, 1.0, 9.81, 0.02, record=True)
+    times = np.linspace(0, 1, 9)[None, :] * solution.flight_time[:, None]
+    states = solution.sample_all(times)
+    for i in range(len(V0)):
+        assert states[i] == pytest.approx(solution.sample(i, times[i]))
+    assert states[:, 0, :2] == pytest.approx(np.column_stack([np.zeros(3), np.ones(3)]))
+    assert states[:, -1, 0] == pytest.approx(solution.distance)
+    assert solution.sample_all(times[1:2], rows=[1]) == pytest.approx(states[1:2])
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+import collision
+import drag
+import dual
+import engine
+
+# Central-difference step
+STEP = 1e-6
+
+
+def finite_difference(function, args, i):
+    up, down = list(args), list(args)
+    up[i] = up[i] + STEP
+    down[i] = down[i] - STEP
+    return (np.asarray(function(*up)) - np.asarray(function(*down))) / (2 * STEP)
+
+
+@pytest.mark.parametrize("function", [
+    np.sqrt, np.square, np.exp, np.expm1, np.log, np.log1p, np.sin, np.cos, np.tan,
+    np.arcsin, np.arccos, np.arctan, np.sinh, np.cosh, np.tanh, np.negative, np.absolute,
+])
+def test_unary_derivatives(function):
+    x = np.array([0.2, 0.45, 0.7])
+    (seed,) = dual.variables(x)
+    result = function(seed)
+    assert result.value == pytest.approx(function(x))
+    assert result.grad[..., 0] == pytest.approx(finite_difference(function, [x], 0), rel=1e-6)
+
+
+@pytest.mark.parametrize("function", [
+    np.add, np.subtract, np.multiply, np.true_divide, np.power, np.arctan2, np.hypot,
+    np.maximum, np.minimum,
+])
+def test_binary_derivatives(function):
+    args = [np.array([0.3, 1.5, 2.0]), np.array([1.2, 0.4, 2.5])]
+    result = function(*dual.variables(*args))
+    assert result.value == pytest.approx(function(*args))
+    for i in range(2):
+        assert result.grad[..., i] == pytest.approx(finite_difference(function, args, i),
+                                                    rel=1e-6, abs=1e-9)
+
+
+def test_arithmetic_with_plain_numbers():
+    x, y = dual.variables(2.0, 3.0)
+    result = 3 * x * y + x / y - 1
+    assert dual.value(result) == pytest.approx(18 + 2/3 - 1)
+    assert dual.gradient(result) == pytest.approx([3*3 + 1/3, 3*2 - 2/9])
+    # Comparisons look at the values only
+    assert bool(x < y)
+
+
+def test_solve_batch_derivatives():
+    args = [15.0, 0.7, 1.5, 9.81]
+    result = engine.solve_batch(*dual.variables(*args))
+    for field in ("distance", "flight_time", "max_height"):
+        def solve(*params):
+            return np.ma.getdata(getattr(engine.solve_batch(*params), field))
+        for i in range(4):
+            assert getattr(result, field).grad[..., i] == pytest.approx(
+                finite_difference(solve, args, i), rel=1e-5)
+
+
+def test_drag_integration_derivatives():
+    args = [15.0, 0.7, 1.5, 9.81, 0.02]
+    result = drag.integrate(*dual.variables(*args), rtol=1e-10, atol=1e-10)
+
+    def solve(*params):
+        return drag.integrate(*params, rtol=1e-10, atol=1e-10).distance
+    for i in range(5):
+        assert result.distance.grad[..., i] == pytest.approx(finite_difference(solve, args, i),
+                                                             rel=1e-4)
+
+
+def test_target_entry_derivatives():
+    args = [15.0, 0.72, 1.0, 9.81, 20.0, 2.0, 3.0]
+    entry = collision.target_intersection(*dual.variables(*args))
+    assert bool(dual.value(entry.hit))
+
+    def solve(*params):
+        return collision.target_intersection(*params).time
+    for i in range(len(args)):
+        assert entry.time.grad[..., i] == pytest.approx(finite_difference(solve, args, i),
+                                                        rel=1e-5, abs=1e-8)
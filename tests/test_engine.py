@@ -0,0 +1,75 @@
+import math
+import numpy as np
+import pytest
+import engine
+
+
+def test_level_throw_matches_closed_form():
+    v0, angle, g = 20.0, math.radians(30), 9.81
+    result = engine.calculate_trajectory(v0, angle, 0.0, g)
+    assert result.distance == pytest.approx(v0**2 * math.sin(2*angle) / g)
+    assert result.flight_time == pytest.approx(2 * v0 * math.sin(angle) / g)
+    assert result.max_height == pytest.approx((v0 * math.sin(angle))**2 / (2*g))
+    assert result.x[-1] == pytest.approx(result.distance)
+    assert result.y[-1] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_rejects_invalid_throws():
+    with pytest.raises(ValueError):
+        engine.calculate_trajectory(0.0, 0.5, 1.0, 9.81)
+    with pytest.raises(ValueError):
+        engine.calculate_trajectory(10.0, 0.5, 1.0, -9.81)
+
+
+def test_summary_builds_no_samples():
+    full = engine.calculate_trajectory(15.0, 0.8, 2.0, 9.81)
+    summary = engine.calculate_trajectory(15.0, 0.8, 2.0, 9.81, summary=True)
+    assert summary.times is None
+    assert summary.distance == pytest.approx(full.distance)
+    assert summary.max_height == pytest.approx(full.max_height)
+
+
+def test_position_between_samples():
+    result = engine.calculate_trajectory(15.0, 0.8, 2.0, 9.81)
+    t = np.linspace(0, result.flight_time, 7)
+    x, y = result.position(t)
+    assert x == pytest.approx(15.0 * math.cos(0.8) * t)
+    assert y == pytest.approx(2.0 + 15.0 * math.sin(0.8) * t - 0.5 * 9.81 * t**2)
+
+
+def test_sample_count_keeps_chord_error_within_tolerance():
+    result = engine.calculate_trajectory(25.0, 1.0, 1.0, 9.81, tolerance=1e-3)
+    assert len(result.times) == engine.sample_count(result.flight_time, 9.81, 1e-3)
+    # The chord error of a parabola is g*dt^2/8 at the middle of a step
+    dt = result.times[1] - result.times[0]
+    assert 9.81 * dt**2 / 8 <= 1e-3
+    assert engine.sample_count(1e-6, 9.81) == engine.MIN_POINTS
+    assert engine.sample_count(1e6, 9.81) == engine.MAX_POINTS
+
+
+def test_solve_batch_matches_single_throws():
+    v0 = np.array([5.0, 12.0, 30.0])
+    angle = np.array([0.2, 0.7, 1.3])
+    batch = engine.solve_batch(v0[:, None], angle[None, :], 1.5, 9.81)
+    assert batch.shape == (3, 3)
+    for i in range(3):
+        for j in range(3):
+            single = engine.calculate_trajectory(v0[i], angle[j], 1.5, 9.81, summary=True)
+            assert batch.distance[i, j] == pytest.approx(single.distance)
+            assert batch.flight_time[i, j] == pytest.approx(single.flight_time)
+            assert batch.max_height[i, j] == pytest.approx(single.max_height)
+
+
+def test_solve_batch_masks_invalid_rows():
+    batch = engine.solve_batch(np.array([10.0, -1.0]), 0.5, 0.0, 9.81)
+    assert batch.valid.tolist() == [True, False]
+    assert batch.distance.mask.tolist() == [False, True]
+
+
+def test_target_hit():
+    target = engine.Target(20, 2, 3)
+    hit = engine.calculate_trajectory(15.0, 0.72, 1.0, 9.81, target=target)
+    assert hit.target_hit
+    assert 20 <= hit.position(hit.hit_time)[0] <= 22
+    miss = engine.calculate_trajectory(5.0, 0.72, 1.0, 9.81, target=target)
+    assert not miss.target_hit
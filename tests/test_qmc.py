@@ -0,0 +1,75 @@
+import math
+import numpy as np
+import pytest
+import qmc
+
+# Offset that centres every Sobol point in its cell
+HALF_CELL = 0.5 / 2**qmc.SOBOL_BITS
+
+
+def elementary_counts(points, m, k):
+    # Points in each of the 2**k by 2**(m-k) boxes of the unit square
+    i = np.floor(points[:, 0] * 2**k).astype(int)
+    j = np.floor(points[:, 1] * 2**(m - k)).astype(int)
+    return np.bincount(i * 2**(m - k) + j, minlength=2**m)
+
+
+def test_unscrambled_sobol_matches_the_published_sequence():
+    points = qmc.Sobol(2, scramble=False).random(8) - HALF_CELL
+    assert points[:, 0] == pytest.approx([0, 0.5, 0.75, 0.25, 0.375, 0.875, 0.625, 0.125])
+    assert points[:, 1] == pytest.approx([0, 0.5, 0.25, 0.75, 0.375, 0.875, 0.125, 0.625])
+
+
+@pytest.mark.parametrize("scramble", [False, True])
+def test_sobol_is_a_net(scramble):
+    # Every elementary box of area 2**-m holds exactly one of 2**m points,
+    # with or without scrambling
+    m = 8
+    points = qmc.Sobol(2, scramble=scramble, seed=5).random(2**m)
+    for k in range(m + 1):
+        assert (elementary_counts(points, m, k) == 1).all()
+
+
+def test_sobol_scrambling_is_random_and_seeded():
+    first = qmc.Sobol(3, seed=1).random(64)
+    assert (first > 0).all() and (first < 1).all()
+    assert qmc.Sobol(3, seed=1).random(64) == pytest.approx(first)
+    assert not np.allclose(qmc.Sobol(3, seed=2).random(64), first)
+    # Points are addressed by index
+    assert qmc.Sobol(3, seed=1).points(40, 64) == pytest.approx(first[40:])
+
+
+def test_sobol_limits():
+    with pytest.raises(ValueError):
+        qmc.Sobol(0)
+    with pytest.raises(ValueError):
+        qmc.Sobol(qmc.Sobol.MAX_DIMENSION + 1)
+    with pytest.raises(ValueError):
+        qmc.Sobol(1).points(0, 2**qmc.SOBOL_BITS + 1)
+
+
+def test_unscrambled_halton_is_the_radical_inverse():
+    points = qmc.Halton(2, scramble=False).points(1, 7)
+    assert points[:, 0] == pytest.approx([1/2, 1/4, 3/4, 1/8, 5/8, 3/8])
+    assert points[:, 1] == pytest.approx([1/3, 2/3, 1/9, 4/9, 7/9, 2/9])
+
+
+def test_scrambled_halton_stratifies_each_base():
+    points = qmc.Halton(2, seed=3).random(2**4 * 3**3)
+    assert (np.bincount(np.floor(points[:, 0] * 16).astype(int)) == 27).all()
+    assert (np.bincount(np.floor(points[:, 1] * 27).astype(int)) == 16).all()
+
+
+def test_sampler_by_name():
+    assert isinstance(qmc.sampler("sobol", 2), qmc.Sobol)
+    assert isinstance(qmc.sampler("halton", 2), qmc.Halton)
+    with pytest.raises(ValueError):
+        qmc.sampler("latin", 2)
+
+
+def test_normal_cdf_and_inverse():
+    x = np.linspace(-6, 6, 101)
+    exact = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    assert qmc.norm_cdf(x) == pytest.approx(exact, rel=2e-7, abs=1e-15)
+    u = np.array([1e-10, 1e-4, 0.01, 0.3, 0.5, 0.8, 0.99, 1 - 1e-6])
+    assert qmc.norm_cdf(qmc.norm_ppf(u)) == pytest.approx(u, rel=1e-6)
@@ -0,0 +1,125 @@
+import os
+import threading
+import numpy as np
+import pytest
+import drag
+import engine
+import range_table
+
+# A coarse grid keeps the tables quick to build
+GRID = dict(v0_points=50, angle_points=181)
+
+# Angles whose throws are compared with the table, and how close (radians)
+# to an interval edge a disagreement is tolerated
+ANGLES = np.linspace(0.01, 1.565, 1001)
+EDGE_MARGIN = 2e-3
+
+
+@pytest.fixture(scope="module", params=[0.0, 0.02])
+def table(request):
+    return range_table.RangeTable.build(9.81, request.param, 1.0, **GRID)
+
+
+def test_grid_nodes_match_solve_batch(table):
+    result = engine.solve_batch(table.v0[:, None], table.angle[None, :], 1.0, 9.81,
+                                drag=table.k or None)
+    assert table.range_at(table.v0[:, None], table.angle[None, :]) == pytest.approx(
+        np.ma.getdata(result.distance))
+    assert table.max_height_at(table.v0[3], table.angle[7]) == pytest.approx(
+        result.max_height[3, 7])
+
+
+def test_interpolation_is_close_to_the_throw(table):
+    exact = engine.solve_batch(17.3, ANGLES, 1.0, 9.81, drag=table.k or None)
+    assert table.range_at(17.3, ANGLES) == pytest.approx(np.ma.getdata(exact.distance),
+                                                         rel=2e-2, abs=0.05)
+
+
+@pytest.mark.parametrize("v0", [6.2, 17.3, 33.9])
+@pytest.mark.parametrize("distance", [2.0, 12.0, 30.0])
+def test_angles_for_matches_brute_force(table, v0, distance):
+    angles = table.angles_for(v0, distance)
+    assert angles == sorted(angles)
+    assert table.range_at(v0, np.array(angles)) == pytest.approx(distance, abs=1e-9)
+    # As many solutions as the interpolated range crosses the distance
+    above = table.range_at(v0, ANGLES) > distance
+    assert len(angles) == np.count_nonzero(above[1:] != above[:-1])
+
+
+@pytest.mark.parametrize("v0", [6.2, 17.3, 33.9])
+@pytest.mark.parametrize("near, far", [(1.0, 3.0), (10.0, 14.0), (25.0, 32.0), (0.0, 200.0)])
+def test_intervals_for_matches_brute_force(table, v0, near, far):
+    intervals = table.intervals_for(v0, near, far)
+    landing = table.range_at(v0, ANGLES)
+    expected = (landing >= near) & (landing <= far)
+    inside = np.array([any(lo <= a <= hi for lo, hi in intervals) for a in ANGLES])
+    edges = np.array([edge for interval in intervals for edge in interval] or [np.inf])
+    checked = (np.abs(ANGLES[:, None] - edges[None, :]) > EDGE_MARGIN).all(axis=1)
+    assert (inside == expected)[checked].all()
+    assert all(hi < lo for (_, hi), (lo, _) in zip(intervals, intervals[1:]))
+
+
+def test_save_and_load(tmp_path, table):
+    path = str(tmp_path / "table.npz")
+    table.save(path)
+    loaded = range_table.RangeTable.load(path)
+    assert (loaded.g, loaded.k, loaded.h0) == (table.g, table.k, table.h0)
+    assert loaded.angles_for(17.3, 12.0) == table.angles_for(17.3, 12.0)
+
+
+def test_quantize():
+    assert range_table.quantize(9.8123, 0.012345, 1.1) == (9.8, 0.012, 1.0)
+    assert range_table.quantize(9.81, 0.0, -0.3) == (9.8, 0.0, 0.0)
+
+
+def test_cache_builds_once_then_reads_memory_and_disk(tmp_path):
+    tables = range_table.TableCache(str(tmp_path), **GRID)
+    model = drag.DragModel(0.05, 0.3)
+    first = tables.get(9.81, model, 1.0)
+    assert tables.get(9.79, model.coefficient, 1.05) is first
+    assert len(os.listdir(tmp_path)) == 1
+    reloaded = range_table.TableCache(str(tmp_path), **GRID).get(9.81, model, 1.0)
+    assert reloaded is not first
+    assert reloaded.distance == pytest.approx(first.distance)
+
+
+def test_cache_keeps_the_newest_files(tmp_path):
+    tables = range_table.TableCache(str(tmp_path), disk_size=2, **GRID)
+    for g in (9.0, 9.5, 10.0):
+        tables.get(g)
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_cache_builds_in_the_background(tmp_path):
+    tables = range_table.TableCache(str(tmp_path), **GRID)
+    ready = threading.Event()
+    built = []
+
+    def on_ready(table):
+        built.append(table)
+        ready.set()
+    assert tables.get(9.81, block=False, on_ready=on_ready) is None
+    assert ready.wait(60)
+    assert tables.get(9.81, block=False) is built[0]
+    assert not tables._pending
+
+
+def test_cache_records_background_failures(tmp_path, monkeypatch):
+    tables = range_table.TableCache(str(tmp_path), **GRID)
+    ready = threading.Event()
+
+    def fail(*args, **kwargs):
+        ready.set()
+        raise MemoryError("no room for the table")
+    monkeypatch.setattr(range_table.RangeTable, "build", fail)
+    assert tables.get(9.81, block=False, on_ready=lambda table: None) is None
+    assert ready.wait(60)
+    for _ in range(100):
+        if not tables._pending:
+            break
+        threading.Event().wait(0.01)
+    assert not tables._pending
+    with pytest.raises(MemoryError):
+        tables.get(9.81, block=False)
+    with pytest.raises(MemoryError):
+        tables.get(9.81)
@@ -0,0 +1,66 @@
+import os
+import pytest
+import engine
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import scene
+import scenery
+
+TARGET = engine.Target(20, 2, 3)
+
+
+def throw():
+    return engine.calculate_trajectory(20, 0.7, 1.5, 9.81, target=TARGET, rock_size=0.1)
+
+
+def test_add_scenery_makes_two_collections():
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    shapes, lines = scene.add_scenery(ax)
+    assert list(ax.collections) == [shapes, lines]
+    assert len(shapes.get_paths()) == 1 + len(scenery.grass()) + 2*len(scenery.TREES) + 1
+    assert len(lines.get_segments()) == 4
+
+
+def test_target_patches_box_then_rings():
+    box, *rings = scene.target_patches(20, 0, 2, 3)
+    assert box.get_xy() == (20, 0)
+    assert [ring.radius for ring in rings] == pytest.approx([0.6, 0.36, 0.12])
+    assert all(ring.center == (21, 1.5) for ring in rings)
+
+
+def test_plot_draws_throw_and_target(tmp_path):
+    figure = Figure()
+    plot = scene.Plot(figure, FigureCanvasAgg(figure))
+    plot.set_view(40, 15)
+    plot.show_throw(throw(), 0.1, TARGET)
+    plot.show_spread((20, 0), 2, 1, 0)
+    plot.update()
+    plot.move_rock(5, 3, time=0.3)
+    assert plot.animate()
+    plot.hide_spread()
+    plot.show_throw(throw(), 0.1, None)
+    plot.update()
+    plot.save(tmp_path / "plot.png")
+    assert (tmp_path / "plot.png").stat().st_size > 0
+
+
+def test_native_plot_draws_throw_and_target():
+    for name in ("KIVY_NO_ARGS", "KIVY_NO_CONSOLELOG", "KIVY_NO_FILELOG"):
+        os.environ.setdefault(name, "1")
+    kivy_plot = pytest.importorskip("kivy_plot")
+    plot = kivy_plot.NativePlot(size=(400, 300))
+    plot.set_view(40, 15)
+    plot.show_throw(throw(), 0.1, TARGET)
+    plot.show_spread((20, 0), 2, 1, 0)
+    plot.move_rock(5, 3, time=0.3)
+    plot.update()
+    assert plot.animate()
+    assert len(plot._scenery.children) > 0
+    assert len(plot._throw.children) > 0
+    plot.hide_spread()
+    assert len(plot._spread.children) == 0
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+import engine
+import sweep
+
+V0 = np.linspace(5, 30, 7)
+ANGLE = np.linspace(0.1, 1.4, 5)
+H0 = np.array([0.0, 2.0])
+
+
+def expected():
+    return engine.solve_batch(V0[:, None, None], ANGLE[None, :, None], H0[None, None, :], 9.81)
+
+
+def test_grid_shape_and_parameters():
+    grid = sweep.Grid(V0, ANGLE, H0, 9.81)
+    assert grid.axes == ("v0", "angle_rad", "h0")
+    assert grid.shape == (7, 5, 2)
+    params = grid.parameters(0, grid.size)
+    assert params["v0"].reshape(grid.shape)[:, 0, 0] == pytest.approx(V0)
+    assert params["h0"].reshape(grid.shape)[0, 0, :] == pytest.approx(H0)
+    assert params["g"] == 9.81
+    with pytest.raises(ValueError):
+        sweep.Grid(np.ones((2, 2)), 0.5, 0.0, 9.81)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_chunks_assemble_the_whole_grid(max_workers):
+    grid = sweep.Grid(V0, ANGLE, H0, 9.81)
+    chunks = list(sweep.sweep(grid, None, None, None, chunk_size=16, max_workers=max_workers))
+    assert sorted((chunk.start, chunk.stop) for chunk in chunks) == grid.chunks(16)
+    result = sweep.collect(chunks, grid.shape)
+    assert result.valid.all()
+    assert np.ma.getdata(result.distance) == pytest.approx(np.ma.getdata(expected().distance))
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_shared_results(max_workers):
+    grid = sweep.Grid(V0, ANGLE, H0, 9.81)
+    with sweep.SharedResults(grid.shape) as out:
+        for _ in sweep.sweep(grid, None, None, None, chunk_size=16, max_workers=max_workers,
+                             out=out):
+            pass
+        result = out.result()
+        assert np.ma.getdata(result.max_height) == pytest.approx(
+            np.ma.getdata(expected().max_height))
+        del result
+
+
+def test_design_fills_the_ranges():
+    design = sweep.Design(64, (5.0, 30.0), (0.1, 1.4), 1.0, 9.81, seed=1)
+    params = design.parameters(0, 64)
+    assert design.axes == ("v0", "angle_rad")
+    assert ((params["v0"] >= 5.0) & (params["v0"] <= 30.0)).all()
+    # Each half of a Sobol net holds exactly half of the points
+    assert (params["angle_rad"] < 0.75).sum() == 32
+    result = sweep.collect(sweep.sweep(design, None, None, None, chunk_size=20, max_workers=1),
+                           design.shape)
+    single = engine.solve_batch(params["v0"], params["angle_rad"], 1.0, 9.81)
+    assert np.ma.getdata(result.distance) == pytest.approx(np.ma.getdata(single.distance))
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+import drag
+import engine
+import target_map
+import uncertainty
+
+TARGET = engine.Target(15, 2, 3)
+
+
+def brute_force(grid):
+    v0, angle = np.meshgrid(grid.v0, grid.angle)
+    return uncertainty.hit_test(v0, angle, grid.h0, grid.g, grid.target, grid.rock_size,
+                                grid.drag)
+
+
+@pytest.mark.parametrize("model", [None, drag.DragModel(0.05, 0.3)])
+def test_refined_map_matches_every_throw(model):
+    grid = target_map.TargetMap((8, 25), (0.1, 1.5), 1.0, 9.81, TARGET, rock_size=0.1,
+                                drag=model, base_cells=16, levels=3).compute()
+    expected = brute_force(grid)
+    assert grid.level == 3
+    assert set(np.unique(grid.hit)) <= {0.0, 1.0}
+    assert (grid.hit == expected).all()
+    # Only the cells along the hit boundary were refined
+    assert grid.evaluations < grid.size**2 / 2
+
+
+def test_every_lattice_point_is_solved_once():
+    grid = target_map.TargetMap((8, 25), (0.1, 1.5), 1.0, 9.81, TARGET, base_cells=8, levels=2)
+    grid.compute()
+    assert grid.evaluations == grid._known.sum()
+
+
+def test_miss_distance_sign():
+    grid = target_map.TargetMap((8, 25), (0.1, 1.5), 1.0, 9.81, TARGET, base_cells=8,
+                                levels=0).compute()
+    result = engine.solve_batch(grid.v0[None, :], grid.angle[:, None], 1.0, 9.81)
+    distance = np.ma.getdata(result.distance)
+    short = distance < TARGET.x
+    long = distance > TARGET.x + TARGET.width
+    assert (grid.miss[short] < 0).all()
+    assert grid.miss[short] == pytest.approx(distance[short] - TARGET.x)
+    assert (grid.miss[long & (grid.hit == 0)] > 0).all()
+    assert (grid.miss[grid.hit == 1] == 0).all()
@@ -0,0 +1,90 @@
+import math
+import numpy as np
+import pytest
+import aiming
+import drag
+import engine
+import qmc
+import uncertainty
+
+TARGET = engine.Target(15, 2, 3)
+RAISED = engine.Target(15, 1, 1, y=3)
+
+
+def exact_probability(v0, angle, h0, target):
+    # Chance that a Normal launch angle falls in the hitting intervals
+    intervals = aiming.hitting_angles(v0, h0, 9.81, target.x, target.y + target.height,
+                                      target.width, target_bottom=target.y).interval_list()
+    return sum(float(qmc.norm_cdf((hi - angle.mean) / angle.std)
+                     - qmc.norm_cdf((lo - angle.mean) / angle.std)) for lo, hi in intervals)
+
+
+def test_running_stats_matches_numpy():
+    values = np.random.default_rng(1).normal(3.0, 2.0, 1000)
+    stats = uncertainty.RunningStats()
+    for chunk in np.array_split(values, 7):
+        stats.update(chunk)
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+
+
+def test_wilson_interval():
+    low, high = uncertainty.wilson_interval(30, 100)
+    assert low < 0.3 < high
+    assert uncertainty.wilson_interval(0, 100)[0] == 0.0
+    assert uncertainty.wilson_interval(100, 100)[1] == 1.0
+    assert uncertainty.wilson_interval(0, 0) == (0.0, 1.0)
+
+
+@pytest.mark.parametrize("rock_size", [0.0, 0.1])
+@pytest.mark.parametrize("model", [None, drag.DragModel(0.05, 0.3)])
+@pytest.mark.parametrize("target", [TARGET, RAISED])
+def test_hit_test_matches_calculate_trajectory(target, model, rock_size):
+    rng = np.random.default_rng(2)
+    v0 = rng.uniform(10, 20, 60)
+    angle = rng.uniform(0.2, 1.3, 60)
+    batch, hit = uncertainty.solve_and_hit_test(v0, angle, 1.0, 9.81, target, rock_size, model)
+    assert (hit == uncertainty.hit_test(v0, angle, 1.0, 9.81, target, rock_size, model)).all()
+    for i in range(len(v0)):
+        single = engine.calculate_trajectory(v0[i], angle[i], 1.0, 9.81, target=target,
+                                             rock_size=rock_size, drag=model)
+        assert hit[i] == single.target_hit
+        assert batch.distance[i] == pytest.approx(single.distance, rel=1e-6)
+
+
+@pytest.mark.parametrize("sampler", ["random", "sobol"])
+def test_hit_probability_matches_exact(sampler):
+    angle = uncertainty.Normal(0.72, 0.05)
+    estimate = uncertainty.hit_probability(15.0, angle, 1.0, 9.81, TARGET, ci_width=0.02,
+                                           seed=3, sampler=sampler)
+    assert estimate.converged
+    assert estimate.ci_low <= exact_probability(15.0, angle, 1.0, TARGET) <= estimate.ci_high
+
+
+def test_importance_sampling_matches_exact_on_a_rare_target():
+    angle = uncertainty.Normal(0.35, 0.04)
+    exact = exact_probability(15.0, angle, 1.0, RAISED)
+    assert 0 < exact < 1e-3
+    estimate = uncertainty.importance_hit_probability(15.0, angle, 1.0, 9.81, RAISED, seed=4)
+    assert estimate.converged
+    assert estimate.ci_low <= exact <= estimate.ci_high
+
+
+def test_linearized_spread_matches_finite_differences():
+    v0, angle, h0, g = 15.0, 0.7, 1.5, 9.81
+    stds = np.array([0.3, 0.02, 0.1])
+    spread = uncertainty.linearized_spread(v0, angle, h0, g, uncertainty.diagonal_covariance(*stds))
+    step = 1e-6
+    params = np.array([v0, angle, h0])
+    gradient = []
+    for i in range(3):
+        up, down = params.copy(), params.copy()
+        up[i] += step
+        down[i] -= step
+        gradient.append((engine.calculate_trajectory(*up, g, summary=True).distance
+                         - engine.calculate_trajectory(*down, g, summary=True).distance)
+                        / (2 * step))
+    assert spread.distance == pytest.approx(engine.calculate_trajectory(v0, angle, h0, g).distance)
+    assert spread.distance_std == pytest.approx(math.sqrt(np.sum((np.array(gradient) * stds)**2)),
+                                                rel=1e-5)
@@ -0,0 +1,639 @@
+import math
+from statistics import NormalDist
+import numpy as np
+import engine
+import collision
+import aiming
+import qmc
+from drag import integrate as integrate_drag
+
+# Throws pushed through the solver at a time
+DEFAULT_CHUNK_SIZE = 4096
+
+# Stop once the hit-probability interval is this narrow, or after this many
+# throws, whichever comes first
+DEFAULT_CI_WIDTH = 0.01
+DEFAULT_MAX_SAMPLES = 1000000
+DEFAULT_CONFIDENCE = 0.95
+
+# Share of importance-sampling throws drawn from the real distribution, so
+# that the weights stay bounded wherever the proposal misses
+DEFAULT_DEFENSIVE = 0.1
+
+# Importance sampling stops once the interval half-width is this fraction
+# of the estimate
+DEFAULT_RELATIVE_ERROR = 0.05
+
+# Independently scrambled sequences run side by side in quasi-Monte Carlo
+# mode; their spread gives the confidence interval
+DEFAULT_REPLICATES = 16
+
+
+class Normal:
+    """Gaussian spread around a mean."""
+
+    def __init__(self, mean, std):
+        self.mean = mean
+        self.std = std
+
+    def __repr__(self):
+        return f"Normal(mean={self.mean!r}, std={self.std!r})"
+
+    def sample(self, rng, n):
+        return rng.normal(self.mean, self.std, n)
+
+    def ppf(self, u):
+        return self.mean + self.std * qmc.norm_ppf(u)
+
+    def pdf(self, x):
+        z = (np.asarray(x, dtype=float) - self.mean) / self.std
+        return np.exp(-0.5 * z*z) / (self.std * math.sqrt(2 * math.pi))
+
+    def span(self, k=3.0):
+        return self.mean - k * self.std, self.mean + k * self.std
+
+    def shifted(self, mean):
+        return Normal(mean, self.std)
+
+
+class Uniform:
+    """Flat spread between low and high."""
+
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def __repr__(self):
+        return f"Uniform(low={self.low!r}, high={self.high!r})"
+
+    def sample(self, rng, n):
+        return rng.uniform(self.low, self.high, n)
+
+    def ppf(self, u):
+        return self.low + (self.high - self.low) * np.asarray(u, dtype=float)
+
+    def pdf(self, x):
+        x = np.asarray(x, dtype=float)
+        return np.where((x >= self.low) & (x <= self.high), 1.0 / (self.high - self.low), 0.0)
+
+    def span(self, k=3.0):
+        return self.low, self.high
+
+    def shifted(self, mean):
+        return self
+
+
+class Fixed:
+    """A parameter without spread."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return f"Fixed({self.value!r})"
+
+    def sample(self, rng, n):
+        return np.full(n, float(self.value))
+
+    def ppf(self, u):
+        return np.full(np.shape(u), float(self.value))
+
+    def pdf(self, x):
+        # A point mass; it cancels out of every likelihood ratio
+        return np.ones(np.shape(x))
+
+    def span(self, k=3.0):
+        return self.value, self.value
+
+    def shifted(self, mean):
+        return self
+
+
+def _distribution(value):
+    return value if hasattr(value, "sample") else Fixed(value)
+
+
+class RunningStats:
+    """Count, mean and variance of a stream of values in O(1) memory.
+
+    Chunks are merged with the pairwise form of Welford's update, which
+    stays accurate over millions of values.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        n = values.size
+        if n == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean)**2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+def wilson_interval(hits, n, confidence=DEFAULT_CONFIDENCE):
+    """Wilson score interval for a binomial proportion; sound near 0 and 1."""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = hits / n
+    denominator = 1 + z*z/n
+    centre = (p + z*z/(2*n)) / denominator
+    half = z * math.sqrt(p*(1 - p)/n + z*z/(4*n*n)) / denominator
+    return max(centre - half, 0.0), min(centre + half, 1.0)
+
+
+def _replicate_interval(replicate_hits, samples, confidence):
+    # Randomized QMC: the replicates are independent unbiased estimates, so
+    # the interval comes from their spread. With no hits (or no misses) at
+    # all the spread says nothing, and the Wilson interval takes over.
+    hits = int(replicate_hits.sum())
+    replicates = len(replicate_hits)
+    if replicates < 2 or hits in (0, samples):
+        return wilson_interval(hits, samples, confidence)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    proportions = replicate_hits / (samples / replicates)
+    half = z * proportions.std(ddof=1) / math.sqrt(replicates)
+    p = hits / samples
+    return max(p - half, 0.0), min(p + half, 1.0)
+
+
+class HitEstimate:
+    """Running Monte Carlo estimate of the hit probability and landing point."""
+
+    def __init__(self, samples, hits, probability, ci_low, ci_high, distance_mean,
+                 distance_std, distance_ci, converged):
+        self.samples = samples
+        self.hits = hits
+        self.probability = probability
+        self.ci_low = ci_low
+        self.ci_high = ci_high
+        self.distance_mean = distance_mean
+        self.distance_std = distance_std
+        # Half-width of the confidence interval on distance_mean
+        self.distance_ci = distance_ci
+        self.converged = converged
+
+    def __repr__(self):
+        return (f"HitEstimate(probability={self.probability:.4g}, "
+                f"ci=({self.ci_low:.4g}, {self.ci_high:.4g}), samples={self.samples})")
+
+
+def _drag_throws(v0, angle_rad, h0, g, target, rock_size, drag, **options):
+    # One integration per throw gives both the BatchResult and the hit test:
+    # the recorded paths are resampled finely enough that every chord stays
+    # within engine.DEFAULT_TOLERANCE of the true path, and the polylines
+    # are checked against the target like engine.calculate_trajectory does
+    k = getattr(drag, "coefficient", drag)
+    v0, angle_rad, h0, g, k = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                                    for a in (v0, angle_rad, h0, g, k)))
+    shape = v0.shape
+    solution = integrate_drag(v0, angle_rad, h0, g, drag, record=True, **options)
+    # Throws that land short of the target or never climb to it cannot hit
+    with np.errstate(invalid="ignore"):
+        reach = (solution.valid & (solution.distance + rock_size >= target.x)
+                 & (solution.max_height + rock_size >= target.y))
+    rows = np.nonzero(reach)[0]
+    hit = np.zeros(reach.shape, dtype=bool)
+    if len(rows):
+        # Drag adds at most k*v^2 to gravity, and the speed peaks either at
+        # launch or at landing (as in engine.calculate_trajectory). The
+        # sample count grows with flight_time*sqrt(acceleration), so the
+        # row with the largest product sets it for the whole batch.
+        flight_time = solution.flight_time[rows]
+        speed = np.maximum(v0.ravel()[rows], np.hypot(*solution.end_state[rows, 2:].T))
+        acceleration = g.ravel()[rows] + k.ravel()[rows] * speed**2
+        points = engine.sample_count(float(np.max(flight_time * np.sqrt(acceleration))), 1.0)
+        t = flight_time[:, None] * np.linspace(0, 1, points)
+        states = solution.sample_all(t, rows)
+        hit[rows] = collision.polyline_disc_contact(
+            t, states[..., 0], states[..., 1], rock_size, target.x, target.y, target.width,
+            target.height).target_hit
+    hit = hit.reshape(shape)
+    batch = engine.BatchResult(*(np.reshape(a, shape) for a in (
+        solution.flight_time, solution.distance, solution.max_height,
+        solution.max_height_time, solution.valid)))
+    return batch, hit
+
+
+def hit_test(v0, angle_rad, h0, g, target, rock_size=0.0, drag=None, **options):
+    """Whether each throw hits the target, for arrays of launch parameters.
+
+    Without drag this is the exact test used by engine.calculate_trajectory.
+    Under drag each throw is integrated once and resampled into a polyline
+    that stays within engine.DEFAULT_TOLERANCE of the true path (see
+    engine.sample_count), so it agrees with engine.calculate_trajectory
+    except for contacts closer than that.
+    """
+    if drag is None and rock_size > 0:
+        return collision.disc_target_contact(v0, angle_rad, h0, g, rock_size, target.x,
+                                             target.width, target.height, target.y).target_hit
+    if drag is None:
+        return collision.target_intersection(v0, angle_rad, h0, g, target.x, target.width,
+                                             target.height, target.y).hit
+    return _drag_throws(v0, angle_rad, h0, g, target, rock_size, drag, **options)[1]
+
+
+def solve_and_hit_test(v0, angle_rad, h0, g, target, rock_size=0.0, drag=None, **options):
+    """engine.solve_batch and hit_test of the same throws, solving them once.
+
+    Returns (BatchResult, hit). Under drag a single integration serves
+    both; without drag both are closed-form anyway.
+    """
+    if drag is not None:
+        return _drag_throws(v0, angle_rad, h0, g, target, rock_size, drag, **options)
+    return (engine.solve_batch(v0, angle_rad, h0, g, **options),
+            hit_test(v0, angle_rad, h0, g, target, rock_size, **options))
+
+
+def estimates(v0, angle_rad, h0, g, target, rock_size=0.0, drag=None,
+              ci_width=DEFAULT_CI_WIDTH, confidence=DEFAULT_CONFIDENCE,
+              chunk_size=DEFAULT_CHUNK_SIZE, max_samples=DEFAULT_MAX_SAMPLES, seed=None,
+              sampler="random", replicates=DEFAULT_REPLICATES, **options):
+    """Monte Carlo hit probability, yielding a HitEstimate after every chunk.
+
+    v0, angle_rad and h0 are numbers or distributions (Normal, Uniform, or
+    anything with a sample(rng, n) method). Throws are drawn chunk_size at
+    a time, solved and hit-tested by solve_and_hit_test; only running
+    totals are kept. Stops once the Wilson interval on the hit
+    probability is at most ci_width wide, or after max_samples throws.
+    Throws that are not valid (say a negative speed drawn from a wide
+    spread) count as misses and are left out of the landing statistics.
+
+    sampler="sobol" or "halton" draws the throws from that many scrambled
+    low-discrepancy sequences instead (randomized quasi-Monte Carlo), which
+    needs far fewer throws for the same interval; the distributions must
+    then have a ppf method, as the ones here do.
+    """
+    rng = np.random.default_rng(seed)
+    sources = [_distribution(p) for p in (v0, angle_rad, h0)]
+    generators = None
+    if sampler != "random":
+        seeds = rng.integers(0, 2**32, size=replicates)
+        generators = [qmc.sampler(sampler, len(sources), seed=int(s)) for s in seeds]
+    count = 1 if generators is None else len(generators)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    landing = RunningStats()
+    samples = 0
+    replicate_hits = np.zeros(count, dtype=np.int64)
+
+    while samples < max_samples:
+        # Every replicate gets the same number of throws
+        per = max(min(chunk_size, max_samples - samples) // count, 1)
+        n = per * count
+        if generators is None:
+            v0s, angles, heights = (source.sample(rng, n) for source in sources)
+        else:
+            u = np.concatenate([generator.random(per) for generator in generators])
+            v0s, angles, heights = (source.ppf(u[:, i]) for i, source in enumerate(sources))
+        batch, hit = solve_and_hit_test(v0s, angles, heights, g, target, rock_size, drag,
+                                        **options)
+        replicate_hits += np.count_nonzero((hit & batch.valid).reshape(count, per), axis=1)
+        landing.update(batch.distance.compressed())
+        samples += n
+        hits = int(replicate_hits.sum())
+
+        ci_low, ci_high = _replicate_interval(replicate_hits, samples, confidence)
+        converged = ci_high - ci_low <= ci_width
+        mean = landing.mean if landing.count else math.nan
+        std = landing.std if landing.count > 1 else math.nan
+        distance_ci = z * std / math.sqrt(landing.count) if landing.count > 1 else math.nan
+        yield HitEstimate(samples, hits, hits / samples, ci_low, ci_high, mean, std,
+                          distance_ci, converged)
+        if converged:
+            break
+
+
+def hit_probability(v0, angle_rad, h0, g, target, **kwargs):
+    """Final HitEstimate of estimates(); takes the same arguments."""
+    estimate = None
+    for estimate in estimates(v0, angle_rad, h0, g, target, **kwargs):
+        pass
+    return estimate
+
+
+class ImportanceEstimate:
+    """Importance-sampling estimate of a (typically small) hit probability.
+
+    ``ess`` is Kish's effective sample size of the weights; ``hits`` counts
+    the proposal throws that hit, which is what makes the estimate useful.
+    """
+
+    def __init__(self, samples, hits, probability, std_error, ci_low, ci_high, ess,
+                 converged):
+        self.samples = samples
+        self.hits = hits
+        self.probability = probability
+        self.std_error = std_error
+        self.ci_low = ci_low
+        self.ci_high = ci_high
+        self.ess = ess
+        self.converged = converged
+
+    def __repr__(self):
+        return (f"ImportanceEstimate(probability={self.probability:.4g}, "
+                f"ci=({self.ci_low:.4g}, {self.ci_high:.4g}), samples={self.samples}, "
+                f"ess={self.ess:.1f})")
+
+
+# v0 x h0 grid searched for the most likely hitting throw, without and
+# with drag, and how many standard deviations it reaches out
+DESIGN_GRID = (41, 5)
+DRAG_DESIGN_GRID = (9, 3)
+DESIGN_SPAN = 6.0
+
+
+def _grown_intervals(v0, h0, g, target, rock_size, drag, **options):
+    # Hitting angles for a point against the target grown by the rock
+    # radius on every side, a superset of the angles at which the rock
+    # itself hits
+    return aiming.hitting_angles(v0, h0, g, target.x - rock_size,
+                                 target.y + target.height + rock_size,
+                                 target.width + 2*rock_size, drag=drag,
+                                 target_bottom=target.y - rock_size, **options).intervals
+
+
+def _nearest_in_intervals(angle, intervals):
+    # Point of each row's intervals closest to angle (NaN for empty rows)
+    closest = np.clip(angle, intervals[..., 0], intervals[..., 1])
+    distance = np.where(np.isnan(closest), np.inf, np.abs(closest - angle))
+    best = np.argmin(distance, axis=-1)
+    return np.take_along_axis(closest, best[..., None], axis=-1)[..., 0]
+
+
+def _design_point(v0, angle_rad, h0, g, target, rock_size, drag, **options):
+    # Most likely (v0, h0) among those from which some angle hits: a grid
+    # search over their spans, scoring each by its density times that of
+    # the likeliest hitting angle. None when nothing on the grid can hit.
+    v_points, h_points = DESIGN_GRID if drag is None else DRAG_DESIGN_GRID
+    v0s = np.unique(np.linspace(*v0.span(DESIGN_SPAN), v_points))[:, None]
+    h0s = np.unique(np.linspace(*h0.span(DESIGN_SPAN), h_points))[None, :]
+    intervals = _grown_intervals(v0s, h0s, g, target, rock_size, drag, **options)
+    mode = angle_rad.span(0.0)[0] if hasattr(angle_rad, "mean") else np.mean(angle_rad.span())
+    best_angle = _nearest_in_intervals(mode, intervals)
+    with np.errstate(divide="ignore"):
+        score = np.log(v0.pdf(v0s)) + np.log(h0.pdf(h0s)) + np.log(angle_rad.pdf(best_angle))
+    score = np.where(np.isnan(best_angle), -np.inf, score)
+    if not np.isfinite(score).any():
+        return None
+    i, j = np.unravel_index(np.argmax(score), score.shape)
+    return float(v0s[i, 0]), float(h0s[0, j])
+
+
+def _hull_intervals(v0, h0, g, target, rock_size, drag, **options):
+    # Under drag the per-throw intervals are too costly, so cover the spread
+    # instead: solve at the corners and middle of the v0/h0 spans and take
+    # the hull of the flat and of the lobbed intervals across them
+    v0s = np.array(v0.span())
+    h0s = np.array(h0.span())
+    v0s = np.append(v0s, v0s.mean())[:, None]
+    h0s = np.append(h0s, h0s.mean())[None, :]
+    intervals = _grown_intervals(v0s, h0s, g, target, rock_size, drag, **options)
+    intervals = intervals.reshape(-1, *intervals.shape[-2:])
+    count = np.count_nonzero(~np.isnan(intervals[..., 0]), axis=-1)
+    present = count > 0
+    if not present.any():
+        return np.full((1, 1, 2), np.nan)
+    first = intervals[present, 0]
+    last = intervals[present, count[present] - 1]
+    flat = (first[:, 0].min(), first[:, 1].max())
+    lobbed = (last[:, 0].min(), last[:, 1].max())
+    if lobbed[0] <= flat[1]:
+        return np.array([[[flat[0], max(flat[1], lobbed[1])]]])
+    return np.array([[flat, lobbed]])
+
+
+def _sample_intervals(rng, intervals):
+    # One uniform draw from the union of each row's intervals, and the
+    # length of that union (0 for rows without any)
+    lengths = np.nan_to_num(intervals[..., 1] - intervals[..., 0])
+    ends = np.cumsum(lengths, axis=-1)
+    total = ends[:, -1]
+    pick = rng.random(len(total)) * total
+    slot = np.minimum((ends < pick[:, None]).sum(axis=-1), lengths.shape[-1] - 1)
+    rows = np.arange(len(total))
+    angles = intervals[rows, slot, 1] - (ends[rows, slot] - pick)
+    return angles, total
+
+
+def _interval_density(angles, intervals, total):
+    inside = (angles[:, None] >= intervals[..., 0]) & (angles[:, None] <= intervals[..., 1])
+    return np.where(inside.any(axis=-1) & (total > 0), 1.0 / np.where(total > 0, total, 1.0), 0.0)
+
+
+def importance_estimates(v0, angle_rad, h0, g, target, rock_size=0.0, drag=None,
+                         defensive=DEFAULT_DEFENSIVE, relative_error=DEFAULT_RELATIVE_ERROR,
+                         confidence=DEFAULT_CONFIDENCE, chunk_size=DEFAULT_CHUNK_SIZE,
+                         max_samples=DEFAULT_MAX_SAMPLES, seed=None, **options):
+    """Hit probability by importance sampling, yielding after every chunk.
+
+    The launch angle, which must have a spread, is drawn uniformly from the
+    angles that can hit (see aiming.hitting_angles): solved exactly for
+    every throw without drag, and as the hull over the v0/h0 spread under
+    drag. Normal v0 and h0 are shifted to the most likely throw that can hit
+    at all, found by a grid search. A share defensive of the throws comes
+    from the real distributions, which bounds every weight by 1/defensive.
+    Hits are weighted by the likelihood ratio, so the estimate is unbiased.
+    Runs until the interval half-width is at most relative_error of the
+    estimate, or max_samples throws. Yields an ImportanceEstimate per chunk.
+    """
+    rng = np.random.default_rng(seed)
+    v0, angle_rad, h0 = (_distribution(p) for p in (v0, angle_rad, h0))
+    if isinstance(angle_rad, Fixed) or not hasattr(angle_rad, "pdf"):
+        raise ValueError("Importance sampling needs a launch angle distribution with a pdf")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    # Proposal for v0 and h0, and under drag the angles it aims at
+    v0_proposal, h0_proposal = v0, h0
+    design = _design_point(v0, angle_rad, h0, g, target, rock_size, drag, **options)
+    if design is not None:
+        v0_proposal, h0_proposal = v0.shifted(design[0]), h0.shifted(design[1])
+    hull = None
+    if drag is not None:
+        hull = _hull_intervals(v0_proposal, h0_proposal, g, target, rock_size, drag, **options)
+
+    samples = 0
+    hits = 0
+    sum_wh = sum_wh2 = sum_w = sum_w2 = 0.0
+    while samples < max_samples:
+        n = min(chunk_size, max_samples - samples)
+        real = rng.random(n) < defensive
+        v0s = np.where(real, v0.sample(rng, n), v0_proposal.sample(rng, n))
+        heights = np.where(real, h0.sample(rng, n), h0_proposal.sample(rng, n))
+        if hull is None:
+            intervals = _grown_intervals(v0s, heights, g, target, rock_size, None)
+        else:
+            intervals = np.broadcast_to(hull, (n,) + hull.shape[1:])
+
+        # Throws with nothing to aim at keep their real angle distribution
+        proposed, total = _sample_intervals(rng, intervals)
+        aimed = total > 0
+        angles = np.where(real | ~aimed, angle_rad.sample(rng, n), proposed)
+
+        density = v0.pdf(v0s) * h0.pdf(heights) * angle_rad.pdf(angles)
+        angle_proposal = np.where(aimed, _interval_density(angles, intervals, total),
+                                  angle_rad.pdf(angles))
+        proposal = (defensive * density + (1 - defensive) * v0_proposal.pdf(v0s)
+                    * h0_proposal.pdf(heights) * angle_proposal)
+        weights = np.where(proposal > 0, density / np.where(proposal > 0, proposal, 1.0), 0.0)
+
+        hit = hit_test(v0s, angles, heights, g, target, rock_size, drag, **options)
+        weighted = weights * hit
+        hits += int(np.count_nonzero(hit))
+        sum_wh += float(weighted.sum())
+        sum_wh2 += float((weighted**2).sum())
+        sum_w += float(weights.sum())
+        sum_w2 += float((weights**2).sum())
+        samples += n
+
+        probability = sum_wh / samples
+        variance = max(sum_wh2 / samples - probability**2, 0.0) / max(samples - 1, 1)
+        std_error = math.sqrt(variance)
+        half = z * std_error
+        ess = sum_w**2 / sum_w2 if sum_w2 > 0 else 0.0
+        converged = hits > 0 and half <= relative_error * probability
+        yield ImportanceEstimate(samples, hits, probability, std_error,
+                                 max(probability - half, 0.0), min(probability + half, 1.0),
+                                 ess, converged)
+        if converged:
+            break
+
+
+def importance_hit_probability(v0, angle_rad, h0, g, target, **kwargs):
+    """Final ImportanceEstimate of importance_estimates(); same arguments."""
+    estimate = None
+    for estimate in importance_estimates(v0, angle_rad, h0, g, target, **kwargs):
+        pass
+    return estimate
+
+
+def diagonal_covariance(v0_std, angle_std, h0_std):
+    """Covariance of independent (v0, angle_rad, h0) spreads, shape (..., 3, 3)."""
+    stds = np.stack(np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (
+        v0_std, angle_std, h0_std))), axis=-1)
+    return stds[..., :, None] * stds[..., None, :] * np.eye(3)
+
+
+def _height_jacobian(x, v0, angle_rad, g):
+    # d/d(v0, angle, h0) of the drag-free height at distance x, and dy/dx
+    cos = np.cos(angle_rad)
+    tan = np.tan(angle_rad)
+    sec2 = 1 / cos**2
+    d_v0 = g * x**2 * sec2 / v0**3
+    d_angle = x * sec2 * (1 - g * x * tan / v0**2)
+    d_h0 = np.ones_like(d_v0)
+    slope = tan - g * x * sec2 / v0**2
+    return np.stack([d_v0, d_angle, d_h0], axis=-1), slope
+
+
+def _propagate(jacobian, covariance):
+    # J C J^T over the trailing axes
+    return jacobian @ covariance @ np.swapaxes(jacobian, -1, -2)
+
+
+class LinearizedSpread:
+    """First-order spread of drag-free throws; see linearized_spread.
+
+    ``landing_cov`` is the covariance of (distance, flight_time) and
+    ``impact_cov`` that of the rock's (x, y) at the nominal landing time,
+    whose ellipse shows the spread around the landing point.
+    """
+
+    def __init__(self, distance, flight_time, landing_cov, impact_cov, hit_probability):
+        self.distance = distance
+        self.flight_time = flight_time
+        self.landing_cov = landing_cov
+        self.impact_cov = impact_cov
+        self.hit_probability = hit_probability
+
+    @property
+    def distance_std(self):
+        return np.sqrt(self.landing_cov[..., 0, 0])
+
+    def ellipse(self, k=2.0):
+        """(width, height, angle_deg) of the k-sigma impact ellipse."""
+        a = self.impact_cov[..., 0, 0]
+        b = self.impact_cov[..., 0, 1]
+        c = self.impact_cov[..., 1, 1]
+        middle = (a + c) / 2
+        radius = np.sqrt(((a - c) / 2)**2 + b*b)
+        major = np.sqrt(np.maximum(middle + radius, 0))
+        minor = np.sqrt(np.maximum(middle - radius, 0))
+        angle = 0.5 * np.degrees(np.arctan2(2*b, a - c))
+        return 2*k*major, 2*k*minor, angle
+
+
+def linearized_spread(v0, angle_rad, h0, g, covariance, target=None):
+    """Propagate a Gaussian launch spread to the landing point, to first order.
+
+    covariance is the (..., 3, 3) covariance of (v0, angle_rad, h0), see
+    diagonal_covariance; every argument broadcasts, so many nominal throws
+    are handled at once. The closed-form drag-free range, flight time and
+    position are differentiated at the nominal throw and the covariance is
+    pushed through their Jacobian. With a target, hit_probability is the
+    Gaussian estimate of hitting it as a point: the height y_front at its
+    front must be at least 0, and the path must not clear the top at both
+    edges, whose joint chance is approximated by the smaller of the two
+    (exact when they are fully correlated, as for a narrow box).
+    """
+    v0, angle_rad, h0, g = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (
+        v0, angle_rad, h0, g)))
+    covariance = np.asarray(covariance, dtype=float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vx = v0 * np.cos(angle_rad)
+        vy = v0 * np.sin(angle_rad)
+        t_flight = (vy + np.sqrt(vy**2 + 2*g*h0)) / g
+        distance = vx * t_flight
+
+        # Range from the implicit y(R) = 0: dR = -dy / (dy/dx)
+        height_jacobian, slope = _height_jacobian(distance, v0, angle_rad, g)
+        range_jacobian = -height_jacobian / slope[..., None]
+        # Flight time T = R / vx
+        vx_jacobian = np.stack([np.cos(angle_rad), -vy, np.zeros_like(vx)], axis=-1)
+        time_jacobian = (range_jacobian - t_flight[..., None] * vx_jacobian) / vx[..., None]
+        landing_cov = _propagate(np.stack([range_jacobian, time_jacobian], axis=-2), covariance)
+
+        # Position at the nominal landing time
+        t = t_flight[..., None]
+        x_jacobian = t * vx_jacobian
+        y_jacobian = np.stack([np.sin(angle_rad) * t_flight, vx * t_flight,
+                               np.ones_like(vx)], axis=-1)
+        impact_cov = _propagate(np.stack([x_jacobian, y_jacobian], axis=-2), covariance)
+
+        hit_probability = None
+        if target is not None:
+            near = target.x
+            far = target.x + target.width
+            top = target.y + target.height
+
+            def height(x):
+                mean = h0 + x*np.tan(angle_rad) - g*x**2 / (2*vx**2)
+                jacobian, _ = _height_jacobian(np.full_like(v0, x), v0, angle_rad, g)
+                std = np.sqrt(_propagate(jacobian[..., None, :], covariance)[..., 0, 0])
+                return mean, std
+
+            front, front_std = height(near)
+            back, back_std = height(far)
+            reach = qmc.norm_cdf((front - target.y) / front_std)
+            over = np.minimum(qmc.norm_cdf((front - top) / front_std),
+                              qmc.norm_cdf((back - top) / back_std))
+            hit_probability = np.clip(reach - over, 0.0, 1.0)
+
+    return LinearizedSpread(distance, t_flight, landing_cov, impact_cov, hit_probability)
@@ -1,12 +1,20 @@
 import tkinter as tk
 import math
 import numpy as np
+import engine
+import drag
+import aiming
+import uncertainty
+import target_map
+import scene
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.patches import Rectangle, Circle, Polygon
 import matplotlib.image as mpimg
 from matplotlib.animation import FuncAnimation
 
+# Animation frames per second of flight time
+ANIMATION_FPS = 30
+
 class EnhancedProjectileSimulator:
     def __init__(self, root):
         self.root = root
@@ -142,6 +150,29 @@ t = time
         
         create_input_row(self.advanced_frame, "Gravity (g):", self.gravity, "m/s²", 1, 20, 0.1)
         
+        # Air drag settings
+        self.drag_enabled = tk.BooleanVar(value=False)
+        self.drag_coefficient = tk.DoubleVar(value=0.47)  # Rough sphere
+        self.air_density = tk.DoubleVar(value=1.225)  # Sea level
+        self.rock_mass = tk.DoubleVar(value=2.0)
+        
+        drag_check = tk.Checkbutton(self.advanced_frame, text="Air Drag", variable=self.drag_enabled,
+                                    bg="#34495e", fg="#ecf0f1", selectcolor="#2c3e50", activebackground="#34495e")
+        drag_check.pack(fill=tk.X, pady=5)
+        
+        create_input_row(self.advanced_frame, "Drag Coefficient:", self.drag_coefficient, "", 0.1, 2, 0.01)
+        create_input_row(self.advanced_frame, "Air Density:", self.air_density, "kg/m³", 0.1, 2, 0.005)
+        create_input_row(self.advanced_frame, "Rock Mass:", self.rock_mass, "kg", 0.1, 20, 0.1)
+        
+        # Throw-to-throw spread (standard deviations) for the hit probability
+        self.velocity_spread = tk.DoubleVar(value=0.5)
+        self.angle_spread = tk.DoubleVar(value=1.0)
+        self.height_spread = tk.DoubleVar(value=0.05)
+        
+        create_input_row(self.advanced_frame, "Speed Spread:", self.velocity_spread, "m/s", 0, 5, 0.1)
+        create_input_row(self.advanced_frame, "Angle Spread:", self.angle_spread, "°", 0, 10, 0.1)
+        create_input_row(self.advanced_frame, "Height Spread:", self.height_spread, "m", 0, 1, 0.01)
+        
         # Target frame
         target_frame = tk.LabelFrame(left_panel, text="Target", bg="#34495e", fg="#ecf0f1", 
                                     font=("Arial", 12, "bold"), padx=20, pady=10)  # Increased padx from 10 to 20
@@ -171,13 +202,16 @@ t = time
             "max_height": tk.StringVar(value="Maximum Height: --"),
             "distance": tk.StringVar(value="Range: --"),
             "flight_time": tk.StringVar(value="Flight Time: --"),
-            "target_hit": tk.StringVar(value="Target Hit: --")
+            "target_hit": tk.StringVar(value="Target Hit: --"),
+            "hit_probability": tk.StringVar(value="Hit Probability: --"),
+            "hitting_angles": tk.StringVar(value="Hitting Angles: --")
         }
         
         for key, var in self.result_labels.items():
             result_frame = tk.Frame(results_frame, bg="#34495e")
             result_frame.pack(fill=tk.X, pady=3)
             tk.Label(result_frame, textvariable=var, bg="#34495e", fg="#ecf0f1").pack(side=tk.LEFT)
+        self.probability_job = None
         
         # Button frame
         button_frame = tk.Frame(left_panel, bg="#2c3e50")
@@ -195,6 +229,19 @@ t = time
                                       padx=10, pady=10, relief=tk.RAISED, state=tk.DISABLED)
         self.animate_button.pack(fill=tk.X, pady=5)
         
+        # Aim button
+        aim_button = tk.Button(button_frame, text="Find Hitting Angles", command=self.find_hitting_angles,
+                               bg="#27ae60", fg="white", font=("Arial", 12, "bold"),
+                               padx=10, pady=10, relief=tk.RAISED)
+        aim_button.pack(fill=tk.X, pady=5)
+        
+        # Target map button
+        map_button = tk.Button(button_frame, text="Target Map", command=self.show_target_map,
+                               bg="#8e44ad", fg="white", font=("Arial", 12, "bold"),
+                               padx=10, pady=10, relief=tk.RAISED)
+        map_button.pack(fill=tk.X, pady=5)
+        self.map_job = None
+        
         # Plot frame (right panel)
         plot_frame = tk.Frame(main_frame, bg="#2c3e50")
         plot_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
@@ -204,6 +251,7 @@ t = time
         self.ax = self.figure.add_subplot(111, facecolor="#1e272e")
         self.canvas = FigureCanvasTkAgg(self.figure, plot_frame)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.scene = scene.BlittedScene(self.canvas, self.ax)
         
         # Configure plot
         self.ax.set_xlabel('Distance (m)', color="#ecf0f1")
@@ -251,6 +299,10 @@ t = time
             self.animate_button.config(text="Animate Throw")
     
     def initialize_scene(self):
+        # The scenery is drawn once into the cached background; throws only
+        # move the dynamic artists on top (see plot_trajectory)
+        self.scene.clear()
+        
         # Clear the plot
         self.ax.clear()
         
@@ -258,23 +310,8 @@ t = time
         self.ax.set_xlim(-5, 50)
         self.ax.set_ylim(-1, 20)
         
-        # Draw ground
-        ground = Rectangle((-5, -1), 60, 1, color='#7f8c8d')
-        self.ax.add_patch(ground)
-        
-        # Draw grass
-        for i in range(0, 55, 2):
-            grass_height = 0.2 + 0.1 * np.random.random()
-            grass = Rectangle((i-5, 0), 0.1, grass_height, color='#27ae60')
-            self.ax.add_patch(grass)
-        
-        # Draw trees (at random positions)
-        self.draw_tree(10, 0, height=5)
-        self.draw_tree(25, 0, height=6)
-        self.draw_tree(40, 0, height=4.5)
-        
-        # Draw person
-        self.draw_person(0, 0)
+        # Ground, grass, trees and the thrower, in two collections
+        scene.add_scenery(self.ax)
         
         # Configure plot
         self.ax.set_xlabel('Distance (m)', color="#ecf0f1")
@@ -285,63 +322,14 @@ t = time
             spine.set_color('#7f8c8d')
         self.ax.grid(True, alpha=0.3)
         
+        # The throw's artists, created once and updated in place
+        self.throw = scene.ThrowArtists(self.scene, path_color='white', text_color='white',
+                                        arrow_color='#e74c3c')
+        self.rock = self.throw.rock
+        
         # Update canvas
         self.canvas.draw()
     
-    def draw_person(self, x, y):
-        # Draw stick figure
-        # Head
-        head = Circle((x, y+1.7), 0.3, color='#f39c12')
-        self.ax.add_patch(head)
-        
-        # Body
-        self.ax.plot([x, x], [y+1.4, y+0.7], color='#f39c12', linewidth=3)
-        
-        # Arms
-        self.ax.plot([x, x+0.5], [y+1.2, y+1.3], color='#f39c12', linewidth=2)  # Right arm raised
-        
-        # Legs
-        self.ax.plot([x, x-0.3], [y+0.7, y], color='#f39c12', linewidth=2)  # Left leg
-        self.ax.plot([x, x+0.3], [y+0.7, y], color='#f39c12', linewidth=2)  # Right leg
-    
-    def draw_tree(self, x, y, height=5):
-        # Draw trunk
-        trunk = Rectangle((x-0.5, y), 1, height*0.4, color='#795548')
-        self.ax.add_patch(trunk)
-        
-        # Draw foliage (triangle)
-        tree_width = height * 0.6
-        tree_top = y + height
-        
-        foliage = Polygon([
-            [x-tree_width/2, y+height*0.3],  # Left bottom
-            [x+tree_width/2, y+height*0.3],  # Right bottom
-            [x, tree_top]                     # Top
-        ], closed=True, color='#2ecc71')
-        self.ax.add_patch(foliage)
-    
-    def draw_target(self, x, y, width, height):
-        # Draw target
-        target = Rectangle((x, y), width, height, color='#e74c3c', alpha=0.8)
-        self.ax.add_patch(target)
-        
-        # Draw bullseye
-        bullseye_x = x + width/2
-        bullseye_y = y + height/2
-        bullseye_size = min(width, height) * 0.3
-        
-        # Outer ring
-        outer_ring = Circle((bullseye_x, bullseye_y), bullseye_size, color='white')
-        self.ax.add_patch(outer_ring)
-        
-        # Inner ring
-        inner_ring = Circle((bullseye_x, bullseye_y), bullseye_size*0.6, color='#e74c3c')
-        self.ax.add_patch(inner_ring)
-        
-        # Center
-        center = Circle((bullseye_x, bullseye_y), bullseye_size*0.2, color='white')
-        self.ax.add_patch(center)
-    
     def calculate(self):
         try:
             # Get values from inputs
@@ -374,152 +362,202 @@ t = time
         except Exception as e:
             self.status_var.set(f"Error: {str(e)}")
     
-    def calculate_trajectory(self, v0, angle_rad, h0, g):
-        # Calculate velocity components
-        v0x = v0 * math.cos(angle_rad)
-        v0y = v0 * math.sin(angle_rad)
+    def get_drag_model(self):
+        # Air drag model, if enabled
+        if not self.drag_enabled.get():
+            return None
+        return drag.DragModel(self.rock_size.get(), self.rock_mass.get(),
+                              self.drag_coefficient.get(), self.air_density.get())
+    
+    def find_hitting_angles(self):
+        if not self.target_enabled.get():
+            self.status_var.set("Enable the target first!")
+            return
         
-        # Calculate time when projectile hits the ground
-        # Using quadratic formula: h0 + v0y*t - 0.5*g*t^2 = 0
-        # at^2 + bt + c = 0, where a = -0.5*g, b = v0y, c = h0
-        discriminant = v0y**2 + 2*g*h0
+        try:
+            solution = aiming.hitting_angles(self.initial_velocity.get(), self.height.get(),
+                                             self.gravity.get(), self.target_distance.get(),
+                                             self.target_height.get(), self.target_width.get(),
+                                             drag=self.get_drag_model())
+        except Exception as e:
+            self.status_var.set(f"Error: {str(e)}")
+            return
         
-        if discriminant >= 0:
-            t_flight = (v0y + math.sqrt(discriminant)) / g
-        else:
-            # If it won't reach the ground (this shouldn't happen in normal cases)
-            t_flight = 0
-            
-        # Calculate range
-        distance = v0x * t_flight
+        intervals = solution.interval_list()
+        if not intervals:
+            self.result_labels["hitting_angles"].set("Hitting Angles: None")
+            self.status_var.set("No angle hits the target at this speed.")
+            return
         
-        # Calculate maximum height time
-        t_max_height = v0y / g if v0y > 0 else 0
+        ranges = ", ".join(f"{math.degrees(lo):.1f}°–{math.degrees(hi):.1f}°" for lo, hi in intervals)
+        self.result_labels["hitting_angles"].set(f"Hitting Angles: {ranges}")
+        self.status_var.set(f"Low solution: {math.degrees(solution.low):.1f}° | "
+                            f"High solution: {math.degrees(solution.high):.1f}°")
+    
+    def show_target_map(self):
+        if not self.target_enabled.get():
+            self.status_var.set("Enable the target first!")
+            return
         
-        # Calculate maximum height
-        max_height = h0 + v0y**2 / (2*g) if v0y > 0 else h0
+        target = engine.Target(self.target_distance.get(), self.target_width.get(),
+                               self.target_height.get())
+        # Same ranges as the speed and angle inputs
+        hit_map = target_map.TargetMap((1, 50), (0, math.pi / 2), self.height.get(),
+                                       self.gravity.get(), target, rock_size=self.rock_size.get(),
+                                       drag=self.get_drag_model())
+        passes = hit_map.refine()
+        
+        if self.map_job is not None:
+            self.root.after_cancel(self.map_job)
+            self.map_job = None
+        window = tk.Toplevel(self.root)
+        window.title("Target Map")
+        window.configure(bg="#2c3e50")
+        figure = plt.Figure(figsize=(7, 5), dpi=100, facecolor="#2c3e50")
+        ax = figure.add_subplot(111, facecolor="#1e272e")
+        canvas = FigureCanvasTkAgg(figure, window)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Miss distance underneath, hits on top in one colour
+        left, right, bottom, top = hit_map.extent
+        extent = (left, right, math.degrees(bottom), math.degrees(top))
+        limit = max(target.x, 1.0)
+        miss_image = ax.imshow(hit_map.miss, origin='lower', extent=extent, aspect='auto',
+                               cmap='coolwarm', vmin=-limit, vmax=limit, interpolation='nearest')
+        hit_image = ax.imshow(np.ma.masked_less(hit_map.hit, 0.5), origin='lower', extent=extent,
+                              aspect='auto', cmap='Greens', vmin=0, vmax=1.2, interpolation='nearest')
+        ax.plot(self.initial_velocity.get(), self.angle.get(), marker='x', color='white', markersize=10)
+        colorbar = figure.colorbar(miss_image, ax=ax)
+        colorbar.set_label('Short (−) / long (+) of the target (m)', color="#ecf0f1")
+        colorbar.ax.tick_params(colors="#ecf0f1")
+        ax.set_xlabel('Throwing Speed (m/s)', color="#ecf0f1")
+        ax.set_ylabel('Throwing Angle (°)', color="#ecf0f1")
+        ax.tick_params(colors="#ecf0f1")
+        title = ax.set_title('Target Map', color="#ecf0f1")
+        figure.tight_layout()
+        
+        # One refinement pass per tick, so the coarse map shows at once and
+        # sharpens while the window stays responsive
+        def refine():
+            self.map_job = None
+            if not window.winfo_exists():
+                return
+            try:
+                level = next(passes)
+            except StopIteration:
+                return
+            miss_image.set_data(hit_map.miss)
+            hit_image.set_data(np.ma.masked_less(hit_map.hit, 0.5))
+            title.set_text(f"Target Map (pass {level + 1} of {hit_map.levels + 1}, "
+                           f"{hit_map.evaluations:,} throws of {hit_map.size**2:,})")
+            canvas.draw_idle()
+            self.map_job = self.root.after(1, refine)
+        
+        refine()
+    
+    def calculate_trajectory(self, v0, angle_rad, h0, g):
+        # Describe the target for the engine
+        target = None
+        if self.target_enabled.get():
+            target = engine.Target(self.target_distance.get(), self.target_width.get(),
+                                   self.target_height.get())
         
-        # Create time points for trajectory
-        if t_flight > 0:
-            num_points = 200
-            t = np.linspace(0, t_flight, num_points)
-            
-            # Calculate x and y coordinates
-            x = v0x * t
-            y = h0 + v0y * t - 0.5 * g * t**2
-            
-            # Check if target is hit
-            target_hit = False
-            hit_time = None
-            
-            if self.target_enabled.get():
-                target_x = self.target_distance.get()
-                target_y = 0
-                target_height = self.target_height.get()
-                target_width = self.target_width.get()
-                
-                # Check if any point of trajectory is within target
-                for i in range(len(t)-1):
-                    if (target_x <= x[i] <= target_x + target_width and
-                        target_y <= y[i] <= target_y + target_height):
-                        target_hit = True
-                        hit_time = t[i]
-                        break
-            
-            # Update result labels
-            self.result_labels["max_height"].set(f"Maximum Height: {max_height:.2f} m")
-            self.result_labels["distance"].set(f"Range: {distance:.2f} m")
-            self.result_labels["flight_time"].set(f"Flight Time: {t_flight:.2f} s")
-            
-            if self.target_enabled.get():
-                if target_hit:
-                    self.result_labels["target_hit"].set(f"Target Hit: Yes! At {hit_time:.2f} s")
-                else:
-                    self.result_labels["target_hit"].set("Target Hit: No")
+        data = engine.calculate_trajectory(v0, angle_rad, h0, g, target=target,
+                                           rock_size=self.rock_size.get(), drag=self.get_drag_model())
+        
+        # Update result labels
+        self.result_labels["max_height"].set(f"Maximum Height: {data.max_height:.2f} m")
+        self.result_labels["distance"].set(f"Range: {data.distance:.2f} m")
+        self.result_labels["flight_time"].set(f"Flight Time: {data.flight_time:.2f} s")
+        
+        if target is not None:
+            if data.target_hit:
+                self.result_labels["target_hit"].set(f"Target Hit: Yes! At {data.hit_time:.2f} s")
             else:
-                self.result_labels["target_hit"].set("Target Hit: No target set")
-            
-            # Return trajectory data
-            return {
-                "times": t,
-                "x": x,
-                "y": y,
-                "v0x": v0x,
-                "v0y": v0y,
-                "max_height": max_height,
-                "distance": distance,
-                "flight_time": t_flight,
-                "max_height_time": t_max_height,
-                "target_hit": target_hit,
-                "hit_time": hit_time
-            }
+                self.result_labels["target_hit"].set("Target Hit: No")
         else:
-            self.status_var.set("Error: Invalid trajectory - Check your parameters")
-            return None
+            self.result_labels["target_hit"].set("Target Hit: No target set")
+        
+        self.update_hit_probability(v0, angle_rad, h0, g, target)
+        
+        return data
     
-    def plot_trajectory(self, data, rock_size):
-        if data is None:
+    def update_hit_probability(self, v0, angle_rad, h0, g, target):
+        # A new throw supersedes any estimate still running for the last one
+        if self.probability_job is not None:
+            self.root.after_cancel(self.probability_job)
+            self.probability_job = None
+        if target is None:
+            self.result_labels["hit_probability"].set("Hit Probability: --")
             return
         
-        # Reinitialize the scene
-        self.initialize_scene()
+        # Throw-to-throw spread; a zero spread means an exact value
+        def spread(value, std):
+            return uncertainty.Normal(value, std) if std > 0 else value
+        
+        launch = (spread(v0, self.velocity_spread.get()),
+                  spread(angle_rad, math.radians(self.angle_spread.get())),
+                  spread(h0, self.height_spread.get()))
+        options = dict(rock_size=self.rock_size.get(), drag=self.get_drag_model(), max_samples=50000)
+        
+        # Monte Carlo over the spread, to about ±1%, one small chunk per tick
+        # so the window stays responsive while it runs
+        steps = uncertainty.estimates(*launch, g, target, ci_width=0.02, sampler="sobol",
+                                      chunk_size=1024, **options)
+        self.result_labels["hit_probability"].set("Hit Probability: estimating…")
+        
+        def step(estimate=None):
+            self.probability_job = None
+            try:
+                estimate = next(steps)
+            except StopIteration:
+                finish(estimate)
+                return
+            self.probability_job = self.root.after(1, step, estimate)
+        
+        def finish(estimate):
+            if estimate.hits == 0 and isinstance(launch[1], uncertainty.Normal):
+                # Too rare for plain sampling; aim the samples at the target
+                # instead, stepped the same way
+                rare = uncertainty.importance_estimates(*launch, g, target, relative_error=0.1,
+                                                        chunk_size=1024, **options)
+                step_rare(rare)
+                return
+            half_width = (estimate.ci_high - estimate.ci_low) / 2
+            self.result_labels["hit_probability"].set(
+                f"Hit Probability: {estimate.probability:.1%} ± {half_width:.1%}")
+        
+        def step_rare(rare, estimate=None):
+            self.probability_job = None
+            try:
+                estimate = next(rare)
+            except StopIteration:
+                self.result_labels["hit_probability"].set(
+                    f"Hit Probability: {estimate.probability:.2g}")
+                return
+            self.probability_job = self.root.after(1, step_rare, rare, estimate)
         
-        # Plot trajectory path
-        self.ax.plot(data["x"], data["y"], 'white', linestyle='--', alpha=0.7, linewidth=1.5)
+        step()
+    
+    def plot_trajectory(self, data, rock_size):
+        if data is None:
+            return
         
-        # Get plot limits
-        x_max = max(50, data["distance"] * 1.1)
-        y_max = max(20, data["max_height"] * 1.2)
+        # Plot limits
+        x_max = max(50, data.distance * 1.1)
+        y_max = max(20, data.max_height * 1.2)
         self.ax.set_xlim(-5, x_max)
         self.ax.set_ylim(-1, y_max)
         
-        # Draw the target if enabled
+        # Move the path, target, rocks and annotations to this throw
+        target = None
         if self.target_enabled.get():
-            target_x = self.target_distance.get()
-            target_height = self.target_height.get()
-            target_width = self.target_width.get()
-            self.draw_target(target_x, 0, target_width, target_height)
-        
-        # Draw rock at final position
-        rock_x = data["distance"]
-        rock_y = 0
-        final_rock = Circle((rock_x, rock_y), rock_size, color='#95a5a6')
-        self.ax.add_patch(final_rock)
-        
-        # Draw rock at peak position
-        if data["max_height_time"] > 0:
-            peak_x = data["v0x"] * data["max_height_time"]
-            peak_rock = Circle((peak_x, data["max_height"]), rock_size, color='#95a5a6', alpha=0.5)
-            self.ax.add_patch(peak_rock)
-        
-        # Draw annotations
-        # Maximum height
-        if data["max_height_time"] > 0:
-            peak_x = data["v0x"] * data["max_height_time"]
-            self.ax.annotate(f'Max Height: {data["max_height"]:.2f} m', 
-                             xy=(peak_x, data["max_height"]), 
-                             xytext=(peak_x+2, data["max_height"]+1),
-                             arrowprops=dict(facecolor='white', shrink=0.05, width=1.5, headwidth=8),
-                             color='white')
-        
-        # Range
-        self.ax.annotate(f'Range: {data["distance"]:.2f} m', 
-                         xy=(data["distance"], 0.2), 
-                         xytext=(data["distance"]-5, 2),
-                         arrowprops=dict(facecolor='white', shrink=0.05, width=1.5, headwidth=8),
-                         color='white')
-        
-        # Initial velocity vector
-        arrow_length = data["v0x"] * 0.5
-        arrow_height = data["v0y"] * 0.5
-        self.ax.arrow(0, data["y"][0], arrow_length, arrow_height, 
-                     head_width=0.5, head_length=1, fc='#e74c3c', ec='#e74c3c', linewidth=2)
-        
-        self.ax.text(arrow_length/2, data["y"][0] + arrow_height/2 + 0.5, 
-                    f'{self.initial_velocity.get():.1f} m/s', color='#e74c3c')
+            target = engine.Target(self.target_distance.get(), self.target_width.get(),
+                                   self.target_height.get())
+        self.throw.show(data, rock_size, target)
         
-        # Update canvas
-        self.canvas.draw()
+        # Blit the throw over the cached scenery
+        self.scene.update()
     
     def animate_throw(self):
         if not hasattr(self, 'trajectory_data') or self.trajectory_data is None:
@@ -534,41 +572,39 @@ t = time
         # Re-draw the scene to prevent flickering
         self.plot_trajectory(self.trajectory_data, self.rock_size.get())
             
-        # Create rock object if it doesn't exist
-        rock_size = self.rock_size.get()
-        self.rock = Circle((0, self.height.get()), rock_size, color='#95a5a6')
-        self.ax.add_patch(self.rock)
+        # Start the rock at the thrower
+        self.throw.move_rock(0, self.height.get())
+        
+        # Every dynamic artist is redrawn over the background each frame
+        self.animated_artists = self.scene.artists
         
-        # Create a list to keep track of artists that need updating
-        self.animated_artists = [self.rock]
+        # Frames are evaluated at their own times, independent of the samples
+        data = self.trajectory_data
+        frames = math.ceil(data.flight_time * ANIMATION_FPS) + 1
         
         # Animation function
         def update(frame_num):
             # Get the position at this frame
-            if frame_num < len(self.trajectory_data["times"]):
-                x = self.trajectory_data["x"][frame_num]
-                y = self.trajectory_data["y"][frame_num]
-                self.rock.center = (x, y)
+            if frame_num < frames:
+                time = min(frame_num / ANIMATION_FPS, data.flight_time)
+                x, y = data.position(time)
+                self.throw.move_rock(x, y)
                 
                 # Update status bar with current time and position
-                time = self.trajectory_data["times"][frame_num]
                 self.status_var.set(f"Time: {time:.2f}s | Position: ({x:.2f}m, {y:.2f}m)")
                 
                 # Handle target hit
-                if (self.target_enabled.get() and self.trajectory_data["target_hit"] and 
-                    self.trajectory_data["hit_time"] <= time and 
-                    self.trajectory_data["hit_time"] >= self.trajectory_data["times"][max(0, frame_num-1)]):
+                previous_time = max(0, frame_num - 1) / ANIMATION_FPS
+                if (self.target_enabled.get() and data.target_hit and 
+                    data.hit_time <= time and data.hit_time >= previous_time):
                     self.status_var.set("TARGET HIT! 🎯")
             
             return self.animated_artists
         
         # Create animation with blitting to prevent flickering
-        frames = len(self.trajectory_data["times"])
-        interval = max(10, self.trajectory_data["flight_time"]*1000/frames)  # Ensure minimum interval
-        
         self.anim = FuncAnimation(
             self.figure, update, frames=frames, 
-            interval=interval,  # Total duration in ms
+            interval=1000 / ANIMATION_FPS,  # Real-time playback in ms
             blit=True, repeat=True
         )
         